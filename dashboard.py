@@ -7,18 +7,17 @@ Migrated from Flask to FastAPI for framework consolidation.
 """
 
 import json
-import yaml
 import secrets
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import cv2
-import time
-
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, StreamingResponse
 
+from src.config_cache import load_config
+from src.stream import CLIENT_CLOCK, generate_frames, get_broadcaster
+
 app = FastAPI(title="Fish Watcher Dashboard")
 
 # Load config
@@ -26,14 +25,15 @@ BASE_DIR = Path(__file__).parent
 config_path = BASE_DIR / "config.yaml"
 config: dict = {}
 if config_path.exists():
-    with open(config_path) as f:
-        config = yaml.safe_load(f) or {}
+    config = load_config(config_path) or {}
 
 stream_config = config.get("stream", {})
 DASHBOARD_PORT: int = stream_config.get("port", 5555)
 DASHBOARD_PASSWORD: str = stream_config.get("password") or secrets.token_urlsafe(16)
 CLIPS_DIR = Path(config.get("recording", {}).get("output_dir", "./clips"))
 DATA_DIR = Path(config.get("reports", {}).get("data_dir", "./data"))
+# overlay: "client" sends frames without a timestamp; the page draws one
+LIVE_CLOCK = CLIENT_CLOCK if stream_config.get("overlay", True) == "client" else ""
 
 
 def _verify_password(p: Optional[str], password: Optional[str]) -> None:
@@ -48,15 +48,17 @@ def get_clips() -> list[dict]:
     if CLIPS_DIR.exists():
         for f in sorted(CLIPS_DIR.glob("*.mp4"), reverse=True)[:50]:
             stat = f.stat()
-            parts = f.stem.split("_", 2)
+            # Fixed layout: YYYYMMDD_HHMMSS_alert_type
+            stem = f.stem
+            alert_type = stem[16:] if stem[15:16] == "_" else ""
             try:
-                dt = datetime.strptime(f"{parts[0]}_{parts[1]}", "%Y%m%d_%H%M%S")
+                dt = datetime.strptime(stem[:15], "%Y%m%d_%H%M%S")
                 friendly = dt.strftime("%b %d, %I:%M %p")
-            except Exception:
-                friendly = f.stem
+            except ValueError:
+                friendly = stem
             clips.append({
                 "filename": f.name,
-                "alert_type": (parts[2] if len(parts) > 2 else "unknown").replace("_", " ").title(),
+                "alert_type": (alert_type or "unknown").replace("_", " ").title(),
                 "friendly_time": friendly,
                 "size_mb": round(stat.st_size / 1048576, 2),
             })
@@ -82,7 +84,7 @@ def get_status() -> dict:
     return status
 
 
-STYLE = """:root{--bg:#0f0f1a;--card:#1a1a2e;--accent:#00d4ff;--accent2:#00ff88;--text:#e0e0e0;--dim:#888;--danger:#ff4757}*{box-sizing:border-box}body{background:var(--bg);color:var(--text);font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',sans-serif;margin:0;padding:0;line-height:1.6}.navbar{background:var(--card);padding:15px 30px;display:flex;align-items:center;gap:30px;border-bottom:1px solid rgba(0,212,255,.2);position:sticky;top:0;z-index:100}.navbar .logo{font-size:1.5rem;font-weight:bold;color:var(--accent);text-decoration:none}.navbar nav a{color:var(--dim);text-decoration:none;padding:8px 16px;border-radius:8px;transition:all .2s}.navbar nav a:hover{color:var(--accent);background:rgba(0,212,255,.1)}.container{max-width:1200px;margin:0 auto;padding:30px}h1,h2{color:var(--accent);margin-top:0}.grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(250px,1fr));gap:20px;margin-bottom:30px}.card{background:var(--card);border-radius:12px;padding:24px;border:1px solid rgba(0,212,255,.1)}.card h3{margin:0 0 15px;font-size:.9rem;text-transform:uppercase;letter-spacing:1px;color:var(--dim)}.stat{font-size:2.5rem;font-weight:bold;color:var(--accent2)}.clip-grid{display:grid;grid-template-columns:repeat(auto-fill,minmax(300px,1fr));gap:20px}.clip-card{background:var(--card);border-radius:12px;overflow:hidden;border:1px solid rgba(0,212,255,.1);transition:transform .2s}.clip-card:hover{transform:translateY(-4px);box-shadow:0 10px 30px rgba(0,212,255,.2)}.clip-card video{width:100%;display:block}.clip-card .info{padding:15px}.clip-card .type{font-weight:600;color:var(--accent)}.clip-card .meta{font-size:.85rem;color:var(--dim);margin-top:5px}.stream-container{border:3px solid var(--accent);border-radius:12px;overflow:hidden;box-shadow:0 0 30px rgba(0,212,255,.3);max-width:800px;margin:0 auto}.stream-container img{width:100%;display:block}.live-badge{display:inline-flex;align-items:center;gap:6px;background:rgba(255,71,87,.2);color:var(--danger);padding:6px 12px;border-radius:20px;font-weight:600;margin-bottom:20px}.empty{text-align:center;padding:60px 20px;color:var(--dim)}"""
+STYLE = """:root{--bg:#0f0f1a;--card:#1a1a2e;--accent:#00d4ff;--accent2:#00ff88;--text:#e0e0e0;--dim:#888;--danger:#ff4757}*{box-sizing:border-box}body{background:var(--bg);color:var(--text);font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',sans-serif;margin:0;padding:0;line-height:1.6}.navbar{background:var(--card);padding:15px 30px;display:flex;align-items:center;gap:30px;border-bottom:1px solid rgba(0,212,255,.2);position:sticky;top:0;z-index:100}.navbar .logo{font-size:1.5rem;font-weight:bold;color:var(--accent);text-decoration:none}.navbar nav a{color:var(--dim);text-decoration:none;padding:8px 16px;border-radius:8px;transition:all .2s}.navbar nav a:hover{color:var(--accent);background:rgba(0,212,255,.1)}.container{max-width:1200px;margin:0 auto;padding:30px}h1,h2{color:var(--accent);margin-top:0}.grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(250px,1fr));gap:20px;margin-bottom:30px}.card{background:var(--card);border-radius:12px;padding:24px;border:1px solid rgba(0,212,255,.1)}.card h3{margin:0 0 15px;font-size:.9rem;text-transform:uppercase;letter-spacing:1px;color:var(--dim)}.stat{font-size:2.5rem;font-weight:bold;color:var(--accent2)}.clip-grid{display:grid;grid-template-columns:repeat(auto-fill,minmax(300px,1fr));gap:20px}.clip-card{background:var(--card);border-radius:12px;overflow:hidden;border:1px solid rgba(0,212,255,.1);transition:transform .2s}.clip-card:hover{transform:translateY(-4px);box-shadow:0 10px 30px rgba(0,212,255,.2)}.clip-card video{width:100%;display:block}.clip-card .info{padding:15px}.clip-card .type{font-weight:600;color:var(--accent)}.clip-card .meta{font-size:.85rem;color:var(--dim);margin-top:5px}.stream-container{position:relative;border:3px solid var(--accent);border-radius:12px;overflow:hidden;box-shadow:0 0 30px rgba(0,212,255,.3);max-width:800px;margin:0 auto}.stream-container img{width:100%;display:block}.live-badge{display:inline-flex;align-items:center;gap:6px;background:rgba(255,71,87,.2);color:var(--danger);padding:6px 12px;border-radius:20px;font-weight:600;margin-bottom:20px}.empty{text-align:center;padding:60px 20px;color:var(--dim)}"""
 
 
 def html_page(title: str, content: str, pwd: str) -> str:
@@ -140,7 +142,7 @@ def live_page(p: Optional[str] = None, password: Optional[str] = None) -> str:
     pwd = p or password or ""
     return html_page(
         "Live",
-        f'<h1>Live Stream</h1><div class="live-badge">● LIVE</div><div class="stream-container"><img src="/stream?p={pwd}" alt="Live"></div><p style="text-align:center;color:var(--dim);margin-top:20px">Refresh if disconnected</p>',
+        f'<h1>Live Stream</h1><div class="live-badge">● LIVE</div><div class="stream-container"><img src="/stream?p={pwd}" alt="Live">{LIVE_CLOCK}</div><p style="text-align:center;color:var(--dim);margin-top:20px">Refresh if disconnected</p>',
         pwd,
     )
 
@@ -148,36 +150,11 @@ def live_page(p: Optional[str] = None, password: Optional[str] = None) -> str:
 @app.get("/stream")
 def stream(p: Optional[str] = None, password: Optional[str] = None):
     _verify_password(p, password)
-    cam = config.get("camera", {})
-    dev = cam.get("device", 0)
-    fps = stream_config.get("fps", 30)
-    q = stream_config.get("quality", 85)
-
-    def gen():
-        c = cv2.VideoCapture(dev)
-        try:
-            while True:
-                ok, f = c.read()
-                if not ok:
-                    time.sleep(1)
-                    c = cv2.VideoCapture(dev)
-                    continue
-                cv2.putText(
-                    f,
-                    f"LIVE  {datetime.now().strftime('%b %d, %I:%M:%S %p')}",
-                    (15, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.6,
-                    (0, 255, 255),
-                    2,
-                )
-                _, b = cv2.imencode(".jpg", f, [cv2.IMWRITE_JPEG_QUALITY, q])
-                yield b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + b.tobytes() + b"\r\n"
-                time.sleep(1 / fps)
-        finally:
-            c.release()
-
-    return StreamingResponse(gen(), media_type="multipart/x-mixed-replace; boundary=frame")
+    # Same capture, overlay and encoder as stream.py, opened once per process
+    return StreamingResponse(
+        generate_frames(get_broadcaster(config)),
+        media_type="multipart/x-mixed-replace; boundary=frame",
+    )
 
 
 @app.get("/clips/{fn}")
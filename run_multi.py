@@ -9,9 +9,14 @@ Usage:
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
+# OpenMP pools are sized at import time; keep them single-threaded since
+# tanks already run in parallel (must happen before cv2 is imported)
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.multi_tank import MultiTankWatcher
@@ -42,6 +47,11 @@ Config format (tanks.yaml):
         default="tanks.yaml",
         help="Tanks configuration file (default: tanks.yaml)"
     )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Run each tank in its own process (uses more memory, scales across cores)"
+    )
     args = parser.parse_args()
     
     config_path = Path(args.config)
@@ -54,7 +64,7 @@ Config format (tanks.yaml):
     print(f"📁 Config: {args.config}")
     print()
     
-    watcher = MultiTankWatcher(config_path=args.config)
+    watcher = MultiTankWatcher(config_path=args.config, use_processes=args.processes)
     watcher.start()
 
 
@@ -2,15 +2,29 @@
 Fish Watcher - AI-powered fish tank monitoring.
 """
 
-from .watcher import FishWatcher
-from .detector import FishWatcherDetector, Alert, AlertType
-from .buffer import RollingBuffer
-from .recorder import ClipRecorder
-from .notifier import ClawdbotNotifier
-from .reports import ReportGenerator
-from .vision import ClaudeVisionAnalyzer, analyze_for_clawdbot
-from .multi_tank import MultiTankWatcher, TankWatcher, TankConfig
-from .fish_counter import FishCounter, FishBlob, count_fish_in_image
+import importlib
+
+# Public name -> submodule. Submodules load on first attribute access, so
+# importing one lightweight module doesn't drag in OpenCV and friends.
+_EXPORTS = {
+    "FishWatcher": "watcher",
+    "FishWatcherDetector": "detector",
+    "Alert": "detector",
+    "AlertType": "detector",
+    "RollingBuffer": "buffer",
+    "ClipRecorder": "recorder",
+    "ClawdbotNotifier": "notifier",
+    "ReportGenerator": "reports",
+    "ClaudeVisionAnalyzer": "vision",
+    "analyze_for_clawdbot": "vision",
+    "MultiTankWatcher": "multi_tank",
+    "TankWatcher": "multi_tank",
+    "TankConfig": "multi_tank",
+    "FishCounter": "fish_counter",
+    "FishBlob": "fish_counter",
+    "count_fish_in_image": "fish_counter",
+    "CameraBroadcaster": "stream",
+}
 
 __version__ = "1.2.0"
 __all__ = [
@@ -30,4 +44,18 @@ __all__ = [
     "FishCounter",
     "FishBlob",
     "count_fish_in_image",
+    "CameraBroadcaster",
 ]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
@@ -22,23 +22,80 @@ class BufferedFrame:
 class RollingBuffer:
     """Thread-safe rolling buffer for video frames."""
     
-    def __init__(self, max_seconds: float = 10, fps: int = 15):
+    def __init__(self, max_seconds: float = 10, fps: int = 15, min_slots: int = 0,
+                 read_ahead: int = 0):
         self.max_frames = int(max_seconds * fps)
         self.fps = fps
         self.buffer: collections.deque[BufferedFrame] = collections.deque(maxlen=self.max_frames)
         self.lock = threading.Lock()
         self.frame_count = 0
+        
+        # Frame storage reused round-robin: one contiguous (slots, H, W, C)
+        # block, allocated on the first frame of a size. One slot more than
+        # the deque holds, so the slot being filled is never still buffered;
+        # ``min_slots`` keeps frames intact longer for consumers that hold
+        # on to them after they leave the deque (e.g. a clip writer queue).
+        # ``read_ahead`` adds room for a capture thread decoding that many
+        # frames ahead of the last add() (see slot_for()). ``_slots`` holds
+        # a fixed view per slot, so handed-out slots keep their identity.
+        self._store: Optional[np.ndarray] = None
+        self._slots: list[np.ndarray] = []
+        self._num_slots = max(self.max_frames + 1, min_slots) + read_ahead
+        self._slot_base = 0
     
-    def add(self, frame: np.ndarray) -> None:
-        """Add a frame to the buffer."""
+    def next_slot(self) -> Optional[np.ndarray]:
+        """Array the next add() stores into, so a capture can decode into it.
+        
+        None until the first frame is added (or after the frame size
+        changed or the buffer was cleared).
+        """
         with self.lock:
+            return self._slot(self.frame_count)
+    
+    def slot_for(self, frame_number: int) -> Optional[np.ndarray]:
+        """Array add() will store ``frame_number`` into.
+        
+        Lets a capture thread decode up to ``read_ahead`` frames before
+        they are added. None as for next_slot().
+        """
+        with self.lock:
+            return self._slot(frame_number)
+    
+    def _slot(self, frame_number: int) -> Optional[np.ndarray]:
+        """Ring slot for a frame number, if allocated (lock held)."""
+        if frame_number < self._slot_base:
+            return None
+        i = (frame_number - self._slot_base) % self._num_slots
+        return self._slots[i] if i < len(self._slots) else None
+    
+    def _claim_slot(self, frame: np.ndarray) -> np.ndarray:
+        """Return the ring slot for the current frame number (lock held)."""
+        store = self._store
+        if store is None or store.shape[1:] != frame.shape or store.dtype != frame.dtype:
+            # Untouched pages cost nothing until a slot is first written
+            store = self._store = np.empty((self._num_slots,) + frame.shape, frame.dtype)
+            self._slots = list(store)
+            self._slot_base = self.frame_count
+        return self._slots[(self.frame_count - self._slot_base) % self._num_slots]
+    
+    def add(self, frame: np.ndarray, timestamp: Optional[float] = None) -> BufferedFrame:
+        """Store a frame in the buffer and return the stored entry.
+        
+        The frame is copied into the buffer's own storage, unless it already
+        is the slot handed out by next_slot().
+        """
+        with self.lock:
+            slot = self._claim_slot(frame)
+            if frame is not slot:
+                np.copyto(slot, frame)
             buffered = BufferedFrame(
-                frame=frame.copy(),
-                timestamp=time.time(),
+                frame=slot,
+                timestamp=time.time() if timestamp is None else timestamp,
                 frame_number=self.frame_count
             )
             self.buffer.append(buffered)
             self.frame_count += 1
+        return buffered
     
     def get_all(self) -> list[BufferedFrame]:
         """Get all frames in buffer (oldest first)."""
@@ -55,6 +112,9 @@ class RollingBuffer:
         """Clear the buffer."""
         with self.lock:
             self.buffer.clear()
+            self._store = None
+            self._slots = []
+            self._slot_base = self.frame_count
     
     @property
     def duration(self) -> float:
@@ -0,0 +1,38 @@
+"""
+Cached YAML config loading.
+Parsed configs are kept in memory by file mtime, so repeated loads in one
+process skip YAML parsing until the file changes.
+"""
+
+from pathlib import Path
+from typing import Any, Union
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml C loader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+
+# Absolute path -> (mtime_ns, parsed data)
+_CACHE: dict[str, tuple[int, Any]] = {}
+
+
+def load_config(path: Union[str, Path]) -> Any:
+    """Load a YAML file, using the parsed copy when it is up to date.
+
+    Raises FileNotFoundError if the file doesn't exist. Callers get the
+    cached object, so they should not mutate it.
+    """
+    path = Path(path).absolute()
+    mtime_ns = path.stat().st_mtime_ns
+
+    cached = _CACHE.get(str(path))
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    with open(path) as f:
+        data = yaml.load(f, Loader=YamlLoader)
+    _CACHE[str(path)] = (mtime_ns, data)
+    return data
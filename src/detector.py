@@ -3,11 +3,13 @@ Detection algorithms for fish tank monitoring.
 Full feature set - all detectors.
 """
 
+import itertools
 import logging
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, unique
+from functools import lru_cache
 from typing import Optional
 from collections import deque
 import numpy as np
@@ -16,6 +18,7 @@ import cv2
 logger = logging.getLogger(__name__)
 
 
+@unique
 class AlertType(Enum):
     # Health/Emergency
     NO_MOTION = "no_motion"
@@ -48,7 +51,12 @@ class AlertType(Enum):
     NEW_BEHAVIOR = "new_behavior"
 
 
-@dataclass
+# Dense 0..N-1 index per alert type (definition order), so lookup tables can
+# be tuples indexed by ``ALERT_TYPE_INDEX[alert.type]`` instead of enum-keyed dicts
+ALERT_TYPE_INDEX: dict[AlertType, int] = {t: i for i, t in enumerate(AlertType)}
+
+
+@dataclass(slots=True)
 class Alert:
     """Represents a detected alert."""
     type: AlertType
@@ -59,7 +67,7 @@ class Alert:
     is_cool_moment: bool = False  # True = good, False = potential problem
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectorConfig:
     """Configuration for detectors."""
     motion_sensitivity: int = 50
@@ -70,6 +78,16 @@ class DetectorConfig:
     learn_baseline: bool = True
     feeding_times: list = field(default_factory=list)  # ["09:00", "18:00"]
     fish_count: int = 0  # 0 = auto-detect
+    use_opencl: bool = False  # Run heavy filters through OpenCV's T-API when available
+
+
+@lru_cache(maxsize=1)
+def _have_opencl() -> bool:
+    """Whether OpenCV can dispatch UMat work to an OpenCL device."""
+    try:
+        return bool(cv2.ocl.haveOpenCL())
+    except Exception:
+        return False
 
 
 class BaseDetector(ABC):
@@ -77,96 +95,148 @@ class BaseDetector(ABC):
 
     def __init__(self, config: DetectorConfig) -> None:
         self.config = config
+        self.use_opencl = config.use_opencl and _have_opencl()
 
     @abstractmethod
-    def process(self, frame: np.ndarray) -> list[Alert]:
-        """Process a frame and return any triggered alerts."""
+    def process(
+        self,
+        frame: np.ndarray,
+        gray: Optional[np.ndarray] = None,
+        now: Optional[float] = None,
+    ) -> list[Alert]:
+        """Process a frame and return any triggered alerts.
+
+        ``gray`` and ``now`` let the caller share one grayscale conversion and
+        one timestamp across detectors; both are computed when omitted.
+        """
         ...
 
 
 class MotionDetector(BaseDetector):
     """Detects motion and no-motion events."""
 
+    # Frames are compared as an INTER_AREA (box-filtered) thumbnail, which
+    # both smooths sensor noise and shrinks the diff to a fraction of a frame
+    SIZE = (160, 120)
+
     def __init__(self, config: DetectorConfig) -> None:
         super().__init__(config)
         self.prev_frame: Optional[np.ndarray] = None
         self.last_motion_time: float = time.time()
-        self.motion_history: deque = deque(maxlen=1000)
-        self.baseline_motion: Optional[float] = None
-
-    def process(self, frame: np.ndarray) -> list[Alert]:
+        self.motion_history: deque = deque(maxlen=1000)  # changed-pixel counts
+        self.baseline_motion: Optional[float] = None  # in changed pixels
+        # Sensitivity is a percentage of the frame; pre-scale it to
+        # thumbnail pixels
+        self._frame_pixels: int = self.SIZE[0] * self.SIZE[1]
+        sensitivity_percent = (100 - config.motion_sensitivity) / 10
+        self._sensitivity_thresh_px: int = int(sensitivity_percent / 100 * self._frame_pixels)
+
+    def process(
+        self,
+        frame: np.ndarray,
+        gray: Optional[np.ndarray] = None,
+        now: Optional[float] = None,
+    ) -> list[Alert]:
         """Process a frame and return alerts if triggered."""
         alerts: list[Alert] = []
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (21, 21), 0)
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if now is None:
+            now = time.time()
+        if self.use_opencl:
+            # Resize/absdiff/threshold/countNonZero all stay on the device
+            gray = cv2.UMat(gray)
+        gray = cv2.resize(gray, self.SIZE, interpolation=cv2.INTER_AREA)
 
         if self.prev_frame is None:
             self.prev_frame = gray
             return alerts
 
-        motion_level = self._compute_motion_level(gray)
+        motion_px = self._count_motion_pixels(gray)
         self.prev_frame = gray
-        self.motion_history.append(motion_level)
+        self.motion_history.append(motion_px)
         self._update_baseline()
 
-        sensitivity_threshold = (100 - self.config.motion_sensitivity) / 10
+        if motion_px > self._sensitivity_thresh_px:
+            self.last_motion_time = now
+            alerts.extend(self._check_motion_spikes(motion_px, frame, now))
 
-        if motion_level > sensitivity_threshold:
-            self.last_motion_time = time.time()
-            alerts.extend(self._check_motion_spikes(motion_level, frame))
-
-        alerts.extend(self._check_no_motion(frame))
-        alerts.extend(self._check_low_activity(frame))
+        alerts.extend(self._check_no_motion(frame, now))
+        alerts.extend(self._check_low_activity(frame, now))
 
         return alerts
 
-    def _compute_motion_level(self, gray: np.ndarray) -> float:
-        """Compute motion level as percentage of changed pixels."""
+    def warmup(
+        self,
+        frame: np.ndarray,
+        n: int,
+        gray: Optional[np.ndarray] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """Prime the detector as if ``frame`` had been processed ``n`` times.
+
+        Same state as ``n`` calls to ``process`` with an unchanging frame
+        (alerts discarded), but only the first call does any image work.
+        """
+        if n <= 0:
+            return
+        self.process(frame, gray, now)
+        # Every repeat of the frame is a zero-pixel diff
+        self.motion_history.extend(itertools.repeat(0, n - 1))
+        self._update_baseline()
+
+    def _count_motion_pixels(self, gray: np.ndarray) -> int:
+        """Count pixels that changed noticeably since the previous frame."""
         delta = cv2.absdiff(self.prev_frame, gray)
         thresh = cv2.threshold(delta, 25, 255, cv2.THRESH_BINARY)[1]
-        return float(np.sum(thresh) / thresh.size / 255 * 100)
+        return cv2.countNonZero(thresh)
 
     def _update_baseline(self) -> None:
         """Update baseline motion from history."""
         if self.config.learn_baseline and len(self.motion_history) > 100:
             self.baseline_motion = float(np.mean(list(self.motion_history)))
 
-    def _check_motion_spikes(self, motion_level: float, frame: np.ndarray) -> list[Alert]:
+    def _check_motion_spikes(self, motion_px: int, frame: np.ndarray, now: float) -> list[Alert]:
         """Check for unusual motion spikes and erratic swimming."""
         alerts: list[Alert] = []
         if not self.baseline_motion:
             return alerts
 
-        if motion_level > self.baseline_motion * 5:
+        if motion_px > self.baseline_motion * 5:
+            motion_level = motion_px * 100 / self._frame_pixels
             alerts.append(Alert(
                 type=AlertType.ERRATIC_SWIMMING,
                 message=f"Possible erratic swimming detected! Motion: {motion_level:.1f}%",
                 confidence=min(motion_level / 30, 1.0),
+                timestamp=now,
                 frame=frame,
             ))
-        elif motion_level > self.baseline_motion * 3:
+        elif motion_px > self.baseline_motion * 3:
+            motion_level = motion_px * 100 / self._frame_pixels
             alerts.append(Alert(
                 type=AlertType.MOTION_SPIKE,
                 message=f"Unusual activity spike! Motion: {motion_level:.1f}%",
                 confidence=min(motion_level / 20, 1.0),
+                timestamp=now,
                 frame=frame,
             ))
 
         return alerts
 
-    def _check_no_motion(self, frame: np.ndarray) -> list[Alert]:
+    def _check_no_motion(self, frame: np.ndarray, now: float) -> list[Alert]:
         """Check for extended period of no motion."""
-        no_motion_duration = time.time() - self.last_motion_time
+        no_motion_duration = now - self.last_motion_time
         if no_motion_duration > self.config.no_motion_threshold:
             return [Alert(
                 type=AlertType.NO_MOTION,
                 message=f"No motion for {int(no_motion_duration)} seconds",
                 confidence=min(no_motion_duration / self.config.no_motion_threshold, 1.0),
+                timestamp=now,
                 frame=frame,
             )]
         return []
 
-    def _check_low_activity(self, frame: np.ndarray) -> list[Alert]:
+    def _check_low_activity(self, frame: np.ndarray, now: float) -> list[Alert]:
         """Check for sustained below-baseline activity."""
         if not self.baseline_motion or len(self.motion_history) <= 100:
             return []
@@ -176,6 +246,7 @@ class MotionDetector(BaseDetector):
                 type=AlertType.LOW_ACTIVITY,
                 message="Activity levels significantly below normal",
                 confidence=0.6,
+                timestamp=now,
                 frame=frame,
             )]
         return []
@@ -191,8 +262,15 @@ class ColorDetector(BaseDetector):
         self.color_samples: deque = deque(maxlen=500)
         self.green_history: deque = deque(maxlen=500)
 
-    def process(self, frame: np.ndarray) -> list[Alert]:
+    def process(
+        self,
+        frame: np.ndarray,
+        gray: Optional[np.ndarray] = None,
+        now: Optional[float] = None,
+    ) -> list[Alert]:
         """Process a frame and check for color changes."""
+        if now is None:
+            now = time.time()
         alerts: list[Alert] = []
         center = self._extract_center_region(frame)
 
@@ -204,8 +282,8 @@ class ColorDetector(BaseDetector):
         if self.baseline_color is None:
             return alerts
 
-        alerts.extend(self._check_color_change(avg_color, frame))
-        alerts.extend(self._check_algae_growth(frame))
+        alerts.extend(self._check_color_change(avg_color, frame, now))
+        alerts.extend(self._check_algae_growth(frame, now))
 
         return alerts
 
@@ -227,7 +305,7 @@ class ColorDetector(BaseDetector):
             self.baseline_color = np.mean(list(self.color_samples)[:100], axis=0)
             self.baseline_hsv = float(np.mean(list(self.green_history)[:100]))
 
-    def _check_color_change(self, avg_color: np.ndarray, frame: np.ndarray) -> list[Alert]:
+    def _check_color_change(self, avg_color: np.ndarray, frame: np.ndarray, now: float) -> list[Alert]:
         """Check for water color change / cloudiness."""
         color_diff = float(np.linalg.norm(avg_color - self.baseline_color))
         if color_diff <= self.config.color_change_threshold:
@@ -239,16 +317,18 @@ class ColorDetector(BaseDetector):
                 type=AlertType.WATER_CLOUDY,
                 message=f"Water appears cloudy. Color shift: {color_diff:.1f}",
                 confidence=min(color_diff / 30, 1.0),
+                timestamp=now,
                 frame=frame,
             )]
         return [Alert(
             type=AlertType.COLOR_CHANGE,
             message=f"Water color changed. Difference: {color_diff:.1f}",
             confidence=min(color_diff / 30, 1.0),
+            timestamp=now,
             frame=frame,
         )]
 
-    def _check_algae_growth(self, frame: np.ndarray) -> list[Alert]:
+    def _check_algae_growth(self, frame: np.ndarray, now: float) -> list[Alert]:
         """Check for green tint increase (algae)."""
         if not self.baseline_hsv or len(self.green_history) <= 100:
             return []
@@ -259,6 +339,7 @@ class ColorDetector(BaseDetector):
                 type=AlertType.ALGAE_GROWTH,
                 message="Possible algae growth - green tint increasing",
                 confidence=min(green_shift / 20, 1.0),
+                timestamp=now,
                 frame=frame,
             )]
         return []
@@ -274,81 +355,98 @@ class ZoneDetector(BaseDetector):
         self.corner_activity: dict = {}
         self.hiding_start: Optional[float] = None
 
-    def process(self, frame: np.ndarray) -> list[Alert]:
+    def process(
+        self,
+        frame: np.ndarray,
+        gray: Optional[np.ndarray] = None,
+        now: Optional[float] = None,
+    ) -> list[Alert]:
         """Check for zone-specific activity."""
         alerts: list[Alert] = []
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if now is None:
+            now = time.time()
 
-        alerts.extend(self._check_surface_activity(gray, frame))
-        alerts.extend(self._check_bottom_activity(gray, frame))
-        alerts.extend(self._check_corner_clustering(gray, frame))
+        # Every zone overlaps the same bright-pixel mask, so sum it once and
+        # read each zone's count from the integral image in O(1).
+        bright = cv2.threshold(gray, 180, 1, cv2.THRESH_BINARY)[1]
+        integral = cv2.integral(bright, sdepth=cv2.CV_32S)
 
-        return alerts
+        alerts.extend(self._check_surface_activity(integral, frame, now))
+        alerts.extend(self._check_bottom_activity(integral, frame, now))
+        alerts.extend(self._check_corner_clustering(integral, frame, now))
 
-    def _get_zone_activity(self, zone: np.ndarray, brightness_threshold: int = 180) -> float:
-        """Calculate percentage of bright pixels in a zone."""
-        return float(np.sum(zone > brightness_threshold) / zone.size * 100)
+        return alerts
 
-    def _check_surface_activity(self, gray: np.ndarray, frame: np.ndarray) -> list[Alert]:
+    @staticmethod
+    def _integral_zone_activity(integral: np.ndarray, rows: slice, cols: slice) -> float:
+        """Percentage of bright pixels in gray[rows, cols], read from its integral image."""
+        y0, y1, _ = rows.indices(integral.shape[0] - 1)
+        x0, x1, _ = cols.indices(integral.shape[1] - 1)
+        area = max(y1 - y0, 0) * max(x1 - x0, 0)
+        if area == 0:
+            return 0.0
+        count = integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+        return float(count) / area * 100
+
+    def _check_surface_activity(self, integral: np.ndarray, frame: np.ndarray, now: float) -> list[Alert]:
         """Check for fish at the surface (gasping/floating)."""
-        h, w = gray.shape[:2]
+        h = integral.shape[0] - 1
         surface_h = int(h * self.config.surface_zone_percent / 100)
-        surface_zone = gray[:surface_h, :]
-        surface_activity = self._get_zone_activity(surface_zone)
+        surface_activity = self._integral_zone_activity(integral, slice(None, surface_h), slice(None))
 
         alerts: list[Alert] = []
         if surface_activity > 5:
             if self.surface_activity_start is None:
-                self.surface_activity_start = time.time()
+                self.surface_activity_start = now
             else:
-                duration = time.time() - self.surface_activity_start
+                duration = now - self.surface_activity_start
                 if duration > 60:
                     alerts.append(Alert(
                         type=AlertType.GASPING_SURFACE,
                         message="Fish at surface for extended period - possible oxygen issue",
-                        confidence=0.7, frame=frame,
+                        confidence=0.7, timestamp=now, frame=frame,
                     ))
                 elif duration > 30:
                     alerts.append(Alert(
                         type=AlertType.SURFACE_ACTIVITY,
                         message="Sustained activity at water surface",
-                        confidence=0.6, frame=frame,
+                        confidence=0.6, timestamp=now, frame=frame,
                     ))
         else:
             self.surface_activity_start = None
         return alerts
 
-    def _check_bottom_activity(self, gray: np.ndarray, frame: np.ndarray) -> list[Alert]:
+    def _check_bottom_activity(self, integral: np.ndarray, frame: np.ndarray, now: float) -> list[Alert]:
         """Check for fish stuck at the bottom."""
-        h, w = gray.shape[:2]
+        h = integral.shape[0] - 1
         bottom_h = int(h * self.config.bottom_zone_percent / 100)
-        bottom_zone = gray[-bottom_h:, :]
-        bottom_activity = self._get_zone_activity(bottom_zone)
+        bottom_activity = self._integral_zone_activity(integral, slice(-bottom_h, None), slice(None))
 
         alerts: list[Alert] = []
         if bottom_activity > 8:
             if self.bottom_activity_start is None:
-                self.bottom_activity_start = time.time()
-            elif time.time() - self.bottom_activity_start > 300:
+                self.bottom_activity_start = now
+            elif now - self.bottom_activity_start > 300:
                 alerts.append(Alert(
                     type=AlertType.FISH_BOTTOM,
                     message="Fish stuck at bottom for extended period",
-                    confidence=0.7, frame=frame,
+                    confidence=0.7, timestamp=now, frame=frame,
                 ))
         else:
             self.bottom_activity_start = None
         return alerts
 
-    def _check_corner_clustering(self, gray: np.ndarray, frame: np.ndarray) -> list[Alert]:
+    def _check_corner_clustering(self, integral: np.ndarray, frame: np.ndarray, now: float) -> list[Alert]:
         """Check for fish clustering in a single corner."""
-        h, w = gray.shape[:2]
-        corners = [
-            gray[:h // 3, :w // 3],
-            gray[:h // 3, -w // 3:],
-            gray[-h // 3:, :w // 3],
-            gray[-h // 3:, -w // 3:],
+        h, w = integral.shape[0] - 1, integral.shape[1] - 1
+        top, bottom = slice(None, h // 3), slice(-h // 3, None)
+        left, right = slice(None, w // 3), slice(-w // 3, None)
+        corner_activities = [
+            self._integral_zone_activity(integral, rows, cols)
+            for rows, cols in ((top, left), (top, right), (bottom, left), (bottom, right))
         ]
-        corner_activities = [self._get_zone_activity(c) for c in corners]
         max_corner = max(corner_activities)
         total = sum(corner_activities)
 
@@ -356,11 +454,24 @@ class ZoneDetector(BaseDetector):
             return [Alert(
                 type=AlertType.CLUSTERING,
                 message="Fish clustering in corner - possible stress",
-                confidence=0.6, frame=frame,
+                confidence=0.6, timestamp=now, frame=frame,
             )]
         return []
 
 
+def _int_median(values: np.ndarray) -> int:
+    """Median of small non-negative ints via a histogram instead of a sort.
+
+    Matches ``int(np.median(values))``: even-length inputs average the two
+    middle values before truncating.
+    """
+    cumulative = np.cumsum(np.bincount(values))
+    n = len(values)
+    lo = int(np.searchsorted(cumulative, (n - 1) // 2 + 1))
+    hi = int(np.searchsorted(cumulative, n // 2 + 1))
+    return int((lo + hi) / 2)
+
+
 class FishCountDetector(BaseDetector):
     """Attempts to count fish and detect changes."""
 
@@ -369,21 +480,33 @@ class FishCountDetector(BaseDetector):
         self.count_history: deque = deque(maxlen=100)
         self.baseline_count: Optional[int] = None
 
-    def process(self, frame: np.ndarray) -> list[Alert]:
+    def process(
+        self,
+        frame: np.ndarray,
+        gray: Optional[np.ndarray] = None,
+        now: Optional[float] = None,
+    ) -> list[Alert]:
         """Count fish-like objects in frame."""
-        fish_count = self._count_fish_objects(frame)
+        if now is None:
+            now = time.time()
+        fish_count = self._count_fish_objects(frame, gray)
         self.count_history.append(fish_count)
         self._establish_baseline()
-        return self._check_missing_fish(frame)
+        return self._check_missing_fish(frame, now)
 
-    def _count_fish_objects(self, frame: np.ndarray) -> int:
+    def _count_fish_objects(self, frame: np.ndarray, gray: Optional[np.ndarray] = None) -> int:
         """Count fish-sized contours in the frame."""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.use_opencl:
+            gray = cv2.UMat(gray)
         blurred = cv2.GaussianBlur(gray, (11, 11), 0)
         thresh = cv2.adaptiveThreshold(
             blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
             cv2.THRESH_BINARY_INV, 11, 2,
         )
+        if self.use_opencl:
+            thresh = thresh.get()
         contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
         h, w = frame.shape[:2]
@@ -394,21 +517,27 @@ class FishCountDetector(BaseDetector):
     def _establish_baseline(self) -> None:
         """Establish baseline fish count from history."""
         if self.baseline_count is None and len(self.count_history) >= 50:
-            self.baseline_count = int(np.median(list(self.count_history)))
+            counts = np.fromiter(self.count_history, dtype=np.intp, count=len(self.count_history))
+            self.baseline_count = _int_median(counts)
             if self.config.fish_count == 0:
                 logger.info(f"Auto-detected baseline: {self.baseline_count} fish")
 
-    def _check_missing_fish(self, frame: np.ndarray) -> list[Alert]:
+    def _check_missing_fish(self, frame: np.ndarray, now: float) -> list[Alert]:
         """Check if current count is below expected."""
         if not self.baseline_count or len(self.count_history) < 10:
             return []
-        recent_count = int(np.median(list(self.count_history)[-10:]))
+        n = len(self.count_history)
+        recent = np.fromiter(
+            itertools.islice(self.count_history, n - 10, n), dtype=np.intp, count=10,
+        )
+        lo, hi = np.partition(recent, (4, 5))[4:6]
+        recent_count = int((lo + hi) / 2)
         expected = self.config.fish_count if self.config.fish_count > 0 else self.baseline_count
         if recent_count < expected - 1:
             return [Alert(
                 type=AlertType.NO_MOTION,
                 message=f"Fish count dropped: seeing {recent_count}, expected {expected}",
-                confidence=0.5, frame=frame,
+                confidence=0.5, timestamp=now, frame=frame,
             )]
         return []
 
@@ -421,24 +550,32 @@ class FilterDetector(BaseDetector):
         self.bubble_history: deque = deque(maxlen=300)
         self.baseline_bubbles: Optional[float] = None
 
-    def process(self, frame: np.ndarray) -> list[Alert]:
+    def process(
+        self,
+        frame: np.ndarray,
+        gray: Optional[np.ndarray] = None,
+        now: Optional[float] = None,
+    ) -> list[Alert]:
         """Detect bubble/water movement patterns."""
-        bubble_activity = self._measure_bubble_activity(frame)
+        if now is None:
+            now = time.time()
+        bubble_activity = self._measure_bubble_activity(frame, gray)
         self.bubble_history.append(bubble_activity)
         self._establish_baseline()
-        return self._check_filter_stopped(frame)
+        return self._check_filter_stopped(frame, now)
 
-    def _measure_bubble_activity(self, frame: np.ndarray) -> float:
+    def _measure_bubble_activity(self, frame: np.ndarray, gray: Optional[np.ndarray] = None) -> float:
         """Measure bubble activity in filter zones (top corners)."""
-        h, w = frame.shape[:2]
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        h, w = gray.shape[:2]
         filter_zones = [
-            frame[:h // 4, :w // 4],
-            frame[:h // 4, -w // 4:],
+            gray[:h // 4, :w // 4],
+            gray[:h // 4, -w // 4:],
         ]
         total = 0.0
         for zone in filter_zones:
-            gray = cv2.cvtColor(zone, cv2.COLOR_BGR2GRAY)
-            laplacian = cv2.Laplacian(gray, cv2.CV_64F)
+            laplacian = cv2.Laplacian(zone, cv2.CV_64F)
             total += float(np.var(laplacian))
         return total
 
@@ -447,7 +584,7 @@ class FilterDetector(BaseDetector):
         if self.baseline_bubbles is None and len(self.bubble_history) >= 100:
             self.baseline_bubbles = float(np.mean(list(self.bubble_history)))
 
-    def _check_filter_stopped(self, frame: np.ndarray) -> list[Alert]:
+    def _check_filter_stopped(self, frame: np.ndarray, now: float) -> list[Alert]:
         """Check if filter activity has dropped significantly."""
         if not self.baseline_bubbles or len(self.bubble_history) < 60:
             return []
@@ -456,7 +593,7 @@ class FilterDetector(BaseDetector):
             return [Alert(
                 type=AlertType.FILTER_STOPPED,
                 message="Filter/bubbles may have stopped - check equipment",
-                confidence=0.6, frame=frame,
+                confidence=0.6, timestamp=now, frame=frame,
             )]
         return []
 
@@ -471,23 +608,31 @@ class CoolMomentDetector(BaseDetector):
         self.last_cool_moment: float = 0
         self.cooldown = 300  # 5 min between cool clips
 
-    def process(self, frame: np.ndarray) -> list[Alert]:
+    def process(
+        self,
+        frame: np.ndarray,
+        gray: Optional[np.ndarray] = None,
+        now: Optional[float] = None,
+    ) -> list[Alert]:
         """Detect interesting moments."""
-        if time.time() - self.last_cool_moment < self.cooldown:
+        if now is None:
+            now = time.time()
+        if now - self.last_cool_moment < self.cooldown:
             return []
 
-        activity = self._compute_activity(frame)
+        activity = self._compute_activity(frame, gray)
         self.activity_history.append(activity)
         self._establish_baseline()
 
         if self.baseline_activity is None:
             return []
 
-        return self._check_interesting_activity(frame)
+        return self._check_interesting_activity(frame, now)
 
-    def _compute_activity(self, frame: np.ndarray) -> float:
+    def _compute_activity(self, frame: np.ndarray, gray: Optional[np.ndarray] = None) -> float:
         """Compute activity metric from frame variance."""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         return float(np.std(gray))
 
     def _establish_baseline(self) -> None:
@@ -495,25 +640,25 @@ class CoolMomentDetector(BaseDetector):
         if self.baseline_activity is None and len(self.activity_history) >= 50:
             self.baseline_activity = float(np.mean(list(self.activity_history)))
 
-    def _check_interesting_activity(self, frame: np.ndarray) -> list[Alert]:
+    def _check_interesting_activity(self, frame: np.ndarray, now: float) -> list[Alert]:
         """Check for feeding frenzy or interesting moment."""
         if len(self.activity_history) < 10:
             return []
         recent = float(np.mean(list(self.activity_history)[-10:]))
 
         if recent > self.baseline_activity * 2:
-            self.last_cool_moment = time.time()
+            self.last_cool_moment = now
             return [Alert(
                 type=AlertType.FEEDING_FRENZY,
                 message="High activity - possible feeding frenzy!",
-                confidence=0.7, frame=frame, is_cool_moment=True,
+                confidence=0.7, timestamp=now, frame=frame, is_cool_moment=True,
             )]
         elif recent > self.baseline_activity * 1.5:
-            self.last_cool_moment = time.time()
+            self.last_cool_moment = now
             return [Alert(
                 type=AlertType.INTERESTING_MOMENT,
                 message="Interesting activity spike",
-                confidence=0.5, frame=frame, is_cool_moment=True,
+                confidence=0.5, timestamp=now, frame=frame, is_cool_moment=True,
             )]
         return []
 
@@ -534,23 +679,28 @@ class FishWatcherDetector:
         self.last_alert_time: dict[AlertType, float] = {}
         self.cooldown = 60  # seconds
 
-    def process(self, frame: np.ndarray) -> list[Alert]:
-        """Process frame through all detectors."""
+    def process(self, frame: np.ndarray, now: Optional[float] = None) -> list[Alert]:
+        """Process frame through all detectors (``now`` defaults to time.time())."""
         all_alerts: list[Alert] = []
+        if now is None:
+            now = time.time()
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
 
         for detector in self.detectors:
             try:
-                alerts = detector.process(frame)
+                alerts = detector.process(frame, gray, now)
                 for alert in alerts:
-                    if self._check_cooldown(alert.type):
+                    if self._check_cooldown(alert.type, now):
                         all_alerts.append(alert)
-                        self.last_alert_time[alert.type] = time.time()
+                        self.last_alert_time[alert.type] = now
             except Exception as e:
                 logger.error(f"Error in {detector.__class__.__name__}: {e}")
 
         return all_alerts
 
-    def _check_cooldown(self, alert_type: AlertType) -> bool:
+    def _check_cooldown(self, alert_type: AlertType, now: Optional[float] = None) -> bool:
         """Check if enough time has passed since last alert of this type."""
+        if now is None:
+            now = time.time()
         last_time = self.last_alert_time.get(alert_type, 0)
-        return time.time() - last_time > self.cooldown
+        return now - last_time > self.cooldown
@@ -12,6 +12,18 @@ from datetime import datetime
 
 from .detector import Alert, AlertType
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding
+    orjson = None
+
+
+def _dumps(payload: dict) -> bytes:
+    """Encode a webhook payload as UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload).encode('utf-8')
+
 
 class DiscordNotifier:
     """Send alerts directly to Discord via webhook."""
@@ -94,20 +106,28 @@ class DiscordNotifier:
         "info": 0x00D4FF,      # Cyan
     }
     
+    CRITICAL_TYPES = frozenset({AlertType.FISH_FLOATING, AlertType.GASPING_SURFACE})
+    HIGH_TYPES = frozenset({
+        AlertType.NO_MOTION, AlertType.FISH_BOTTOM,
+        AlertType.ERRATIC_SWIMMING, AlertType.FILTER_STOPPED,
+    })
+    LOW_TYPES = frozenset({AlertType.FEEDING_FRENZY, AlertType.INTERESTING_MOMENT, AlertType.FISH_PLAYING})
+    
     def __init__(self, webhook_url: str, tank_name: str = "Fish Tank"):
         self.webhook_url = webhook_url
         self.tank_name = tank_name
         
-    def _get_severity(self, alert_type: AlertType) -> str:
-        critical = {AlertType.FISH_FLOATING, AlertType.GASPING_SURFACE}
-        high = {AlertType.NO_MOTION, AlertType.FISH_BOTTOM, AlertType.ERRATIC_SWIMMING, AlertType.FILTER_STOPPED}
-        low = {AlertType.FEEDING_FRENZY, AlertType.INTERESTING_MOMENT, AlertType.FISH_PLAYING}
+        # Static parts of the alert embed, built once and shallow-copied per alert
+        self._title = f"🐟 {tank_name}"
+        self._cool_title = f"✨ {tank_name} - Cool Moment!"
+        self._footer = {"text": "Fish Watcher AI"}
         
-        if alert_type in critical:
+    def _get_severity(self, alert_type: AlertType) -> str:
+        if alert_type in self.CRITICAL_TYPES:
             return "critical"
-        elif alert_type in high:
+        elif alert_type in self.HIGH_TYPES:
             return "high"
-        elif alert_type in low:
+        elif alert_type in self.LOW_TYPES:
             return "low"
         return "medium"
     
@@ -124,39 +144,40 @@ class DiscordNotifier:
         color = self.SEVERITY_COLORS.get(severity, 0x00D4FF)
         
         # Build embed
-        embed = {
-            "title": f"🐟 {self.tank_name}",
-            "description": self._get_message(alert.type),
-            "color": color,
-            "timestamp": datetime.utcnow().isoformat(),
-            "fields": [
-                {
-                    "name": "Type",
-                    "value": alert.type.value.replace("_", " ").title(),
-                    "inline": True,
-                },
-                {
-                    "name": "Confidence",
-                    "value": f"{alert.confidence:.0%}",
-                    "inline": True,
-                },
-            ],
-            "footer": {
-                "text": "Fish Watcher AI",
-            }
-        }
+        fields = []
         
         # Add fish name if known
         if fish_name:
-            embed["fields"].insert(0, {
+            fields.append({
                 "name": "Who",
                 "value": f"🐟 {fish_name}",
                 "inline": True,
             })
         
+        fields.append({
+            "name": "Type",
+            "value": alert.type.value.replace("_", " ").title(),
+            "inline": True,
+        })
+        fields.append({
+            "name": "Confidence",
+            "value": f"{alert.confidence:.0%}",
+            "inline": True,
+        })
+        
+        embed = {
+            # Cool moment? Add celebration
+            "title": self._cool_title if alert.is_cool_moment else self._title,
+            "description": self._get_message(alert.type),
+            "color": color,
+            "timestamp": datetime.utcnow().isoformat(),
+            "fields": fields,
+            "footer": self._footer,
+        }
+        
         # Add vision analysis if available
         if vision_analysis and vision_analysis.get("summary"):
-            embed["fields"].append({
+            fields.append({
                 "name": "🧠 AI Analysis",
                 "value": vision_analysis["summary"][:1024],
                 "inline": False,
@@ -166,7 +187,7 @@ class DiscordNotifier:
                 recs = vision_analysis["recommendations"]
                 if isinstance(recs, list):
                     recs = "\n".join(f"• {r}" for r in recs[:3])
-                embed["fields"].append({
+                fields.append({
                     "name": "💡 Recommendations",
                     "value": recs[:1024],
                     "inline": False,
@@ -174,33 +195,32 @@ class DiscordNotifier:
         
         # Add clip info
         if clip_path:
-            embed["fields"].append({
+            fields.append({
                 "name": "📹 Clip",
                 "value": f"`{Path(clip_path).name}`",
                 "inline": False,
             })
         
-        # Cool moment? Add celebration
-        if alert.is_cool_moment:
-            embed["title"] = f"✨ {self.tank_name} - Cool Moment!"
-        
         payload = {
             "embeds": [embed],
         }
         
+        return self._post(payload, "Failed to send")
+    
+    def _post(self, payload: dict, error_prefix: str) -> bool:
+        """POST a JSON payload to the webhook."""
         try:
-            data = json.dumps(payload).encode('utf-8')
             req = urllib.request.Request(
                 self.webhook_url,
-                data=data,
+                data=_dumps(payload),
                 headers={'Content-Type': 'application/json'}
             )
             
             with urllib.request.urlopen(req, timeout=10) as response:
-                return response.status == 204 or response.status == 200
+                return response.status in (200, 204)
                 
         except Exception as e:
-            print(f"[Discord] Failed to send: {e}")
+            print(f"[Discord] {error_prefix}: {e}")
             return False
     
     def send_daily_report(self, report: dict) -> bool:
@@ -244,17 +264,4 @@ class DiscordNotifier:
         
         payload = {"embeds": [embed]}
         
-        try:
-            data = json.dumps(payload).encode('utf-8')
-            req = urllib.request.Request(
-                self.webhook_url,
-                data=data,
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                return response.status in (200, 204)
-                
-        except Exception as e:
-            print(f"[Discord] Failed to send report: {e}")
-            return False
+        return self._post(payload, "Failed to send report")
@@ -5,10 +5,138 @@ Uses background subtraction and blob detection.
 
 import cv2
 import numpy as np
+from collections import deque
 from typing import Tuple, List, Optional
 from dataclasses import dataclass
 
 
+# Per-channel lookup tables for typical fish colors in HSV. The orange/gold
+# (H 5-25), blue (H 100-130) and red (H 0-5) ranges share the same S/V
+# bounds, so their union is separable: hue in any range AND S, V >= 100.
+_HUE_LUT = np.zeros(256, dtype=np.uint8)
+_HUE_LUT[0:26] = 255
+_HUE_LUT[100:131] = 255
+_SAT_VAL_LUT = np.zeros(256, dtype=np.uint8)
+_SAT_VAL_LUT[100:] = 255
+
+# Morphology kernels, built once. Rectangular kernels let OpenCV use its
+# separable row/column fast path; shape doesn't matter for fish-sized blobs.
+_KERNEL_OPEN_5 = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+_KERNEL_CLOSE_10 = cv2.getStructuringElement(cv2.MORPH_RECT, (10, 10))
+_KERNEL_CLEAN_7 = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (7, 7))
+
+# Run-length-encoded morphology (opencv-contrib's ximgproc.rl), optional
+_rl = getattr(getattr(cv2, "ximgproc", None), "rl", None)
+
+# OpenCV's fixed-point BGR->HSV division tables (8-bit, hue in 0-179)
+_HSV_SHIFT = 12
+_SDIV_TABLE = np.array(
+    [0] + [round((255 << _HSV_SHIFT) / i) for i in range(1, 256)], dtype=np.int64
+)
+_HDIV_TABLE = np.array(
+    [0] + [round((180 << _HSV_SHIFT) / (6 * i)) for i in range(1, 256)], dtype=np.int64
+)
+
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: fused per-pixel kernel for single-image mode
+    njit = None
+    prange = range
+
+
+def _classify_bgr(img: np.ndarray, out: np.ndarray) -> None:
+    """Write 255 into ``out`` where a BGR pixel falls in a fish-color range.
+    
+    Fuses BGR->HSV (same integer math as cv2.cvtColor) with the hue/S/V
+    tests in one pass. Compiled with Numba when it is installed.
+    """
+    rows, cols = img.shape[0], img.shape[1]
+    for y in prange(rows):
+        for x in range(cols):
+            b = np.int64(img[y, x, 0])
+            g = np.int64(img[y, x, 1])
+            r = np.int64(img[y, x, 2])
+            v = max(b, g, r)
+            diff = v - min(b, g, r)
+            out[y, x] = 0
+            if v < 100:
+                continue
+            sat = (diff * _SDIV_TABLE[v] + (1 << (_HSV_SHIFT - 1))) >> _HSV_SHIFT
+            if sat < 100:
+                continue
+            if v == r:
+                hue = g - b
+            elif v == g:
+                hue = b - r + 2 * diff
+            else:
+                hue = r - g + 4 * diff
+            hue = (hue * _HDIV_TABLE[diff] + (1 << (_HSV_SHIFT - 1))) >> _HSV_SHIFT
+            if hue < 0:
+                hue += 180
+            if hue <= 25 or 100 <= hue <= 130:
+                out[y, x] = 255
+
+
+_classify_bgr_jit = njit(parallel=True, cache=True)(_classify_bgr) if njit else None
+
+
+def _fish_color_mask(img: np.ndarray) -> np.ndarray:
+    """Binary mask of typical fish colors (orange/gold, blue, red) in a BGR image."""
+    if _classify_bgr_jit is not None:
+        mask = np.empty(img.shape[:2], dtype=np.uint8)
+        _classify_bgr_jit(np.ascontiguousarray(img), mask)
+        return mask
+    
+    # One LUT pass per HSV channel, written back into the split planes and
+    # intersected in place (no temporaries beyond the planes themselves)
+    h, s, v = cv2.split(cv2.cvtColor(img, cv2.COLOR_BGR2HSV))
+    cv2.LUT(h, _HUE_LUT, dst=h)
+    cv2.LUT(s, _SAT_VAL_LUT, dst=s)
+    cv2.LUT(v, _SAT_VAL_LUT, dst=v)
+    cv2.bitwise_and(h, s, dst=h)
+    cv2.bitwise_and(h, v, dst=h)
+    return h
+
+
+def _filter_blobs(area: np.ndarray, width: np.ndarray, height: np.ndarray,
+                  sx: float, sy: float, min_area: float, max_area: float,
+                  out: np.ndarray) -> None:
+    """Set ``out[i]`` where component i is fish-sized and fish-shaped.
+    
+    Areas and boxes are scaled to full-frame units before the checks, since
+    the work resolution need not keep the frame's aspect ratio; fish are
+    roughly elongated, so the aspect ratio must fall within 0.2-5.0.
+    """
+    scale = sx * sy
+    for i in range(area.shape[0]):
+        a = area[i] * scale
+        aspect = (width[i] * sx) / (height[i] * sy)
+        out[i] = min_area <= a <= max_area and 0.2 <= aspect <= 5.0
+
+
+_filter_blobs_jit = njit(cache=True)(_filter_blobs) if njit else None
+
+
+def _fish_blob_mask(stats: np.ndarray, sx: float, sy: float,
+                    min_area: float, max_area: float) -> np.ndarray:
+    """Boolean mask over connectedComponentsWithStats rows that look like fish."""
+    area = stats[:, cv2.CC_STAT_AREA]
+    width = stats[:, cv2.CC_STAT_WIDTH]
+    height = stats[:, cv2.CC_STAT_HEIGHT]
+    if _filter_blobs_jit is not None:
+        mask = np.empty(len(stats), dtype=np.bool_)
+        _filter_blobs_jit(area, width, height, sx, sy, min_area, max_area, mask)
+        return mask
+    
+    # One vectorized compare per bound
+    scaled = area * (sx * sy)
+    aspect = (width * sx) / (height * sy)
+    return (
+        (scaled >= min_area) & (scaled <= max_area)
+        & (aspect >= 0.2) & (aspect <= 5.0)
+    )
+
+
 @dataclass
 class FishBlob:
     """Represents a detected fish blob."""
@@ -37,6 +165,9 @@ class FishCounter:
         max_fish_area: int = 10000,
         learning_rate: float = 0.01,
         history: int = 500,
+        work_size: Optional[Tuple[int, int]] = (320, 240),
+        still_threshold: Optional[int] = None,
+        use_rle: bool = False,
     ):
         """
         Initialize fish counter.
@@ -46,10 +177,29 @@ class FishCounter:
             max_fish_area: Maximum blob area to consider as fish (pixels)
             learning_rate: Background learning rate (0-1, lower = slower adaptation)
             history: Number of frames for background model
+            work_size: (width, height) frames are downscaled to before
+                background subtraction; None processes at full resolution
+            still_threshold: Summed absolute difference between consecutive
+                32x32 thumbnails below which a frame is treated as unchanged
+                and MOG2/morphology are skipped. None derives it from the
+                frame size so a min-area fish still trips it; 0 disables
+            use_rle: Run the mask cleanup as run-length-encoded morphology
+                (needs opencv-contrib). Cost scales with the number of runs
+                rather than pixels x kernel area, which pays off for large
+                masks and kernels. Ignored if cv2.ximgproc.rl is missing
         """
         self.min_fish_area = min_fish_area
         self.max_fish_area = max_fish_area
         self.learning_rate = learning_rate
+        self.work_size = work_size
+        self.still_threshold = still_threshold
+        self._still_thresh = 0
+        
+        # Per-frame-size scale factors, set on the first frame
+        self._frame_shape: Optional[Tuple[int, int]] = None
+        self._resize_to: Optional[Tuple[int, int]] = None
+        self.scale_x = 1.0
+        self.scale_y = 1.0
         
         # Background subtractor
         self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
@@ -58,13 +208,28 @@ class FishCounter:
             detectShadows=False
         )
         
-        # Morphological kernels
-        self.kernel_open = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        self.kernel_close = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (10, 10))
+        # Morphological kernels (shared module constants)
+        self.kernel_open = _KERNEL_OPEN_5
+        self.kernel_close = _KERNEL_CLOSE_10
+        
+        self.use_rle = use_rle and _rl is not None
+        if use_rle and _rl is None:
+            print("[FishCounter] use_rle needs opencv-contrib (cv2.ximgproc); using standard morphology")
+        if self.use_rle:
+            self._rle_open = _rl.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+            self._rle_close = _rl.getStructuringElement(cv2.MORPH_RECT, (10, 10))
+        
+        # Set by reset(): the next apply() rebuilds the model from that frame
+        self._pending_reset = False
+        
+        # Cheap motion gate: thumbnail of the last frame that was processed
+        self._prev_thumb: Optional[np.ndarray] = None
         
         # Tracking history
         self.last_count = 0
-        self.count_history: List[int] = []
+        self.last_blobs: List[FishBlob] = []
+        self.count_history: deque = deque(maxlen=30)
+        self._count_hist: dict[int, int] = {}  # count -> occurrences in count_history
         self.stable_count = 0
         
     def process(self, frame: np.ndarray) -> Tuple[int, List[FishBlob]]:
@@ -77,47 +242,113 @@ class FishCounter:
         Returns:
             Tuple of (fish_count, list_of_fish_blobs)
         """
-        # Apply background subtraction
-        fg_mask = self.bg_subtractor.apply(frame, learningRate=self.learning_rate)
+        if frame.shape[:2] != self._frame_shape:
+            self._update_scale(frame.shape[:2])
+            self._prev_thumb = None
+        
+        # Nothing changed since the last processed frame: reuse its result
+        if self._still_thresh > 0:
+            thumb = cv2.resize(frame, (32, 32), interpolation=cv2.INTER_AREA)
+            prev = self._prev_thumb
+            if (prev is not None and not self._pending_reset
+                    and cv2.norm(thumb, prev, cv2.NORM_L1) < self._still_thresh):
+                self._update_stable_count(self.last_count)
+                return self.last_count, list(self.last_blobs)
+            # Only processed frames move the reference, so slow drift still
+            # adds up past the threshold
+            self._prev_thumb = thumb
+        
+        # Work on a downscaled copy; MOG2 and morphology are per-pixel
+        if self._resize_to is not None:
+            frame = cv2.resize(frame, self._resize_to, interpolation=cv2.INTER_AREA)
+        
+        # Apply background subtraction (learningRate=1 reinitializes the model)
+        learning_rate = 1.0 if self._pending_reset else self.learning_rate
+        self._pending_reset = False
+        fg_mask = self.bg_subtractor.apply(frame, learningRate=learning_rate)
         
         # Morphological cleanup
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, self.kernel_open)
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, self.kernel_close)
+        if self.use_rle:
+            rle = _rl.threshold(fg_mask, 127, cv2.THRESH_BINARY)
+            rle = _rl.morphologyEx(rle, cv2.MORPH_OPEN, self._rle_open)
+            rle = _rl.morphologyEx(rle, cv2.MORPH_CLOSE, self._rle_close)
+            fg_mask = np.zeros_like(fg_mask)
+            _rl.paint(fg_mask, rle, 255)
+        else:
+            fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, self.kernel_open)
+            fg_mask = cv2.dilate(fg_mask, self.kernel_close)
+            fg_mask = cv2.erode(fg_mask, self.kernel_close)
+        
+        # Label blobs; stats/centroids for every component come back in one call
+        _, _, stats, centroids = cv2.connectedComponentsWithStats(
+            fg_mask, connectivity=8, ltype=cv2.CV_32S
+        )
+        stats, centroids = stats[1:], centroids[1:]  # drop background label
         
-        # Find contours
-        contours, _ = cv2.findContours(
-            fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+        # Filter by size and aspect ratio
+        sx, sy = self.scale_x, self.scale_y
+        keep = np.flatnonzero(
+            _fish_blob_mask(stats, sx, sy, self.min_fish_area, self.max_fish_area)
         )
         
-        # Filter by size and create blobs
         fish_blobs = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if self.min_fish_area <= area <= self.max_fish_area:
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Aspect ratio filter (fish are roughly elongated)
-                aspect = float(w) / h if h > 0 else 0
-                if 0.2 <= aspect <= 5.0:  # Reasonable fish shapes
-                    center = (x + w // 2, y + h // 2)
-                    fish_blobs.append(FishBlob(
-                        x=x, y=y, width=w, height=h,
-                        area=area, center=center
-                    ))
+        for i in keep:
+            x, y, w, h, area = stats[i]
+            cx, cy = centroids[i]
+            fish_blobs.append(FishBlob(
+                x=int(x * sx), y=int(y * sy),
+                width=int(round(w * sx)), height=int(round(h * sy)),
+                area=float(area * (sx * sy)),
+                center=(int(cx * sx), int(cy * sy)),
+            ))
         
         # Update history and stable count
         count = len(fish_blobs)
-        self.count_history.append(count)
-        if len(self.count_history) > 30:
-            self.count_history.pop(0)
+        self._update_stable_count(count)
+        self.last_count = count
+        self.last_blobs = fish_blobs
+        return count, list(fish_blobs)
+    
+    def _update_stable_count(self, count: int) -> None:
+        """Push a count into the window and keep stable_count at its mode.
         
-        # Stable count is the mode of recent counts
-        if self.count_history:
-            from collections import Counter
-            self.stable_count = Counter(self.count_history).most_common(1)[0][0]
+        The histogram is updated incrementally; a full rescan only happens
+        when an evicted value was the current mode.
+        """
+        hist = self._count_hist
+        if len(self.count_history) == self.count_history.maxlen:
+            old = self.count_history[0]
+            hist[old] -= 1
+            if not hist[old]:
+                del hist[old]
+            if old == self.stable_count:
+                self.stable_count = max(hist, key=hist.get) if hist else count
         
-        self.last_count = count
-        return count, fish_blobs
+        self.count_history.append(count)
+        hist[count] = hist.get(count, 0) + 1
+        if hist[count] > hist.get(self.stable_count, 0):
+            self.stable_count = count
+    
+    def _update_scale(self, shape: Tuple[int, int]) -> None:
+        """Cache the working resolution and scale factors for a frame size."""
+        h, w = shape
+        self._frame_shape = (h, w)
+        if self.work_size is None or (w <= self.work_size[0] and h <= self.work_size[1]):
+            # Never upscale
+            self._resize_to = None
+            self.scale_x = self.scale_y = 1.0
+        else:
+            self._resize_to = self.work_size
+            self.scale_x = w / self.work_size[0]
+            self.scale_y = h / self.work_size[1]
+        
+        if self.still_threshold is not None:
+            self._still_thresh = self.still_threshold
+        else:
+            # What a min-area blob 16 levels off the background adds to the
+            # thumbnail L1 norm, capped at ~1 level of noise per thumbnail pixel
+            thumb_area = self.min_fish_area * (32 * 32) / (h * w)
+            self._still_thresh = min(32 * 32 * 3, int(thumb_area * 16 * 3))
     
     def draw_detections(
         self,
@@ -125,6 +356,7 @@ class FishCounter:
         blobs: List[FishBlob],
         color: Tuple[int, int, int] = (0, 255, 0),
         thickness: int = 2,
+        inplace: bool = False,
     ) -> np.ndarray:
         """
         Draw detection boxes and count on frame.
@@ -134,11 +366,12 @@ class FishCounter:
             blobs: List of detected fish blobs
             color: Box color (BGR)
             thickness: Line thickness
+            inplace: Draw directly onto ``frame`` (mutating it) instead of a copy
             
         Returns:
             Frame with drawings
         """
-        output = frame.copy()
+        output = frame if inplace else frame.copy()
         
         # Draw boxes around fish
         for i, blob in enumerate(blobs):
@@ -171,10 +404,12 @@ class FishCounter:
     
     def reset(self) -> None:
         """Reset the background model and history."""
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            history=500, varThreshold=50, detectShadows=False
-        )
+        # Keep the subtractor's buffers; the next frame overwrites the model
+        self._pending_reset = True
+        self._prev_thumb = None
+        self.last_blobs = []
         self.count_history.clear()
+        self._count_hist.clear()
         self.stable_count = 0
 
 
@@ -187,23 +422,12 @@ def count_fish_in_image(image_path: str) -> Tuple[int, List[FishBlob]]:
     if img is None:
         return 0, []
     
-    # Convert to HSV for color segmentation
-    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-    
     # Create mask for typical fish colors (this is a rough heuristic)
-    # Orange/gold fish
-    mask1 = cv2.inRange(hsv, (5, 100, 100), (25, 255, 255))
-    # Blue fish
-    mask2 = cv2.inRange(hsv, (100, 100, 100), (130, 255, 255))
-    # Red fish
-    mask3 = cv2.inRange(hsv, (0, 100, 100), (5, 255, 255))
-    
-    mask = mask1 | mask2 | mask3
+    mask = _fish_color_mask(img)
     
     # Cleanup
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (7, 7))
-    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+    cv2.morphologyEx(mask, cv2.MORPH_OPEN, _KERNEL_CLEAN_7, dst=mask)
+    cv2.morphologyEx(mask, cv2.MORPH_CLOSE, _KERNEL_CLEAN_7, dst=mask)
     
     # Find contours
     contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -223,32 +447,93 @@ def count_fish_in_image(image_path: str) -> Tuple[int, List[FishBlob]]:
     return len(fish_blobs), fish_blobs
 
 
-# CLI usage
-if __name__ == "__main__":
-    import sys
+def run_camera_demo(device: int = 0) -> None:
+    """
+    Live counting demo on a camera, press 'q' to quit.
     
-    if len(sys.argv) < 2:
-        # Demo with webcam
-        print("Usage: python -m src.fish_counter [camera_device|image_path]")
-        print("\nRunning webcam demo (press 'q' to quit)...")
-        
-        cap = cv2.VideoCapture(0)
-        counter = FishCounter()
-        
-        while True:
+    Capture, counting and display run as a three-stage pipeline joined by
+    bounded queues (maxsize=2), so camera reads and window updates overlap
+    with background subtraction instead of running back to back. Display
+    stays on the main thread since HighGUI requires it on some platforms.
+    """
+    import queue
+    import threading
+    
+    cap = cv2.VideoCapture(device)
+    # One OpenCV worker per stage; the pipeline supplies the parallelism
+    cv2.setNumThreads(1)
+    
+    counter = FishCounter()
+    read_q: queue.Queue = queue.Queue(maxsize=2)
+    display_q: queue.Queue = queue.Queue(maxsize=2)
+    stop = threading.Event()
+    
+    def put(q: queue.Queue, item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def get(q: queue.Queue):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+    
+    def reader() -> None:
+        while not stop.is_set():
             ret, frame = cap.read()
-            if not ret:
+            if not ret or not put(read_q, frame):
+                break
+        put(read_q, None)
+    
+    def processor() -> None:
+        while True:
+            frame = get(read_q)
+            if frame is None:
+                break
+            _, blobs = counter.process(frame)
+            if not put(display_q, counter.draw_detections(frame, blobs, inplace=True)):
+                break
+        put(display_q, None)
+    
+    workers = [
+        threading.Thread(target=reader, daemon=True),
+        threading.Thread(target=processor, daemon=True),
+    ]
+    for t in workers:
+        t.start()
+    
+    try:
+        while True:
+            output = get(display_q)
+            if output is None:
                 break
-            
-            count, blobs = counter.process(frame)
-            output = counter.draw_detections(frame, blobs)
-            
             cv2.imshow("Fish Counter", output)
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
-        
+    finally:
+        stop.set()
+        for t in workers:
+            t.join(timeout=1)
         cap.release()
         cv2.destroyAllWindows()
+
+
+# CLI usage
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) < 2:
+        # Demo with webcam
+        print("Usage: python -m src.fish_counter [camera_device|image_path]")
+        print("\nRunning webcam demo (press 'q' to quit)...")
+        run_camera_demo(0)
     
     else:
         path = sys.argv[1]
@@ -257,24 +542,8 @@ if __name__ == "__main__":
         if path.isdigit():
             device = int(path)
             print(f"Opening camera {device}...")
-            cap = cv2.VideoCapture(device)
-            counter = FishCounter()
-            
             print("Press 'q' to quit")
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                count, blobs = counter.process(frame)
-                output = counter.draw_detections(frame, blobs)
-                
-                cv2.imshow("Fish Counter", output)
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-            
-            cap.release()
-            cv2.destroyAllWindows()
+            run_camera_demo(device)
         else:
             # Image mode
             print(f"Analyzing image: {path}")
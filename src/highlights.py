@@ -5,12 +5,16 @@ Perfect for social media content.
 """
 
 import os
+import re
 import json
 import subprocess
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional
 from dataclasses import dataclass
+from collections import Counter
+
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 
 
 @dataclass
@@ -43,40 +47,93 @@ class HighlightsGenerator:
         self.clips_dir = Path(clips_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Parsed clips keyed by path: (mtime, ClipInfo, escaped absolute path)
+        self._clip_cache: dict[Path, tuple[float, ClipInfo, str]] = {}
+    
+    # Clip filename: 20260129_143022_feeding_frenzy.mp4
+    CLIP_NAME_RE = re.compile(r"^(\d{8})_(\d{6})_(.+)\.mp4$")
+    
+    def _parse_clip(self, path: Path, match: re.Match) -> ClipInfo:
+        """Build ClipInfo from a matched clip filename."""
+        d, t, alert_type = match.group(1, 2, 3)
+        # Integer slicing is much cheaper than strptime
+        dt = datetime(
+            int(d[0:4]), int(d[4:6]), int(d[6:8]),
+            int(t[0:2]), int(t[2:4]), int(t[4:6]),
+        )
+        score = self.INTEREST_SCORES.get(alert_type, 1)
+        is_cool = alert_type in ("feeding_frenzy", "fish_playing", "interesting_moment", "new_behavior")
+        
+        return ClipInfo(
+            path=path,
+            alert_type=alert_type,
+            timestamp=dt,
+            score=score,
+            is_cool_moment=is_cool,
+        )
         
     def get_clips(self, days: int = 7) -> list[ClipInfo]:
-        """Get all clips from the last N days."""
+        """Get all clips from the last N days.
+        
+        Parsed clips are cached by mtime, so repeat calls only parse new
+        or changed files.
+        """
         clips = []
         cutoff = datetime.now() - timedelta(days=days)
+        cutoff_ts = cutoff.timestamp()
+        cache = self._clip_cache
+        seen = set()
+        
+        try:
+            it = os.scandir(self.clips_dir)
+        except FileNotFoundError:
+            return clips
         
-        for f in self.clips_dir.glob("*.mp4"):
-            try:
-                # Parse filename: 20260129_143022_feeding_frenzy.mp4
-                parts = f.stem.split("_", 2)
-                if len(parts) < 3:
+        with it:
+            for entry in it:
+                match = self.CLIP_NAME_RE.match(entry.name)
+                if match is None:
                     continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    mtime = entry.stat().st_mtime
+                    # A clip is written after it starts, so anything last
+                    # modified before the cutoff also started before it
+                    if mtime < cutoff_ts:
+                        continue
                     
-                dt = datetime.strptime(f"{parts[0]}_{parts[1]}", "%Y%m%d_%H%M%S")
-                if dt < cutoff:
-                    continue
+                    f = Path(entry.path)
+                    seen.add(f)
+                    cached = cache.get(f)
+                    if cached is not None and cached[0] == mtime:
+                        clip = cached[1]
+                    else:
+                        clip = self._parse_clip(f, match)
+                        # Escape single quotes in path for the ffmpeg concat list
+                        escaped_path = str(f.absolute()).replace("'", "'\\''")
+                        cache[f] = (mtime, clip, escaped_path)
                     
-                alert_type = parts[2]
-                score = self.INTEREST_SCORES.get(alert_type, 1)
-                is_cool = alert_type in ("feeding_frenzy", "fish_playing", "interesting_moment", "new_behavior")
-                
-                clips.append(ClipInfo(
-                    path=f,
-                    alert_type=alert_type,
-                    timestamp=dt,
-                    score=score,
-                    is_cool_moment=is_cool,
-                ))
-            except Exception as e:
-                print(f"[Highlights] Skipping {f.name}: {e}")
-                continue
+                    if clip.timestamp < cutoff:
+                        continue
+                    clips.append(clip)
+                except Exception as e:
+                    print(f"[Highlights] Skipping {entry.name}: {e}")
+                    continue
+        
+        # Forget clips that were deleted or aged out
+        for stale in cache.keys() - seen:
+            del cache[stale]
         
         return clips
     
+    def _escaped_path(self, clip: ClipInfo) -> str:
+        """Absolute, quote-escaped clip path for the ffmpeg concat list."""
+        cached = self._clip_cache.get(clip.path)
+        if cached is not None and cached[1] is clip:
+            return cached[2]
+        return str(clip.path.absolute()).replace("'", "'\\''")
+    
     def select_highlights(self, clips: list[ClipInfo],
                          max_clips: int = 10,
                          max_duration: int = 60) -> list[ClipInfo]:
@@ -117,38 +174,26 @@ class HighlightsGenerator:
             output_name = f"highlights_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
         output_path = self.output_dir / output_name
         
-        # Create concat file for ffmpeg
-        concat_file = self.output_dir / "concat_list.txt"
-        with open(concat_file, 'w') as f:
-            for clip in clips:
-                # Escape single quotes in path
-                escaped_path = str(clip.path.absolute()).replace("'", "'\\''")
-                f.write(f"file '{escaped_path}'\n")
+        # Concat list is fed to ffmpeg on stdin, so concurrent reels don't
+        # share (and clobber) a list file on disk
+        concat_list = "".join(f"file '{self._escaped_path(clip)}'\n" for clip in clips)
         
         # Build ffmpeg command
         cmd = [
             "ffmpeg", "-y",
             "-f", "concat",
             "-safe", "0",
-            "-i", str(concat_file),
+            "-protocol_whitelist", "file,pipe",
+            "-i", "pipe:0",
         ]
         
-        # Add text overlay with timestamps if enabled
+        # Add text overlay with timestamps if enabled: one subtitle cue per
+        # clip, so ffmpeg picks the active caption instead of testing every
+        # drawtext enable expression on every frame
+        subs_file = output_path.with_suffix(".ass")
         if add_text_overlay:
-            # Create filter for text overlay
-            filter_parts = []
-            for i, clip in enumerate(clips):
-                time_str = clip.timestamp.strftime("%b %d, %I:%M %p")
-                alert_str = clip.alert_type.replace("_", " ").title()
-                # drawtext for each segment
-                filter_parts.append(
-                    f"drawtext=text='{time_str} - {alert_str}':"
-                    f"fontsize=24:fontcolor=white:borderw=2:bordercolor=black:"
-                    f"x=20:y=h-50:enable='between(t,{i*40},{(i+1)*40})'"
-                )
-            
-            if filter_parts:
-                cmd.extend(["-vf", ",".join(filter_parts)])
+            self._write_overlay_subs(clips, subs_file)
+            cmd.extend(["-vf", f"subtitles=filename={self._filter_escape(subs_file)}"])
         
         cmd.extend([
             "-c:v", "libx264",
@@ -160,14 +205,21 @@ class HighlightsGenerator:
         ])
         
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = None
+            if not add_text_overlay and not add_music:
+                # Nothing to draw or mix: stream-copy the clips (no re-encode).
+                # Clips come from the same recorder, so codecs/timebases match.
+                copy_cmd = cmd[:cmd.index("-c:v")] + ["-c", "copy", str(output_path)]
+                result = subprocess.run(copy_cmd, input=concat_list, capture_output=True, text=True)
+                if result.returncode != 0:
+                    print("[Highlights] Stream copy failed, re-encoding")
+            
+            if result is None or result.returncode != 0:
+                result = subprocess.run(cmd, input=concat_list, capture_output=True, text=True)
             if result.returncode != 0:
                 print(f"[Highlights] ffmpeg error: {result.stderr}")
                 return None
             
-            # Cleanup
-            concat_file.unlink(missing_ok=True)
-            
             print(f"[Highlights] Created: {output_path}")
             print(f"[Highlights] Size: {output_path.stat().st_size / 1048576:.1f} MB")
             
@@ -179,6 +231,46 @@ class HighlightsGenerator:
         except Exception as e:
             print(f"[Highlights] Error: {e}")
             return None
+        finally:
+            subs_file.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _ass_time(seconds: int) -> str:
+        """Format seconds as an ASS timestamp (H:MM:SS.cc)."""
+        h, rem = divmod(seconds, 3600)
+        m, sec = divmod(rem, 60)
+        return f"{h}:{m:02d}:{sec:02d}.00"
+    
+    @staticmethod
+    def _filter_escape(path: Path) -> str:
+        """Escape a path as a filter option value inside an ffmpeg filtergraph."""
+        value = re.sub(r"([\\':])", r"\\\1", path.absolute().as_posix())
+        return re.sub(r"([\\'\[\],;])", r"\\\1", value)
+    
+    def _write_overlay_subs(self, clips: list[ClipInfo], path: Path) -> None:
+        """Write the per-clip timestamp captions as an ASS subtitle file."""
+        lines = [
+            "[Script Info]",
+            "ScriptType: v4.00+",
+            "PlayResX: 640",
+            "PlayResY: 480",
+            "",
+            "[V4+ Styles]",
+            "Format: Name, Fontname, Fontsize, PrimaryColour, OutlineColour, "
+            "BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV",
+            "Style: Default,Sans,24,&H00FFFFFF,&H00000000,1,2,0,1,20,20,26",
+            "",
+            "[Events]",
+            "Format: Layer, Start, End, Style, Text",
+        ]
+        for i, clip in enumerate(clips):
+            time_str = clip.timestamp.strftime("%b %d, %I:%M %p")
+            alert_str = clip.alert_type.replace("_", " ").title()
+            lines.append(
+                f"Dialogue: 0,{self._ass_time(i*40)},{self._ass_time((i+1)*40)},"
+                f"Default,{time_str} - {alert_str}"
+            )
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
     
     def generate_gif(
         self,
@@ -200,33 +292,19 @@ class HighlightsGenerator:
         else:
             output_path = Path(output_path)
         
-        # Two-pass GIF generation for better quality
-        palette_path = self.output_dir / "palette.png"
-        
+        # Palette generation and use in one pass: split the scaled stream,
+        # build the palette from one branch and apply it to the other
         try:
-            # Generate palette
             subprocess.run([
                 "ffmpeg", "-y",
                 "-ss", str(start_sec),
                 "-t", str(duration),
                 "-i", str(clip),
-                "-vf", f"fps={fps},scale={width}:-1:flags=lanczos,palettegen",
-                str(palette_path),
-            ], capture_output=True)
-            
-            # Generate GIF using palette
-            subprocess.run([
-                "ffmpeg", "-y",
-                "-ss", str(start_sec),
-                "-t", str(duration),
-                "-i", str(clip),
-                "-i", str(palette_path),
-                "-filter_complex", f"fps={fps},scale={width}:-1:flags=lanczos[x];[x][1:v]paletteuse",
+                "-filter_complex",
+                f"fps={fps},scale={width}:-1:flags=lanczos,split[a][b];[a]palettegen[p];[b][p]paletteuse",
                 str(output_path),
             ], capture_output=True)
             
-            palette_path.unlink(missing_ok=True)
-            
             if output_path.exists():
                 print(f"[Highlights] GIF created: {output_path}")
                 return output_path
@@ -242,27 +320,23 @@ class HighlightsGenerator:
         """Get stats for the weekly highlight reel."""
         clips = self.get_clips(days=days)
         
-        cool_moments = [c for c in clips if c.is_cool_moment]
-        alerts = [c for c in clips if not c.is_cool_moment]
-        
-        # Count by type
-        type_counts = {}
+        # Single pass over the clips
+        type_counts = Counter()
+        day_counts = Counter()
+        cool = 0
         for clip in clips:
-            type_counts[clip.alert_type] = type_counts.get(clip.alert_type, 0) + 1
+            type_counts[clip.alert_type] += 1
+            day_counts[clip.timestamp.weekday()] += 1
+            cool += clip.is_cool_moment
         
         # Most active day
-        day_counts = {}
-        for clip in clips:
-            day = clip.timestamp.strftime("%A")
-            day_counts[day] = day_counts.get(day, 0) + 1
-        
-        most_active_day = max(day_counts.items(), key=lambda x: x[1])[0] if day_counts else "N/A"
+        most_active_day = WEEKDAY_NAMES[day_counts.most_common(1)[0][0]] if day_counts else "N/A"
         
         return {
             "total_clips": len(clips),
-            "cool_moments": len(cool_moments),
-            "alerts": len(alerts),
-            "by_type": type_counts,
+            "cool_moments": cool,
+            "alerts": len(clips) - cool,
+            "by_type": dict(type_counts),
             "most_active_day": most_active_day,
             "period_days": days,
         }
@@ -1,23 +1,55 @@
 """
 Multi-Tank Support for Fish Watcher.
 Monitor multiple fish tanks simultaneously from one instance.
+
+OpenCV, YAML and the detection pipeline are imported where they're first
+used, so importing this module (e.g. just to read tank status) stays cheap.
 """
 
+from __future__ import annotations
+
 import os
 import time
 import signal
+import asyncio
 import threading
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, TYPE_CHECKING
 from dataclasses import dataclass, field
-import cv2
-import yaml
 
-from .buffer import RollingBuffer
-from .detector import FishWatcherDetector, DetectorConfig, Alert
-from .recorder import ClipRecorder
-from .notifier import ClawdbotNotifier
-from .reports import ReportGenerator
+if TYPE_CHECKING:
+    import cv2
+    import numpy as np
+    from .detector import Alert
+    from .notifier import ClawdbotNotifier
+
+# libjpeg-turbo encoder for snapshots: None until first use, False if the
+# optional turbojpeg package (or its shared library) is unavailable
+_turbo = None
+
+
+def _encode_jpeg(frame, quality: int = 85) -> Optional[bytes]:
+    """Encode a BGR frame as JPEG, via libjpeg-turbo when it's available."""
+    global _turbo
+    if _turbo is None:
+        try:
+            from turbojpeg import TurboJPEG
+            _turbo = TurboJPEG()
+        except Exception:  # Not installed, or binding present but library missing
+            _turbo = False
+    if _turbo:
+        from turbojpeg import TJSAMP_420
+        return _turbo.encode(frame, quality=quality, jpeg_subsample=TJSAMP_420)
+    
+    import cv2
+    ok, buffer = cv2.imencode('.jpg', frame, [
+        cv2.IMWRITE_JPEG_QUALITY, quality,
+        cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+    ])
+    return buffer.tobytes() if ok else None
 
 
 @dataclass
@@ -35,6 +67,7 @@ class TankConfig:
     # Detection settings
     motion_sensitivity: int = 50
     no_motion_threshold: int = 300
+    motion_gate: bool = True  # skip full detection on static frames
     
     # Fish profiles
     fish_count: int = 0
@@ -51,17 +84,86 @@ class TankConfig:
             self.data_dir = f"./data/{self.id}"
 
 
+class _MotionGate:
+    """Cheap "did anything move?" check run before the full detector.
+    
+    Compares a 160x120 grayscale thumbnail against a running-average
+    background and sums the difference over 20x20 blocks via one integral
+    image. A frame is active if any block's sum reaches ``threshold``.
+    """
+    
+    SIZE = (160, 120)
+    BLOCK = 20
+    
+    def __init__(self, threshold: int = 2000, alpha: float = 0.05):
+        self.threshold = threshold
+        self.alpha = alpha
+        self._bg: Optional[np.ndarray] = None
+    
+    def is_active(self, frame: np.ndarray) -> bool:
+        import cv2
+        import numpy as np
+        
+        small = cv2.cvtColor(cv2.resize(frame, self.SIZE, interpolation=cv2.INTER_AREA),
+                             cv2.COLOR_BGR2GRAY)
+        if self._bg is None:
+            self._bg = small.astype(np.float32)
+            return True
+        
+        diff = cv2.absdiff(small, cv2.convertScaleAbs(self._bg))
+        cv2.accumulateWeighted(small, self._bg, self.alpha)
+        
+        # Block sums from four strided views of the integral image
+        ii = cv2.integral(diff)
+        k = self.BLOCK
+        sums = ii[k::k, k::k] - ii[:-k:k, k::k] - ii[k::k, :-k:k] + ii[:-k:k, :-k:k]
+        return int(sums.max()) >= self.threshold
+
+
+class _FramePacer:
+    """Fixed-rate frame deadlines on the monotonic clock.
+    
+    Deadlines advance by exactly one period per frame, so sleep overshoot
+    doesn't accumulate into drift the way ``sleep(frame_time - elapsed)`` does.
+    """
+    
+    def __init__(self, fps: float):
+        self.period_ns = int(1e9 / fps)
+        self.restart()
+    
+    def restart(self) -> None:
+        """Start the schedule from now (e.g. after a reconnect)."""
+        self.deadline_ns = time.monotonic_ns()
+    
+    def delay(self) -> float:
+        """Seconds to wait until the next frame slot (0 when running late)."""
+        self.deadline_ns += self.period_ns
+        now = time.monotonic_ns()
+        if self.deadline_ns < now - self.period_ns:
+            # More than a frame behind: resync rather than burst to catch up
+            self.deadline_ns = now
+        return max(0, self.deadline_ns - now) / 1e9
+
+
 class TankWatcher:
-    """Watcher for a single tank (runs in its own thread)."""
+    """Watcher for a single tank (own thread, or a coroutine on a shared loop)."""
     
     def __init__(self, tank_config: TankConfig, notifier: ClawdbotNotifier):
+        from .buffer import RollingBuffer
+        from .detector import FishWatcherDetector, DetectorConfig
+        from .recorder import ClipRecorder
+        from .reports import ReportGenerator
+        
         self.config = tank_config
         self.notifier = notifier
         self.running = False
         self.thread: Optional[threading.Thread] = None
         
         # Initialize components
-        self.buffer = RollingBuffer(max_seconds=10, fps=tank_config.fps)
+        # Slots outlive the recorder's writer queue, so clip frames need no copy
+        self.buffer = RollingBuffer(
+            max_seconds=10, fps=tank_config.fps, min_slots=ClipRecorder.FRAME_HOLD
+        )
         
         detector_config = DetectorConfig(
             motion_sensitivity=tank_config.motion_sensitivity,
@@ -69,6 +171,11 @@ class TankWatcher:
         )
         self.detector = FishWatcherDetector(detector_config)
         
+        # Static frames only get a full detector pass once per second, which
+        # keeps time-based checks (no motion, water color) ticking
+        self._motion_gate = _MotionGate() if tank_config.motion_gate else None
+        self._last_detect = 0.0
+        
         # Ensure output dirs exist
         Path(tank_config.clips_dir).mkdir(parents=True, exist_ok=True)
         Path(tank_config.data_dir).mkdir(parents=True, exist_ok=True)
@@ -83,6 +190,13 @@ class TankWatcher:
         self.reports = ReportGenerator(data_dir=tank_config.data_dir)
         self.camera: Optional[cv2.VideoCapture] = None
         
+        # (frame id, frame) swapped in by the watch loop as one reference,
+        # and (frame id, JPEG) last encoded from it
+        self._latest: Optional[tuple] = None
+        
+        self._snapshot_lock = threading.Lock()
+        self._snapshot: Optional[tuple] = None
+        
         # Stats
         self.frame_count = 0
         self.last_frame_time = 0
@@ -91,6 +205,8 @@ class TankWatcher:
         
     def _setup_camera(self) -> cv2.VideoCapture:
         """Initialize camera connection."""
+        import cv2
+        
         if self.config.camera_type == "usb":
             cap = cv2.VideoCapture(self.config.camera_device)
         else:
@@ -120,8 +236,10 @@ class TankWatcher:
         self.running = False
         if self.thread:
             self.thread.join(timeout=5)
-        if self.camera:
-            self.camera.release()
+            if self.camera:
+                self.camera.release()
+        # Under run_async the coroutine releases the camera once it sees
+        # running=False, so a read in flight is never torn down underneath it
         self.status = "stopped"
         print(f"[{self.config.name}] Stopped")
     
@@ -130,56 +248,135 @@ class TankWatcher:
         try:
             self.camera = self._setup_camera()
             self.status = "running"
-            frame_time = 1.0 / self.config.fps
+            pacer = _FramePacer(self.config.fps)
             
             while self.running:
-                start = time.time()
-                ret, frame = self.camera.read()
+                ret, frame = self._read_frame()
                 
                 if not ret:
-                    self.status = "reconnecting"
-                    self.last_error = "Failed to read frame"
+                    self._mark_read_failure()
                     time.sleep(1)
-                    try:
-                        self.camera = self._setup_camera()
-                        self.status = "running"
-                    except Exception as e:
-                        self.last_error = str(e)
+                    self._reconnect()
+                    pacer.restart()
                     continue
                 
-                self.last_frame_time = time.time()
-                self.buffer.add(frame)
+                self._handle_frame(frame, time.time())
+                
+                # Rate limiting
+                delay = pacer.delay()
+                if delay > 0:
+                    time.sleep(delay)
+                    
+        except Exception as e:
+            self._mark_error(e)
+        finally:
+            if self.camera:
+                self.camera.release()
+    
+    async def run_async(self, executor: ThreadPoolExecutor) -> None:
+        """Watch loop as a coroutine on a shared event loop.
+        
+        Camera reads and per-frame work (detection, recording, notification)
+        run on ``executor``, so a tank that blocks, e.g. while a finished clip
+        is flushed, never holds up the loop or the other tanks. Each tank
+        awaits one job at a time, so its frames stay in order.
+        """
+        if self.running:
+            return
+        self.running = True
+        print(f"[{self.config.name}] Started watching")
+        
+        loop = asyncio.get_running_loop()
+        try:
+            self.camera = await loop.run_in_executor(executor, self._setup_camera)
+            self.status = "running"
+            pacer = _FramePacer(self.config.fps)
+            
+            while self.running:
+                ret, frame = await loop.run_in_executor(executor, self._read_frame)
                 
-                # Handle recording
-                if self.recorder.is_recording:
-                    clip_path, alert = self.recorder.add_frame(frame)
-                    if clip_path:
-                        self._send_notification(alert, clip_path)
-                        self.reports.record_clip()
-                else:
-                    # Run detection
-                    alerts = self.detector.process(frame)
-                    for alert in alerts:
-                        print(f"[{self.config.name}] Alert: {alert.type.value}")
-                        self.reports.record_alert(alert.type.value, alert.is_cool_moment)
-                        self.recorder.start_recording(self.buffer, alert)
-                        break
+                if not ret:
+                    self._mark_read_failure()
+                    await asyncio.sleep(1)
+                    await loop.run_in_executor(executor, self._reconnect)
+                    pacer.restart()
+                    continue
                 
-                self.frame_count += 1
+                await loop.run_in_executor(executor, self._handle_frame, frame, time.time())
                 
                 # Rate limiting
-                elapsed = time.time() - start
-                if elapsed < frame_time:
-                    time.sleep(frame_time - elapsed)
+                delay = pacer.delay()
+                if delay > 0:
+                    await asyncio.sleep(delay)
                     
         except Exception as e:
-            self.status = "error"
-            self.last_error = str(e)
-            print(f"[{self.config.name}] Error: {e}")
+            self._mark_error(e)
         finally:
             if self.camera:
                 self.camera.release()
     
+    def _read_frame(self):
+        """Decode the next frame straight into the rolling buffer's next slot."""
+        return self.camera.read(self.buffer.next_slot())
+    
+    def _should_detect(self, frame: np.ndarray, now: float) -> bool:
+        """Whether this frame gets a full detector pass."""
+        gate = self._motion_gate
+        if gate is not None and not gate.is_active(frame) and now - self._last_detect < 1.0:
+            return False
+        self._last_detect = now
+        return True
+    
+    def _mark_read_failure(self) -> None:
+        self.status = "reconnecting"
+        self.last_error = "Failed to read frame"
+    
+    def _reconnect(self) -> None:
+        """Reopen the camera after a failed read."""
+        try:
+            self.camera = self._setup_camera()
+            self.status = "running"
+        except Exception as e:
+            self.last_error = str(e)
+    
+    def _mark_error(self, e: Exception) -> None:
+        self.status = "error"
+        self.last_error = str(e)
+        print(f"[{self.config.name}] Error: {e}")
+    
+    def _handle_frame(self, frame, now: Optional[float] = None) -> None:
+        """Buffer, record and run detection on one captured frame.
+        
+        ``now`` is the capture time; one clock read is shared by the buffer,
+        the detectors and the status fields.
+        """
+        if now is None:
+            now = time.time()
+        self.last_frame_time = now
+        # Usually ``frame`` already is the buffer slot, so this stores it
+        # without a copy
+        buffered = self.buffer.add(frame, now)
+        frame = buffered.frame
+        self._latest = (self.frame_count, frame)
+        
+        # Handle recording
+        recorder = self.recorder
+        if recorder.is_recording:
+            clip_path, alert = recorder.add_frame(frame)
+            if clip_path:
+                self._send_notification(alert, clip_path)
+                self.reports.record_clip()
+        elif self._should_detect(frame, now):
+            # Run detection
+            alerts = self.detector.process(frame, now)
+            for alert in alerts:
+                print(f"[{self.config.name}] Alert: {alert.type.value}")
+                self.reports.record_alert(alert.type.value, alert.is_cool_moment)
+                self.recorder.start_recording(self.buffer, alert)
+                break
+        
+        self.frame_count += 1
+    
     def _send_notification(self, alert: Optional[Alert], clip_path: str) -> None:
         """Send notification with tank name included."""
         if not alert:
@@ -187,21 +384,31 @@ class TankWatcher:
         
         # Modify alert message to include tank name
         alert.message = f"[{self.config.name}] {alert.message}"
-        result = self.notifier.notify(alert, clip_path)
+        # The recorder only returns the path of a clip it wrote
+        result = self.notifier.notify(alert, clip_path, clip_exists=bool(clip_path))
         if result.success:
             print(f"[{self.config.name}] Notification sent")
     
     def get_snapshot(self) -> Optional[bytes]:
-        """Get current frame as JPEG bytes."""
-        if not self.camera or not self.running:
+        """Get current frame as JPEG bytes.
+        
+        Uses the frame the watch loop last captured rather than reading the
+        camera again; repeat calls within one frame reuse the encoded JPEG.
+        """
+        if not self.running:
             return None
         
-        ret, frame = self.camera.read()
-        if not ret:
+        latest = self._latest
+        if latest is None:
             return None
+        frame_id, frame = latest
         
-        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-        return buffer.tobytes()
+        with self._snapshot_lock:
+            if self._snapshot is not None and self._snapshot[0] == frame_id:
+                return self._snapshot[1]
+            jpeg = _encode_jpeg(frame)
+            self._snapshot = (frame_id, jpeg)
+        return jpeg
     
     def get_status(self) -> dict:
         """Get current status for this tank."""
@@ -216,25 +423,231 @@ class TankWatcher:
         }
 
 
+class _QueuedNotifier:
+    """Notifier stand-in for a tank process: hands alerts to the parent."""
+    
+    def __init__(self, events, tank_id: str):
+        self.events = events
+        self.tank_id = tank_id
+    
+    def notify(self, alert: Alert, clip_path: Optional[str] = None,
+               clip_exists: Optional[bool] = None):
+        from .notifier import NotificationResult
+        
+        alert.frame = None  # The clip carries the footage; don't pickle a frame
+        self.events.put(("alert", self.tank_id, alert, clip_path, clip_exists))
+        return NotificationResult(success=True, message="Queued for parent")
+
+
+class _PublishingTankWatcher(TankWatcher):
+    """TankWatcher run inside a tank process.
+    
+    Each captured frame is copied into shared memory for the parent's
+    snapshots, and status is reported to the parent once a second.
+    """
+    
+    def __init__(self, tank_config: TankConfig, events, shm_name: str, meta):
+        super().__init__(tank_config, _QueuedNotifier(events, tank_config.id))
+        self._events = events
+        self._shm = SharedMemory(name=shm_name)
+        self._meta = meta
+        self._last_report = 0.0
+        self._oversize_logged = False
+    
+    def _handle_frame(self, frame, now: Optional[float] = None) -> None:
+        super()._handle_frame(frame, now)
+        self._publish(self._latest[1])
+        if self.last_frame_time - self._last_report >= 1.0:
+            self._last_report = self.last_frame_time
+            self.report_status()
+    
+    def _publish(self, frame) -> None:
+        import cv2
+        import numpy as np
+        
+        if frame.nbytes > self._shm.size:
+            # The shm is sized from the configured resolution; a camera that
+            # ignores it gets a scaled-down snapshot instead of none at all
+            height, width = frame.shape[:2]
+            scale = (self._shm.size / frame.nbytes) ** 0.5
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            if not self._oversize_logged:
+                self._oversize_logged = True
+                print(f"[{self.config.name}] Camera frame {width}x{height} is larger "
+                      f"than configured; snapshots scaled to {size[0]}x{size[1]}")
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        with self._meta.get_lock():
+            dst = np.ndarray(frame.shape, frame.dtype, buffer=self._shm.buf)
+            np.copyto(dst, frame)
+            self._meta[:] = [self.frame_count, *frame.shape]
+    
+    def report_status(self) -> None:
+        self._events.put(("status", self.config.id, self.get_status()))
+
+
+def _tank_process_main(config: TankConfig, events, stop, shm_name: str, meta,
+                       cv_threads: int) -> None:
+    """Entry point of a tank process."""
+    import cv2
+    
+    # The parent owns shutdown; it sets ``stop`` on Ctrl+C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    cv2.setNumThreads(cv_threads)
+    
+    watcher = _PublishingTankWatcher(config, events, shm_name, meta)
+    
+    def wait_for_stop():
+        stop.wait()
+        watcher.running = False
+    
+    threading.Thread(target=wait_for_stop, daemon=True).start()
+    watcher.running = True
+    try:
+        watcher._run_loop()
+    finally:
+        if watcher.status == "running":
+            watcher.status = "stopped"
+        watcher.report_status()
+        watcher._shm.close()
+
+
+class TankProcess:
+    """A tank watched from its own process, for Python-level parallelism.
+    
+    Offers the TankWatcher interface the parent needs (start, stop,
+    get_snapshot, get_status). Frames reach the parent through shared
+    memory; alerts and status come back over a queue shared by all tanks.
+    """
+    
+    def __init__(self, tank_config: TankConfig, events, cv_threads: int = 1, ctx=None):
+        self.config = tank_config
+        self._events = events
+        self.cv_threads = cv_threads
+        self._ctx = ctx or multiprocessing.get_context("spawn")
+        self._stop = self._ctx.Event()
+        # Frame id and shape of the latest published frame
+        self._meta = self._ctx.Array("q", [-1, 0, 0, 0])
+        self._shm = SharedMemory(
+            create=True, size=tank_config.width * tank_config.height * 3
+        )
+        self.process = None
+        self.running = False
+        self._status = {"status": "stopped"}
+        self._snapshot: Optional[tuple] = None
+        self._snapshot_lock = threading.Lock()
+    
+    def start(self) -> None:
+        """Start watching this tank in a child process."""
+        if self.running:
+            return
+        self.running = True
+        self._stop.clear()
+        self.process = self._ctx.Process(
+            target=_tank_process_main,
+            args=(self.config, self._events, self._stop, self._shm.name, self._meta,
+                  self.cv_threads),
+            name=f"tank-{self.config.id}",
+            daemon=True,
+        )
+        self.process.start()
+        print(f"[{self.config.name}] Started watching (pid {self.process.pid})")
+    
+    def stop(self) -> None:
+        """Stop the tank process and free its shared frame."""
+        self.running = False
+        self._stop.set()
+        if self.process is not None:
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+            self.process = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        print(f"[{self.config.name}] Stopped")
+    
+    def update_status(self, status: dict) -> None:
+        """Record a status report from the tank process."""
+        self._status = status
+    
+    def get_snapshot(self) -> Optional[bytes]:
+        """Get the latest published frame as JPEG bytes."""
+        import numpy as np
+        
+        if not self.running or self._shm is None:
+            return None
+        
+        with self._snapshot_lock:
+            with self._meta.get_lock():
+                frame_id, *shape = self._meta[:]
+                if frame_id < 0:
+                    return None
+                if self._snapshot is not None and self._snapshot[0] == frame_id:
+                    return self._snapshot[1]
+                frame = np.ndarray(shape, np.uint8, buffer=self._shm.buf).copy()
+            jpeg = _encode_jpeg(frame)
+            self._snapshot = (frame_id, jpeg)
+        return jpeg
+    
+    def get_status(self) -> dict:
+        """Get the last status reported by the tank process."""
+        status = {
+            "frame_count": 0,
+            "last_frame_time": 0,
+            "last_error": "",
+            "is_recording": False,
+            **self._status,
+            "id": self.config.id,
+            "name": self.config.name,
+        }
+        if self.running and (self.process is None or not self.process.is_alive()):
+            status["status"] = "error"
+            status["last_error"] = status["last_error"] or "Tank process exited"
+        return status
+
+
 class MultiTankWatcher:
     """Manages multiple tank watchers."""
     
-    def __init__(self, config_path: str = "tanks.yaml"):
+    def __init__(self, config_path: str = "tanks.yaml", use_processes: bool = False):
         self.config_path = config_path
-        self.tanks: Dict[str, TankWatcher] = {}
+        self.use_processes = use_processes
+        self.tanks: Dict[str, TankWatcher | TankProcess] = {}
+        from .notifier import ClawdbotNotifier
+        
         self.notifier = ClawdbotNotifier()
         self.running = False
+        # Set on shutdown; the main thread blocks on it instead of polling
+        self._stop_event = threading.Event()
+        self._loop_stop: Optional[asyncio.Event] = None
+        # Alerts and status reports from tank processes (process mode only)
+        self._events = multiprocessing.get_context("spawn").Queue() if use_processes else None
+        self._cv_threads = 1
+        self._drain_thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cap_pool: Optional[ThreadPoolExecutor] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
         
     def load_config(self) -> List[TankConfig]:
-        """Load tank configurations from YAML."""
-        path = Path(self.config_path)
-        if not path.exists():
-            print(f"Config file {self.config_path} not found")
-            return []
+        """Load tank configurations from YAML.
         
-        with open(path) as f:
-            data = yaml.safe_load(f) or {}
+        The parsed YAML is cached by file mtime in ``config_cache``, so
+        repeat loads only rebuild the TankConfig objects.
+        """
+        from .config_cache import load_config
         
+        try:
+            data = load_config(self.config_path)
+        except FileNotFoundError:
+            print(f"Config file {self.config_path} not found")
+            return []
+        return self._parse_tanks(data or {})
+    
+    @staticmethod
+    def _parse_tanks(data: dict) -> List[TankConfig]:
+        """Build TankConfig objects from the raw config dict."""
         tanks = []
         for tank_data in data.get("tanks", []):
             tank = TankConfig(
@@ -248,6 +661,7 @@ class MultiTankWatcher:
                 fps=tank_data.get("camera", {}).get("fps", 15),
                 motion_sensitivity=tank_data.get("detection", {}).get("motion_sensitivity", 50),
                 no_motion_threshold=tank_data.get("detection", {}).get("no_motion_threshold", 300),
+                motion_gate=tank_data.get("detection", {}).get("motion_gate", True),
                 fish_count=tank_data.get("fish", {}).get("count", 0),
                 fish_profiles=tank_data.get("fish", {}).get("profiles", []),
                 clips_dir=tank_data.get("clips_dir", ""),
@@ -267,41 +681,127 @@ class MultiTankWatcher:
         
         print(f"[MultiTank] Starting {len(configs)} tank(s)...")
         
+        # Split OpenCV's worker pool across tanks instead of letting every
+        # tank's per-frame kernels fan out over all cores at once
+        import cv2
+        self._cv_threads = max(1, (os.cpu_count() or 1) // len(configs))
+        cv2.setNumThreads(self._cv_threads)
+        
         for config in configs:
-            watcher = TankWatcher(config, self.notifier)
-            self.tanks[config.id] = watcher
-            watcher.start()
+            self.tanks[config.id] = self._make_tank(config)
         
         self.running = True
+        self._stop_event.clear()
         
         # Setup signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
         
-        print("[MultiTank] All tanks started. Press Ctrl+C to stop.")
-        
-        # Keep main thread alive
         try:
-            while self.running:
-                time.sleep(1)
+            if self.use_processes:
+                self._run_processes()
+            else:
+                # All tanks share one event loop on this thread
+                asyncio.run(self._run_tanks())
         except KeyboardInterrupt:
             pass
         finally:
             self.stop()
     
+    async def _run_tanks(self) -> None:
+        """Run every tank's watch loop on the current event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_stop = asyncio.Event()
+        if self._stop_event.is_set():
+            self._loop_stop.set()
+        # One worker thread per tank (threads are created lazily), plus
+        # headroom for tanks added at runtime
+        self._cap_pool = ThreadPoolExecutor(
+            max_workers=len(self.tanks) + 4, thread_name_prefix="tank-capture"
+        )
+        try:
+            for tank_id, watcher in self.tanks.items():
+                self._spawn(tank_id, watcher)
+            
+            print("[MultiTank] All tanks started. Press Ctrl+C to stop.")
+            
+            await self._loop_stop.wait()
+            
+            for watcher in self.tanks.values():
+                watcher.running = False
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        finally:
+            self._cap_pool.shutdown(wait=True)
+            self._loop = None
+            self._loop_stop = None
+            self._tasks.clear()
+    
+    def _make_tank(self, config: TankConfig) -> TankWatcher | TankProcess:
+        if self.use_processes:
+            return TankProcess(config, self._events, cv_threads=self._cv_threads)
+        return TankWatcher(config, self.notifier)
+    
+    def _run_processes(self) -> None:
+        """Run every tank in its own process; alerts are sent from here."""
+        self._drain_thread = threading.Thread(
+            target=self._drain_events, name="tank-events", daemon=True
+        )
+        self._drain_thread.start()
+        for watcher in self.tanks.values():
+            watcher.start()
+        
+        print("[MultiTank] All tanks started. Press Ctrl+C to stop.")
+        self._stop_event.wait()
+    
+    def _drain_events(self) -> None:
+        """Forward alerts and status reports from tank processes."""
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            kind, tank_id, *payload = event
+            tank = self.tanks.get(tank_id)
+            if kind == "status" and tank is not None:
+                tank.update_status(payload[0])
+            elif kind == "alert":
+                alert, clip_path, clip_exists = payload
+                result = self.notifier.notify(alert, clip_path, clip_exists=clip_exists)
+                if result.success and tank is not None:
+                    print(f"[{tank.config.name}] Notification sent")
+    
+    def _spawn(self, tank_id: str, watcher: TankWatcher) -> None:
+        """Schedule a tank's watch loop (must run on the event loop thread)."""
+        self._tasks[tank_id] = asyncio.ensure_future(watcher.run_async(self._cap_pool))
+    
     def stop(self) -> None:
         """Stop all tank watchers."""
         print("[MultiTank] Stopping all tanks...")
-        self.running = False
+        self._request_stop()
         
         for watcher in self.tanks.values():
             watcher.stop()
         
+        if self._drain_thread is not None:
+            self._events.put(None)
+            self._drain_thread.join(timeout=5)
+            self._drain_thread = None
+        
         print("[MultiTank] All tanks stopped.")
     
     def _signal_handler(self, signum, frame) -> None:
         """Handle shutdown signals."""
+        self._request_stop()
+    
+    def _request_stop(self) -> None:
+        """Wake the main thread so it shuts down right away."""
         self.running = False
+        self._stop_event.set()
+        loop, loop_stop = self._loop, self._loop_stop
+        if loop is not None and loop_stop is not None:
+            try:
+                loop.call_soon_threadsafe(loop_stop.set)
+            except RuntimeError:  # Loop already closed
+                pass
     
     def get_tank(self, tank_id: str) -> Optional[TankWatcher]:
         """Get a specific tank watcher."""
@@ -311,11 +811,13 @@ class MultiTankWatcher:
         """Get status for all tanks."""
         return [watcher.get_status() for watcher in self.tanks.values()]
     
-    def add_tank(self, config: TankConfig) -> TankWatcher:
+    def add_tank(self, config: TankConfig) -> TankWatcher | TankProcess:
         """Add a new tank at runtime."""
-        watcher = TankWatcher(config, self.notifier)
+        watcher = self._make_tank(config)
         self.tanks[config.id] = watcher
-        if self.running:
+        if self.running and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._spawn, config.id, watcher)
+        elif self.running:
             watcher.start()
         return watcher
     
@@ -326,6 +828,7 @@ class MultiTankWatcher:
         
         self.tanks[tank_id].stop()
         del self.tanks[tank_id]
+        self._tasks.pop(tank_id, None)
         return True
 
 
@@ -335,9 +838,10 @@ def main() -> None:
     
     parser = argparse.ArgumentParser(description="Fish Watcher - Multi-Tank Mode")
     parser.add_argument("-c", "--config", default="tanks.yaml", help="Tanks config file")
+    parser.add_argument("--processes", action="store_true", help="Run each tank in its own process")
     args = parser.parse_args()
     
-    watcher = MultiTankWatcher(config_path=args.config)
+    watcher = MultiTankWatcher(config_path=args.config, use_processes=args.processes)
     watcher.start()
 
 
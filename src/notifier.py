@@ -4,12 +4,78 @@ Notification system for sending alerts to Clawdbot/user.
 
 import os
 import json
+import atexit
+import itertools
+import queue
 import subprocess
+import threading
+import base64
+import http.client
+import urllib.error
+import urllib.request
+from urllib.parse import unquote, urlsplit
 from pathlib import Path
 from typing import Optional, TYPE_CHECKING
 from dataclasses import dataclass
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 
-from .detector import Alert, AlertType
+from .detector import ALERT_TYPE_INDEX, Alert, AlertType
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding
+    orjson = None
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON bytes (orjson when available)."""
+    if orjson is not None:
+        # NumPy scalars (e.g. confidences) are float/int subclasses to the
+        # json module but need an explicit opt-in with orjson
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def _loads(data):
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+try:
+    import msgspec
+except ImportError:  # Optional: typed encoder for the pending-alert file
+    msgspec = None
+
+if msgspec is not None:
+    class AlertEnvelope(msgspec.Struct):
+        """Schema of fish-watcher-pending-alert.json."""
+        type: str
+        message: str
+        clip_path: Optional[str]
+        priority: str
+        timestamp: float
+        confidence: float
+        vision_analysis: Optional[dict] = None
+    
+    _ENVELOPE_ENCODER = msgspec.json.Encoder()
+
+
+def _encode_pending(alert_data: dict) -> bytes:
+    """Encode a pending alert as compact JSON (msgspec when available)."""
+    if msgspec is not None:
+        return _ENVELOPE_ENCODER.encode(AlertEnvelope(**alert_data))
+    return _dumps(alert_data)
+
+
+def _dumps_line(record: dict) -> bytes:
+    """Encode a record as one compact JSON line."""
+    return _dumps(record) + b"\n"
 
 # Lazy import to avoid circular dependency
 if TYPE_CHECKING:
@@ -24,11 +90,60 @@ class NotificationResult:
     response: Optional[str] = None
 
 
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a file via a temp file + rename so readers never see it half-written."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class _BackgroundWriter:
+    """Runs queued file writes in order on one daemon thread.
+    
+    Keeps open/write/close (and rename) syscalls off the detection thread.
+    """
+    
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def submit(self, fn, *args) -> None:
+        """Queue ``fn(*args)``; returns immediately."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, daemon=True, name="alert-writer")
+                    self._thread.start()
+                    # Don't drop queued alerts at interpreter exit
+                    atexit.register(self.flush)
+        self._queue.put((fn, args))
+    
+    def flush(self) -> None:
+        """Block until every queued write has completed."""
+        self._queue.join()
+    
+    def _run(self) -> None:
+        while True:
+            fn, args = self._queue.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"[Notifier] Background write failed: {e}")
+            finally:
+                self._queue.task_done()
+
+
+# Shared pool for Claude vision calls, which take seconds per clip
+_VISION_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vision")
+
+
 class ClawdbotNotifier:
     """Sends notifications through Clawdbot."""
     
-    # Alert type to emoji mapping
-    EMOJI_MAP = {
+    # Alert type to emoji mapping (read-only, shared by all instances)
+    EMOJI_MAP = MappingProxyType({
         # Health/Emergency
         AlertType.NO_MOTION: "⚠️",
         AlertType.MOTION_SPIKE: "🚨",
@@ -58,10 +173,10 @@ class ClawdbotNotifier:
         AlertType.FEEDING_FRENZY: "🎉",
         AlertType.FISH_PLAYING: "🎮",
         AlertType.NEW_BEHAVIOR: "🆕",
-    }
+    })
     
     # Priority levels
-    PRIORITY_MAP = {
+    PRIORITY_MAP = MappingProxyType({
         AlertType.NO_MOTION: "high",
         AlertType.MOTION_SPIKE: "medium",
         AlertType.FISH_FLOATING: "critical",
@@ -75,12 +190,37 @@ class ClawdbotNotifier:
         AlertType.LOW_ACTIVITY: "medium",
         AlertType.INTERESTING_MOMENT: "low",
         AlertType.FEEDING_FRENZY: "low",
-    }
+    })
+    
+    # Same tables as tuples indexed by ALERT_TYPE_INDEX, defaults filled in
+    _EMOJI_BY_ORDINAL = tuple(map(EMOJI_MAP.get, AlertType, itertools.repeat("🔔")))
+    _PRIORITY_BY_ORDINAL = tuple(map(PRIORITY_MAP.get, AlertType, itertools.repeat("medium")))
+    _TITLE_BY_ORDINAL = tuple(t.value.replace('_', ' ').title() for t in AlertType)
+    
+    _MESSAGE_TEMPLATE = (
+        "{emoji} **Fish Tank Alert**\n"
+        "\n"
+        "**Type:** {title}\n"
+        "**Message:** {message}\n"
+        "**Confidence:** {confidence:.0%}"
+    )
+    _MESSAGE_WITH_CLIP_TEMPLATE = _MESSAGE_TEMPLATE + "\n\n📹 Clip saved: `{clip_path}`"
+    
+    # Alert history keeps the newest HISTORY_LIMIT entries; the append-only
+    # log is compacted back down once it grows past HISTORY_LIMIT * 4 lines
+    HISTORY_LIMIT = 100
     
     def __init__(self, workspace_dir: str = None, enable_vision: bool = True):
         self.workspace_dir = Path(workspace_dir) if workspace_dir else Path.home() / "clawd"
-        self.alert_log = self.workspace_dir / "fish-watcher-alerts.json"
+        self.alert_log = self.workspace_dir / "fish-watcher-alerts.jsonl"
+        # File Clawdbot polls for the newest alert
+        self.alert_file = self.workspace_dir / "fish-watcher-pending-alert.json"
+        self._pending_data: Optional[bytes] = None
+        self._pending_lock = threading.Lock()
+        self._alert_seq = 0  # bumped per notify(); stale vision results are dropped
+        self._log_lines: Optional[int] = None  # counted on first append
         self.enable_vision = enable_vision
+        self._writer = _BackgroundWriter()
         self.vision_analyzer = None
         if enable_vision:
             try:
@@ -89,99 +229,257 @@ class ClawdbotNotifier:
             except ImportError:
                 self.enable_vision = False
         
-    def notify(self, alert: Alert, clip_path: Optional[str] = None) -> NotificationResult:
-        """Send an alert notification."""
-        emoji = self.EMOJI_MAP.get(alert.type, "🔔")
-        priority = self.PRIORITY_MAP.get(alert.type, "medium")
+    def notify(
+        self,
+        alert: Alert,
+        clip_path: Optional[str] = None,
+        clip_exists: Optional[bool] = None,
+    ) -> NotificationResult:
+        """Send an alert notification.
+        
+        Callers that just wrote the clip can pass ``clip_exists`` to skip
+        checking the filesystem for it.
+        """
+        ordinal = ALERT_TYPE_INDEX[alert.type]
+        priority = self._PRIORITY_BY_ORDINAL[ordinal]
+        if not clip_path:
+            clip_exists = False
+        elif clip_exists is None:
+            clip_exists = Path(clip_path).exists()
         
         # Build the message
-        message_parts = [
-            f"{emoji} **Fish Tank Alert**",
-            "",
-            f"**Type:** {alert.type.value.replace('_', ' ').title()}",
-            f"**Message:** {alert.message}",
-            f"**Confidence:** {alert.confidence:.0%}",
-        ]
-        
-        if clip_path and Path(clip_path).exists():
-            message_parts.append("")
-            message_parts.append(f"📹 Clip saved: `{clip_path}`")
-        
-        message = "\n".join(message_parts)
-        
-        # Run vision analysis if enabled
-        vision_analysis = None
-        if self.enable_vision and clip_path and Path(clip_path).exists():
-            print(f"[Notifier] Running Claude vision analysis on {clip_path}...")
-            try:
-                from .vision import analyze_for_clawdbot
-                vision_analysis = analyze_for_clawdbot(clip_path)
-                if vision_analysis and "error" not in vision_analysis:
-                    print(f"[Notifier] Vision analysis: {vision_analysis.get('summary', 'N/A')}")
-            except Exception as e:
-                print(f"[Notifier] Vision analysis failed: {e}")
+        template = self._MESSAGE_WITH_CLIP_TEMPLATE if clip_exists else self._MESSAGE_TEMPLATE
+        message = template.format(
+            emoji=self._EMOJI_BY_ORDINAL[ordinal],
+            title=self._TITLE_BY_ORDINAL[ordinal],
+            message=alert.message,
+            confidence=alert.confidence,
+            clip_path=clip_path,
+        )
         
         # Log the alert
         self._log_alert(alert, clip_path)
         
         # Write to a file that Clawdbot can pick up
-        alert_file = self.workspace_dir / "fish-watcher-pending-alert.json"
         alert_data = {
             "type": alert.type.value,
             "message": message,
             "clip_path": clip_path,
             "priority": priority,
-            "timestamp": alert.timestamp,
-            "confidence": alert.confidence,
-            "vision_analysis": vision_analysis,
+            "timestamp": float(alert.timestamp),
+            "confidence": float(alert.confidence),
+            "vision_analysis": None,
         }
         
-        try:
-            with open(alert_file, 'w') as f:
-                json.dump(alert_data, f, indent=2)
-            
-            print(f"[Notifier] Alert written to {alert_file}")
+        with self._pending_lock:
+            self._alert_seq += 1
+            seq = self._alert_seq
+        
+        # Vision analysis takes seconds; run it in the background and write
+        # the pending alert once, with the result, when it's ready. Writing
+        # it earlier would let Clawdbot consume the alert before the
+        # rewrite recreates it.
+        if self.enable_vision and clip_exists:
+            print(f"[Notifier] Running Claude vision analysis on {clip_path}...")
+            future = _VISION_POOL.submit(self._analyze_clip, clip_path)
+            future.add_done_callback(
+                lambda f: self._on_vision_done(alert_data, seq, f.result())
+            )
             return NotificationResult(success=True, message="Alert queued for Clawdbot")
-            
+        
+        try:
+            self._queue_pending(alert_data, seq)
         except Exception as e:
             return NotificationResult(success=False, message=f"Failed to write alert: {e}")
+        print(f"[Notifier] Alert queued to {self.alert_file}")
+        return NotificationResult(success=True, message="Alert queued for Clawdbot")
+    
+    @staticmethod
+    def _analyze_clip(clip_path: str) -> Optional[dict]:
+        """Run Claude vision on a clip (vision pool thread)."""
+        try:
+            from .vision import analyze_for_clawdbot
+            vision_analysis = analyze_for_clawdbot(clip_path)
+            if vision_analysis and "error" not in vision_analysis:
+                print(f"[Notifier] Vision analysis: {vision_analysis.get('summary', 'N/A')}")
+            return vision_analysis
+        except Exception as e:
+            print(f"[Notifier] Vision analysis failed: {e}")
+            return None
+    
+    def _on_vision_done(self, alert_data: dict, seq: int, vision_analysis: Optional[dict]) -> None:
+        """Queue the pending alert with its vision analysis (None if it failed)."""
+        try:
+            self._queue_pending({**alert_data, "vision_analysis": vision_analysis}, seq)
+        except Exception as e:
+            print(f"[Notifier] Failed to write alert: {e}")
+            return
+        print(f"[Notifier] Alert queued to {self.alert_file}")
+    
+    def _queue_pending(self, alert_data: dict, seq: int) -> None:
+        """Queue ``alert_data`` for the pending file unless a newer alert exists."""
+        data = _encode_pending(alert_data)
+        # Alerts overwrite each other in the pending file, so a burst of
+        # alerts only needs the newest one written
+        with self._pending_lock:
+            if seq != self._alert_seq:
+                return
+            queued = self._pending_data is not None
+            self._pending_data = data
+        if not queued:
+            self._writer.submit(self._write_pending)
+    
+    def flush(self) -> None:
+        """Wait for queued alert/log writes to reach disk."""
+        self._writer.flush()
+    
+    def _write_pending(self) -> None:
+        """Write the newest queued alert to the pending file (writer thread)."""
+        with self._pending_lock:
+            data, self._pending_data = self._pending_data, None
+        if data is not None:
+            _write_atomic(self.alert_file, data)
     
     def _log_alert(self, alert: Alert, clip_path: Optional[str]) -> None:
-        """Log alert to history file."""
-        history = []
-        if self.alert_log.exists():
-            try:
-                with open(self.alert_log) as f:
-                    history = json.load(f)
-            except Exception as e:
-                print(f"[Notifier] Error reading alert log: {e}")
-        
-        history.append({
+        """Queue the alert for the history file."""
+        entry = {
             "type": alert.type.value,
             "message": alert.message,
             "confidence": alert.confidence,
             "timestamp": alert.timestamp,
             "clip_path": clip_path,
-        })
+        }
+        self._writer.submit(self._append_history, entry)
+    
+    def _append_history(self, entry: dict) -> None:
+        """Append one entry to the history log (runs on the writer thread)."""
+        if self._log_lines is None:
+            self._log_lines = self._count_log_lines()
         
-        # Keep last 100 alerts
-        history = history[-100:]
+        # JSON Lines: one append, no read/parse of the existing history
+        with open(self.alert_log, 'ab') as f:
+            f.write(_dumps_line(entry))
+        self._log_lines += 1
         
-        with open(self.alert_log, 'w') as f:
-            json.dump(history, f, indent=2)
+        if self._log_lines > self.HISTORY_LIMIT * 4:
+            self._compact_history()
+    
+    def _count_log_lines(self) -> int:
+        """Line count of the existing log, migrating a legacy JSON history."""
+        if not self.alert_log.exists():
+            legacy = self.alert_log.with_suffix(".json")
+            if legacy.exists():
+                try:
+                    with open(legacy, 'rb') as f:
+                        history = _loads(f.read())[-self.HISTORY_LIMIT:]
+                    _write_atomic(self.alert_log, b"".join(_dumps_line(e) for e in history))
+                    return len(history)
+                except Exception as e:
+                    print(f"[Notifier] Error reading alert log: {e}")
+            return 0
+        with open(self.alert_log, 'rb') as f:
+            return sum(1 for _ in f)
+    
+    def _compact_history(self) -> None:
+        """Rewrite the log keeping only the newest HISTORY_LIMIT lines."""
+        with open(self.alert_log, 'rb') as f:
+            lines = f.readlines()[-self.HISTORY_LIMIT:]
+        _write_atomic(self.alert_log, b"".join(lines))
+        self._log_lines = len(lines)
 
 
 class WebhookNotifier:
-    """Sends notifications via webhook."""
+    """Sends notifications via webhook.
+    
+    Keeps one keep-alive HTTP(S) connection to the webhook host, so alerts
+    after the first skip the TCP and TLS handshakes. Webhooks reached
+    through an HTTP(S)_PROXY, and redirect responses, go through urllib.
+    """
+    
+    # Failures that mean an idle keep-alive connection was closed under us
+    # before the server produced any response, so the POST can be resent
+    _STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+    _REDIRECTS = frozenset((301, 302, 303, 307, 308))
     
     def __init__(self, webhook_url: str):
         self.webhook_url = webhook_url
+        url = urlsplit(webhook_url)
+        self._scheme = url.scheme
+        self._hostname = url.hostname
+        self._port = url.port
+        self._path = url.path or "/"
+        if url.query:
+            self._path += "?" + url.query
+        self._headers = {'Content-Type': 'application/json'}
+        if url.username is not None:
+            # http.client doesn't take user:pass@host; send it as Basic auth
+            userinfo = f"{unquote(url.username)}:{unquote(url.password or '')}"
+            self._headers['Authorization'] = "Basic " + base64.b64encode(userinfo.encode()).decode()
+        proxy = urllib.request.getproxies().get(self._scheme)
+        self._use_urllib = bool(proxy) and not urllib.request.proxy_bypass(self._hostname or "")
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._scheme == "https":
+            return http.client.HTTPSConnection(self._hostname, self._port, timeout=10)
+        return http.client.HTTPConnection(self._hostname, self._port, timeout=10)
+    
+    def _post(self, data: bytes) -> tuple[int, bytes]:
+        """POST on the persistent connection; reconnects once if it went stale."""
+        if self._use_urllib:
+            return self._post_urllib(data)
+        with self._lock:
+            reused = self._conn is not None
+            while True:
+                if self._conn is None:
+                    self._conn = self._connect()
+                try:
+                    self._conn.request("POST", self._path, body=data, headers=self._headers)
+                    response = self._conn.getresponse()
+                except self._STALE_ERRORS:
+                    self._conn.close()
+                    self._conn = None
+                    # Nothing came back, so the server never handled the
+                    # POST; a fresh connection gets one more try
+                    if not reused:
+                        raise
+                    reused = False
+                    continue
+                except BaseException:
+                    # e.g. a read timeout: the server may already have the
+                    # request, so don't send it again
+                    self._conn.close()
+                    self._conn = None
+                    raise
+                try:
+                    body = response.read()
+                except BaseException:
+                    self._conn.close()
+                    self._conn = None
+                    raise
+                break
+        if response.status in self._REDIRECTS:
+            # Follow it the way urllib always has
+            return self._post_urllib(data)
+        return response.status, body
+    
+    def _post_urllib(self, data: bytes) -> tuple[int, bytes]:
+        """POST through urllib (proxies and redirects)."""
+        req = urllib.request.Request(self.webhook_url, data=data, headers=self._headers)
+        try:
+            with urllib.request.urlopen(req, timeout=10) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
         
-    def notify(self, alert: Alert, clip_path: Optional[str] = None) -> NotificationResult:
+    def notify(
+        self,
+        alert: Alert,
+        clip_path: Optional[str] = None,
+        clip_exists: Optional[bool] = None,
+    ) -> NotificationResult:
         """Send alert via webhook."""
-        import urllib.request
-        import urllib.error
-        
         payload = {
             "type": alert.type.value,
             "message": alert.message,
@@ -191,19 +489,14 @@ class WebhookNotifier:
         }
         
         try:
-            data = json.dumps(payload).encode('utf-8')
-            req = urllib.request.Request(
-                self.webhook_url,
-                data=data,
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                return NotificationResult(
-                    success=True,
-                    message="Webhook sent",
-                    response=response.read().decode()
-                )
-                
-        except urllib.error.URLError as e:
+            status, body = self._post(_dumps(payload))
+        except (http.client.HTTPException, OSError, ValueError) as e:
             return NotificationResult(success=False, message=f"Webhook failed: {e}")
+        
+        if status >= 400:
+            return NotificationResult(success=False, message=f"Webhook failed: HTTP {status}")
+        return NotificationResult(
+            success=True,
+            message="Webhook sent",
+            response=body.decode()
+        )
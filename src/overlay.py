@@ -4,11 +4,85 @@ Draws bounding boxes, names, species, and stats on frames.
 """
 
 import time
+from collections import deque
 from dataclasses import dataclass
 from typing import Optional
 import numpy as np
 import cv2
 
+from .detector import _have_opencl
+
+try:
+    from numba import njit
+except ImportError:  # Optional: compiled contour statistics
+    njit = None
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # Optional: optimal track/detection assignment
+    linear_sum_assignment = None
+
+
+def _contour_stats(pts: np.ndarray, ends: np.ndarray, out: np.ndarray) -> None:
+    """Fill ``out`` with (x, y, w, h, area) for each contour.
+    
+    ``pts`` holds every contour's points back to back (P x 2 int32) and
+    contour i ends at ``ends[i]``. Area is the shoelace formula and the
+    box matches cv2.boundingRect (inclusive, so +1 on width and height).
+    """
+    start = 0
+    for i in range(ends.shape[0]):
+        end = ends[i]
+        x0 = x1 = pts[start, 0]
+        y0 = y1 = pts[start, 1]
+        twice_area = 0
+        for j in range(start, end):
+            k = j + 1 if j + 1 < end else start
+            x, y = pts[j, 0], pts[j, 1]
+            twice_area += np.int64(x) * pts[k, 1] - np.int64(pts[k, 0]) * y
+            x0 = min(x0, x)
+            x1 = max(x1, x)
+            y0 = min(y0, y)
+            y1 = max(y1, y)
+        out[i, 0] = x0
+        out[i, 1] = y0
+        out[i, 2] = x1 - x0 + 1
+        out[i, 3] = y1 - y0 + 1
+        out[i, 4] = abs(twice_area) / 2
+        start = end
+
+
+_contour_stats_jit = njit(cache=True)(_contour_stats) if njit else None
+
+
+def _contour_stats_np(pts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Vectorized _contour_stats, for when numba isn't installed."""
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1]
+    nxt = np.arange(1, len(pts) + 1)
+    nxt[ends - 1] = starts  # Each contour wraps back to its first point
+    
+    x = pts[:, 0].astype(np.int64)
+    y = pts[:, 1].astype(np.int64)
+    out = np.empty((len(ends), 5), dtype=np.float64)
+    out[:, 0] = np.minimum.reduceat(x, starts)
+    out[:, 1] = np.minimum.reduceat(y, starts)
+    out[:, 2] = np.maximum.reduceat(x, starts) - out[:, 0] + 1
+    out[:, 3] = np.maximum.reduceat(y, starts) - out[:, 1] + 1
+    out[:, 4] = np.abs(np.add.reduceat(x * y[nxt] - x[nxt] * y, starts)) / 2
+    return out
+
+
+# Corner accents as 8 two-point segments: each starts at a box corner
+# (in units of box width/height) and runs along one edge
+_CORNER_ORIGINS = np.array(
+    [[0, 0], [0, 0], [1, 0], [1, 0], [0, 1], [0, 1], [1, 1], [1, 1]], dtype=np.int32
+)
+_CORNER_DIRS = np.array(
+    [[1, 0], [0, 1], [-1, 0], [0, 1], [1, 0], [0, -1], [-1, 0], [0, -1]], dtype=np.int32
+)
+
 
 @dataclass
 class FishProfile:
@@ -29,12 +103,42 @@ class TrackedFish:
     status: str = "active"
     last_seen: float = 0
     velocity: float = 0
+    prev_center: Optional[tuple] = None  # Center at the previous detection
+    step: tuple = (0.0, 0.0)  # Per-frame motion used between detections
+
+
+# Track status codes stored in FishTracker.status
+_STATUS_NAMES = ("active", "resting", "hidden")
+_ACTIVE, _RESTING, _HIDDEN = range(3)
+
+# Status label colors (BGR); anything else is drawn white
+_STATUS_COLORS = {
+    "active": (0, 255, 0),
+    "resting": (0, 255, 255),
+    "hidden": (128, 128, 128),
+}
 
 
 class FishTracker:
-    """Simple fish tracking using contour detection."""
+    """Simple fish tracking using contour detection.
+    
+    Track state is kept as parallel arrays, one row (slot) per fish. Rows
+    of evicted tracks are flagged invalid and reused for new fish;
+    ``view(i)`` builds a TrackedFish for row ``i``.
+    """
+    
+    _COLUMNS = ("ids", "centers", "prev_centers", "steps", "bboxes",
+                "last_seen", "velocity", "status", "profiles_idx", "valid")
+    
+    # Frames wider than this are downscaled before detection
+    DETECT_WIDTH = 480
     
-    def __init__(self, fish_profiles: list[dict] = None):
+    def __init__(
+        self,
+        fish_profiles: list[dict] = None,
+        detect_every: int = 3,
+        use_opencl: bool = False,
+    ):
         self.profiles = []
         if fish_profiles:
             # Assign colors to each fish
@@ -54,26 +158,91 @@ class FishTracker:
                     color=colors[i % len(colors)]
                 ))
         
-        self.tracked: list[TrackedFish] = []
+        self.ids = np.empty(0, dtype=np.int32)
+        self.centers = np.empty((0, 2), dtype=np.float32)
+        self.prev_centers = np.empty((0, 2), dtype=np.float32)  # At the previous detection
+        self.steps = np.empty((0, 2), dtype=np.float32)  # Per-frame motion between detections
+        self.bboxes = np.empty((0, 4), dtype=np.int32)  # (x, y, w, h)
+        self.last_seen = np.empty(0, dtype=np.float64)
+        self.velocity = np.empty(0, dtype=np.float32)
+        self.status = np.empty(0, dtype=np.int8)
+        self.profiles_idx = np.empty(0, dtype=np.int32)  # -1 = no profile
+        self.valid = np.empty(0, dtype=bool)
+        self.free_slots: deque[int] = deque()
         self.next_id = 1
         self.prev_gray = None
         
-    def detect_fish(self, frame: np.ndarray) -> list[tuple]:
-        """Detect fish-shaped objects in frame."""
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        blurred = cv2.GaussianBlur(gray, (11, 11), 0)
-        
-        # Adaptive threshold
-        thresh = cv2.adaptiveThreshold(
-            blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY_INV, 11, 2
-        )
+        # Detection runs on one frame in every ``detect_every``; tracks are
+        # extrapolated on the frames in between
+        self.detect_every = max(1, detect_every)
+        self.frames_since_detect = 0
+        # Run the filter chain through OpenCV's T-API when a device exists
+        self.use_opencl = use_opencl and _have_opencl()
+        
+        # Filter chain state reused across detect_fish calls; the scratch
+        # images are (re)allocated whenever the input frame shape changes
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+        self._scratch_shape = None
+        self._small = self._gray = self._blur = self._thresh = self._morph = None
+        
+    def _alloc_scratch(self, shape: tuple, small_shape: tuple):
+        """Size the detect_fish scratch images for frames of ``shape``."""
+        self._scratch_shape = shape
+        self._small = np.empty(small_shape, dtype=np.uint8)
+        self._gray = np.empty(small_shape[:2], dtype=np.uint8)
+        self._blur = np.empty_like(self._gray)
+        self._thresh = np.empty_like(self._gray)
+        self._morph = np.empty_like(self._gray)
         
-        # Morphological operations to clean up
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-        thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
+    def detect_fish(self, frame: np.ndarray) -> list[tuple]:
+        """Detect fish-shaped objects in frame.
+        
+        Detection runs on a copy at most DETECT_WIDTH pixels wide; results
+        are in full-frame coordinates.
+        """
+        scale = self.DETECT_WIDTH / frame.shape[1]
+        if scale >= 1:
+            scale = 1.0
+        inv = 1 / scale
+        kernel = self._morph_kernel
+        
+        if self.use_opencl:
+            # Convert to grayscale on the OpenCL device from here until contours
+            if scale < 1:
+                frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            gray = cv2.cvtColor(cv2.UMat(frame), cv2.COLOR_BGR2GRAY)
+            blurred = cv2.GaussianBlur(gray, (11, 11), 0)
+            thresh = cv2.adaptiveThreshold(
+                blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                cv2.THRESH_BINARY_INV, 11, 2
+            )
+            thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+            thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
+            thresh = thresh.get()
+        else:
+            if frame.shape != self._scratch_shape:
+                h, w = frame.shape[:2]
+                small_h, small_w = (round(h * scale), round(w * scale)) if scale < 1 else (h, w)
+                self._alloc_scratch(frame.shape, (small_h, small_w) + frame.shape[2:])
+            if scale < 1:
+                frame = cv2.resize(
+                    frame, self._small.shape[1::-1], dst=self._small,
+                    interpolation=cv2.INTER_AREA,
+                )
+            
+            # Convert to grayscale
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+            cv2.GaussianBlur(self._gray, (11, 11), 0, dst=self._blur)
+            
+            # Adaptive threshold
+            cv2.adaptiveThreshold(
+                self._blur, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                cv2.THRESH_BINARY_INV, 11, 2, dst=self._thresh
+            )
+            
+            # Morphological operations to clean up
+            cv2.morphologyEx(self._thresh, cv2.MORPH_CLOSE, kernel, dst=self._morph)
+            thresh = cv2.morphologyEx(self._morph, cv2.MORPH_OPEN, kernel, dst=self._thresh)
         
         # Find contours
         contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -83,98 +252,228 @@ class FishTracker:
         min_area = (h * w) * 0.002  # 0.2% of frame
         max_area = (h * w) * 0.15   # 15% of frame
         
+        if not contours:
+            return []
+        
+        # Area and bounding box of every contour in one call
+        pts = np.concatenate(contours).reshape(-1, 2)
+        ends = np.cumsum([len(c) for c in contours])
+        if _contour_stats_jit is not None:
+            stats = np.empty((len(contours), 5), dtype=np.float64)
+            _contour_stats_jit(pts, ends, stats)
+        else:
+            stats = _contour_stats_np(pts, ends)
+        
+        # Fish are usually longer than tall: keep 0.3 < bw / bh < 4, compared
+        # cross-multiplied (sides are whole pixels, so this is exact)
+        area = stats[:, 4]
+        bw, bh = stats[:, 2], stats[:, 3]
+        keep = (min_area < area) & (area < max_area) & (10 * bw > 3 * bh) & (bw < 4 * bh)
+        
         detections = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if min_area < area < max_area:
-                x, y, bw, bh = cv2.boundingRect(contour)
-                # Fish are usually longer than tall
-                aspect = bw / bh if bh > 0 else 0
-                if 0.3 < aspect < 4.0:  # Reasonable fish aspect ratio
-                    cx, cy = x + bw // 2, y + bh // 2
-                    detections.append((x, y, bw, bh, cx, cy, area))
+        for x, y, bw, bh, area in stats[keep].tolist():
+            x, y, bw, bh = int(x), int(y), int(bw), int(bh)
+            cx, cy = x + bw // 2, y + bh // 2
+            if scale != 1.0:
+                x, y, bw, bh, cx, cy = (round(v * inv) for v in (x, y, bw, bh, cx, cy))
+                area *= inv * inv
+            detections.append((x, y, bw, bh, cx, cy, area))
         
         return detections
     
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.valid))
+    
+    @property
+    def tracked(self) -> list[TrackedFish]:
+        """All live tracks as TrackedFish objects."""
+        return [self.view(i) for i in np.flatnonzero(self.valid).tolist()]
+    
+    def view(self, i: int) -> TrackedFish:
+        """TrackedFish snapshot of track row ``i``."""
+        p = self.profiles_idx[i]
+        return TrackedFish(
+            id=int(self.ids[i]),
+            bbox=tuple(self.bboxes[i].tolist()),
+            center=tuple(self.centers[i].tolist()),
+            profile=self.profiles[p] if p >= 0 else None,
+            status=_STATUS_NAMES[self.status[i]],
+            last_seen=float(self.last_seen[i]),
+            velocity=float(self.velocity[i]),
+            prev_center=tuple(self.prev_centers[i].tolist()),
+            step=tuple(self.steps[i].tolist()),
+        )
+    
     def update(self, frame: np.ndarray) -> list[TrackedFish]:
         """Update tracking with new frame."""
-        detections = self.detect_fish(frame)
-        now = time.time()
+        skip = self.frames_since_detect
+        self.frames_since_detect = (skip + 1) % self.detect_every
+        if skip:
+            self._extrapolate()
+            return self.tracked
         
-        # Simple tracking: match by closest distance
-        used_detections = set()
-        
-        for tracked in self.tracked:
-            best_dist = float('inf')
-            best_det = None
-            best_idx = -1
-            
-            for i, det in enumerate(detections):
-                if i in used_detections:
-                    continue
-                x, y, bw, bh, cx, cy, area = det
-                dist = np.sqrt((cx - tracked.center[0])**2 + (cy - tracked.center[1])**2)
-                if dist < best_dist and dist < 100:  # Max 100px movement
-                    best_dist = dist
-                    best_det = det
-                    best_idx = i
-            
-            if best_det:
-                x, y, bw, bh, cx, cy, area = best_det
-                # Calculate velocity
-                if tracked.last_seen > 0:
-                    dt = now - tracked.last_seen
-                    if dt > 0:
-                        tracked.velocity = best_dist / dt
-                
-                tracked.bbox = (x, y, bw, bh)
-                tracked.center = (cx, cy)
-                tracked.last_seen = now
-                tracked.status = "active" if tracked.velocity > 5 else "resting"
-                used_detections.add(best_idx)
-            else:
-                # Not seen - mark as hidden if too long
-                if now - tracked.last_seen > 5:
-                    tracked.status = "hidden"
-        
-        # Add new detections
-        for i, det in enumerate(detections):
-            if i not in used_detections:
-                x, y, bw, bh, cx, cy, area = det
-                
-                # Assign profile if available
-                profile = None
-                if len(self.tracked) < len(self.profiles):
-                    profile = self.profiles[len(self.tracked)]
-                
-                self.tracked.append(TrackedFish(
-                    id=self.next_id,
-                    bbox=(x, y, bw, bh),
-                    center=(cx, cy),
-                    profile=profile,
-                    last_seen=now
-                ))
-                self.next_id += 1
+        det = np.array(self.detect_fish(frame), dtype=np.float64).reshape(-1, 7)
+        now = time.time()
         
-        # Remove very old tracks
-        self.tracked = [t for t in self.tracked if now - t.last_seen < 30]
+        # Match on squared distances; no square roots are taken here
+        t_idx, d_idx = self._match(det[:, 4:6])
+        
+        # Matched tracks. Speed is measured from the last detected position,
+        # since the match distance is measured from the extrapolated one.
+        new = det[d_idx, 4:6]
+        delta = new - self.prev_centers[t_idx]
+        dt = now - self.last_seen[t_idx]
+        timed = (self.last_seen[t_idx] > 0) & (dt > 0)
+        # The true distance is needed only for the speed, and only where
+        # there's a time step to divide by
+        moved = delta[timed]
+        self.velocity[t_idx[timed]] = np.hypot(moved[:, 0], moved[:, 1]) / dt[timed]
+        self.steps[t_idx] = delta / self.detect_every
+        self.prev_centers[t_idx] = new
+        self.centers[t_idx] = new
+        self.bboxes[t_idx] = det[d_idx, :4]
+        self.last_seen[t_idx] = now
+        self.status[t_idx] = np.where(self.velocity[t_idx] > 5, _ACTIVE, _RESTING)
+        
+        # Unmatched tracks hold still, and are hidden once unseen too long
+        unmatched = self.valid.copy()
+        unmatched[t_idx] = False
+        self.steps[unmatched] = 0
+        self.status[unmatched & (now - self.last_seen > 5)] = _HIDDEN
+        
+        # Add new detections, assigning profiles in order while any are left
+        fresh = np.ones(len(det), dtype=bool)
+        fresh[d_idx] = False
+        if fresh.any():
+            self._append(det[fresh], now)
+        
+        # Remove very old tracks, freeing their rows
+        dead = self.valid & (now - self.last_seen >= 30)
+        if dead.any():
+            self.valid &= ~dead
+            self.free_slots.extend(np.flatnonzero(dead).tolist())
         
         return self.tracked
+    
+    def _append(self, det: np.ndarray, now: float) -> None:
+        """Start a track for each detection row, reusing free rows first."""
+        k = len(det)
+        need = k - len(self.free_slots)
+        if need > 0:
+            self._grow(need)
+        rows = np.array([self.free_slots.popleft() for _ in range(k)], dtype=np.intp)
+        
+        profile_idx = np.arange(len(self), len(self) + k, dtype=np.int32)
+        profile_idx[profile_idx >= len(self.profiles)] = -1
+        centers = det[:, 4:6]
+        
+        self.ids[rows] = np.arange(self.next_id, self.next_id + k)
+        self.centers[rows] = centers
+        self.prev_centers[rows] = centers
+        self.steps[rows] = 0
+        self.bboxes[rows] = det[:, :4]
+        self.last_seen[rows] = now
+        self.velocity[rows] = 0
+        self.status[rows] = _ACTIVE
+        self.profiles_idx[rows] = profile_idx
+        self.valid[rows] = True
+        self.next_id += k
+    
+    def _grow(self, n: int) -> None:
+        """Add ``n`` free rows to every column."""
+        size = len(self.valid)
+        for name in self._COLUMNS:
+            col = getattr(self, name)
+            setattr(self, name, np.concatenate([col, np.zeros((n,) + col.shape[1:], col.dtype)]))
+        self.free_slots.extend(range(size, size + n))
+    
+    def _match(self, det_centers: np.ndarray, max_dist: float = 100) -> tuple[np.ndarray, np.ndarray]:
+        """Pair tracks with detections.
+        
+        Uses the optimal (minimum total squared distance) assignment when
+        scipy is installed, otherwise greedy closest-pairs-first. Returns
+        matched (track rows, detection rows); pairs further apart than
+        ``max_dist`` pixels are never matched.
+        """
+        none = np.empty(0, dtype=np.intp)
+        if not self.valid.any() or not len(det_centers):
+            return none, none
+        d2 = ((self.centers[:, None] - det_centers[None, :]) ** 2).sum(-1)
+        limit = max_dist * max_dist
+        
+        if linear_sum_assignment is not None:
+            # Out-of-range pairs get a cost no in-range assignment can beat,
+            # then are dropped from the result
+            gated = np.where(d2 < limit, d2, limit * (len(d2) + len(det_centers) + 1))
+            gated[~self.valid] = gated.max() + 1
+            rows, cols = linear_sum_assignment(gated)
+            keep = (d2[rows, cols] < limit) & self.valid[rows]
+            return rows[keep].astype(np.intp), cols[keep].astype(np.intp)
+        
+        d2[~self.valid] = np.inf
+        t_idx, d_idx = np.nonzero(d2 < limit)
+        order = np.argsort(d2[t_idx, d_idx], kind="stable")
+        tracks, dets = [], []
+        taken_t, taken_d = set(), set()
+        for t, d in zip(t_idx[order].tolist(), d_idx[order].tolist()):
+            if t not in taken_t and d not in taken_d:
+                tracks.append(t)
+                dets.append(d)
+                taken_t.add(t)
+                taken_d.add(d)
+        return np.array(tracks, dtype=np.intp), np.array(dets, dtype=np.intp)
+    
+    def _extrapolate(self) -> None:
+        """Move tracks along their last measured motion (frames without detection)."""
+        if not len(self.ids):
+            return
+        # Free rows have zero steps, so updating every row is harmless
+        self.centers += self.steps
+        half = self.bboxes[:, 2:] // 2
+        self.bboxes[:, :2] = np.rint(self.centers).astype(np.int32) - half
 
 
 class OverlayRenderer:
     """Renders AI overlay on frames."""
     
-    def __init__(self, fish_profiles: list[dict] = None, tank_info: dict = None):
-        self.tracker = FishTracker(fish_profiles)
+    def __init__(
+        self,
+        fish_profiles: list[dict] = None,
+        tank_info: dict = None,
+        use_opencl: bool = False,
+    ):
+        self.tracker = FishTracker(fish_profiles, use_opencl=use_opencl)
         self.tank_info = tank_info or {}
         self.frame_count = 0
         self.start_time = time.time()
+        # Output frame, reused across calls (reallocated on size change)
+        self._scratch: Optional[np.ndarray] = None
+        # Corner accent segments, refilled for each fish box
+        self._corner_segs = np.empty((8, 2, 2), dtype=np.int32)
+        # (text, font, scale, thickness) -> (w, h); labels come from a
+        # handful of profile names, so this stays tiny
+        self._textsize_cache: dict[tuple, tuple] = {}
+        # (name, species, status, color) -> pre-drawn fish label block
+        self._label_cache: dict[tuple, tuple] = {}
+        # Pre-drawn header bar and stats box for one frame shape
+        self._chrome: Optional[dict] = None
+        # Header pixels with count and clock drawn: ((shape, second, count), patch)
+        self._header_cache: tuple = (None, None)
+        # (whole second, text) of the runtime label last drawn
+        self._runtime_cache: tuple[int, str] = (-1, "")
         
     def render(self, frame: np.ndarray) -> np.ndarray:
-        """Render overlay on frame."""
+        """Render overlay on frame.
+        
+        ``frame`` is left untouched. The returned image is a buffer owned
+        by the renderer and is overwritten by the next call; copy it to
+        keep it.
+        """
         self.frame_count += 1
-        output = frame.copy()
+        if self._scratch is None or self._scratch.shape != frame.shape:
+            self._scratch = np.empty_like(frame)
+        output = self._scratch
+        np.copyto(output, frame)
         h, w = output.shape[:2]
         
         # Update tracking
@@ -184,11 +483,10 @@ class OverlayRenderer:
         for fish in tracked:
             self._draw_fish_box(output, fish)
         
-        # Draw header bar
-        self._draw_header(output, len(tracked))
-        
-        # Draw stats panel
-        self._draw_stats(output, tracked)
+        # Draw header bar and stats panel from one clock reading
+        now = time.time()
+        self._draw_header(output, len(tracked), now)
+        self._draw_stats(output, tracked, now)
         
         return output
     
@@ -215,100 +513,184 @@ class OverlayRenderer:
         # Draw box
         cv2.rectangle(frame, (x, y), (x + bw, y + bh), color, 2)
         
-        # Draw corner accents (futuristic look)
+        # Draw corner accents (futuristic look), all eight in one call
         corner_len = min(bw, bh) // 4
-        # Top-left
-        cv2.line(frame, (x, y), (x + corner_len, y), color, 3)
-        cv2.line(frame, (x, y), (x, y + corner_len), color, 3)
-        # Top-right
-        cv2.line(frame, (x + bw, y), (x + bw - corner_len, y), color, 3)
-        cv2.line(frame, (x + bw, y), (x + bw, y + corner_len), color, 3)
-        # Bottom-left
-        cv2.line(frame, (x, y + bh), (x + corner_len, y + bh), color, 3)
-        cv2.line(frame, (x, y + bh), (x, y + bh - corner_len), color, 3)
-        # Bottom-right
-        cv2.line(frame, (x + bw, y + bh), (x + bw - corner_len, y + bh), color, 3)
-        cv2.line(frame, (x + bw, y + bh), (x + bw, y + bh - corner_len), color, 3)
-        
-        # Label background
+        segs = self._corner_segs
+        np.multiply(_CORNER_ORIGINS, (bw, bh), out=segs[:, 0])
+        segs[:, 0] += (x, y)
+        np.multiply(_CORNER_DIRS, corner_len, out=segs[:, 1])
+        segs[:, 1] += segs[:, 0]
+        cv2.polylines(frame, segs, False, color, 3)
+        
+        # Label box above fish, pasted from a block drawn once per label
+        label_y = max(y - 50, 10)
+        box, spill = self._get_label(name, species, fish.status, color)
+        h, w = frame.shape[:2]
+        bh, bw = box.shape[:2]
+        # Extrapolated tracks may drift past the frame edges
+        x0 = min(max(x, 0), w)
+        frame[label_y:label_y + bh, x0:max(x + bw, x0)] = \
+            box[:max(h - label_y, 0), x0 - x:max(w - x, x0 - x)]
+        if spill is not None:
+            # Glyph pixels that overhang the box, clipped to the frame and
+            # blended by their coverage (putText may antialias)
+            ys, xs, values, alpha = spill
+            ys = ys + label_y
+            xs = xs + x
+            keep = (ys < h) & (xs >= 0) & (xs < w)
+            ys, xs = ys[keep], xs[keep]
+            under = frame[ys, xs].astype(np.uint16) * (255 - alpha[keep])
+            frame[ys, xs] = np.minimum((under + 127) // 255 + values[keep], 255)
+    
+    # Margin around a label block for glyphs that overhang the box
+    _LABEL_PAD = 8
+    
+    def _get_label(self, name: str, species: str, status: str, color: tuple) -> tuple:
+        """Label box and its three text lines, drawn once per distinct label.
+        
+        Returns the opaque box pixels plus, when some glyphs overhang the
+        box, the (rows, cols, colors, coverage) of those pixels relative to
+        its corner; colors are premultiplied by coverage.
+        """
+        key = (name, species, status, color)
+        cached = self._label_cache.get(key)
+        if cached is not None:
+            return cached
+        
         label = f"{name}"
         label2 = f"{species}"
-        label3 = f"[{fish.status.upper()}]"
+        label3 = f"[{status.upper()}]"
         
         font = cv2.FONT_HERSHEY_SIMPLEX
         font_scale = 0.5
         thickness = 1
         
-        (tw, th), _ = cv2.getTextSize(label, font, font_scale, thickness)
-        
-        # Label box above fish
-        label_y = max(y - 50, 10)
-        cv2.rectangle(frame, (x, label_y), (x + max(tw + 10, 120), label_y + 45), (0, 0, 0), -1)
-        cv2.rectangle(frame, (x, label_y), (x + max(tw + 10, 120), label_y + 45), color, 1)
+        tw, th = self._get_text_size(label, font, font_scale, thickness)
+        box_w = max(tw + 10, 120)
+        text_w = max(tw, self._get_text_size(label2, font, 0.4, 1)[0],
+                     self._get_text_size(label3, font, 0.35, 1)[0]) + 5
+        
+        pad = self._LABEL_PAD
+        patch = np.zeros((45 + 2 * pad, max(box_w, text_w) + 2 * pad, 3), dtype=np.uint8)
+        mask = np.zeros(patch.shape[:2], dtype=np.uint8)
+        for canvas, ink in ((patch, None), (mask, 255)):
+            cv2.rectangle(canvas, (pad, pad), (pad + box_w, pad + 45), ink or (0, 0, 0), -1)
+            cv2.rectangle(canvas, (pad, pad), (pad + box_w, pad + 45), ink or color, 1)
+            cv2.putText(canvas, label, (pad + 5, pad + 15), font, font_scale, ink or color, thickness)
+            cv2.putText(canvas, label2, (pad + 5, pad + 30), font, 0.4, ink or (200, 200, 200), 1)
+            cv2.putText(canvas, label3, (pad + 5, pad + 42), font, 0.35,
+                        ink or self._status_color(status), 1)
+        
+        box = (slice(pad, pad + 46), slice(pad, pad + box_w + 1))
+        mask[box] = 0
+        ys, xs = np.nonzero(mask)
+        spill = (
+            (ys - pad, xs - pad, patch[ys, xs], mask[ys, xs, None].astype(np.uint16))
+            if len(ys) else None
+        )
         
-        # Draw text
-        cv2.putText(frame, label, (x + 5, label_y + 15), font, font_scale, color, thickness)
-        cv2.putText(frame, label2, (x + 5, label_y + 30), font, 0.4, (200, 200, 200), 1)
-        cv2.putText(frame, label3, (x + 5, label_y + 42), font, 0.35, self._status_color(fish.status), 1)
+        # Unprofiled fish are labelled by id, so keep the cache bounded
+        if len(self._label_cache) >= 64:
+            self._label_cache.clear()
+        self._label_cache[key] = cached = (patch[box].copy(), spill)
+        return cached
+    
+    def _get_text_size(self, text: str, font: int, font_scale: float, thickness: int) -> tuple:
+        """Memoized cv2.getTextSize width and height."""
+        key = (text, font, font_scale, thickness)
+        size = self._textsize_cache.get(key)
+        if size is None:
+            size = self._textsize_cache[key] = cv2.getTextSize(text, font, font_scale, thickness)[0]
+        return size
     
     def _status_color(self, status: str) -> tuple:
         """Get color for status text."""
-        if status == "active":
-            return (0, 255, 0)
-        elif status == "resting":
-            return (0, 255, 255)
-        elif status == "hidden":
-            return (128, 128, 128)
-        return (255, 255, 255)
+        return _STATUS_COLORS.get(status, (255, 255, 255))
     
-    def _draw_header(self, frame: np.ndarray, fish_count: int):
-        """Draw header bar."""
-        h, w = frame.shape[:2]
-        
-        # Header background
-        cv2.rectangle(frame, (0, 0), (w, 35), (0, 0, 0), -1)
-        cv2.line(frame, (0, 35), (w, 35), (0, 255, 0), 1)
-        
-        # Title
-        cv2.putText(frame, "FISH WATCHER AI", (10, 25), 
+    def _get_chrome(self, shape: tuple) -> dict:
+        """Static parts of the header bar and stats box, drawn once per frame shape.
+        
+        Both panels are opaque, so their pixels are kept as patches that
+        are copied into each frame; only live values are drawn per frame.
+        """
+        chrome = self._chrome
+        if chrome is not None and chrome["shape"] == shape:
+            return chrome
+        
+        h, w = shape[:2]
+        canvas = np.zeros(shape, dtype=np.uint8)  # Black panel backgrounds
+        
+        # Header: bottom rule and title
+        cv2.line(canvas, (0, 35), (w, 35), (0, 255, 0), 1)
+        cv2.putText(canvas, "FISH WATCHER AI", (10, 25),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         
-        # Fish count
-        cv2.putText(frame, f"TRACKING: {fish_count}", (w - 150, 25),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-        
-        # Timestamp
-        timestamp = time.strftime("%H:%M:%S")
-        cv2.putText(frame, timestamp, (w - 280, 25),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+        # Stats box in bottom-left: border, plus the tank label if it fits
+        box_h, box_w = 80, 200
+        cv2.rectangle(canvas, (5, h - box_h - 5), (box_w, h - 5), (0, 0, 0), -1)  # Over the header on tiny frames
+        cv2.rectangle(canvas, (5, h - box_h - 5), (box_w, h - 5), (0, 255, 0), 1)
+        tank_type = self.tank_info.get("type", "freshwater").upper()
+        tank_size = self.tank_info.get("size", "")
+        tank_label = f"TANK: {tank_size} {tank_type}"
+        tank_fits = 10 + self._get_text_size(tank_label, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)[0] <= box_w
+        if tank_fits:
+            cv2.putText(canvas, tank_label, (10, h - box_h + 55),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+        
+        header = (slice(0, 36), slice(0, w))
+        box = (slice(max(h - box_h - 5, 0), max(h - 4, 0)), slice(5, box_w + 1))
+        self._chrome = chrome = {
+            "shape": shape,
+            "header": (header, canvas[header].copy()),
+            "box": (box, canvas[box].copy()),
+            # Drawn per frame when it overflows the box
+            "tank_label": None if tank_fits else tank_label,
+        }
+        return chrome
+    
+    def _draw_header(self, frame: np.ndarray, fish_count: int, now: Optional[float] = None):
+        """Draw header bar."""
+        h, w = frame.shape[:2]
+        region, patch = self._get_chrome(frame.shape)["header"]
+        
+        # The header is opaque and its text only changes with the fish
+        # count or the clock, so it's rendered at most once per second
+        now_s = int(time.time() if now is None else now)
+        key = (frame.shape, now_s, fish_count)
+        if self._header_cache[0] != key:
+            patch = patch.copy()  # Background and title
+            cv2.putText(patch, f"TRACKING: {fish_count}", (w - 150, 25),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            cv2.putText(patch, time.strftime("%H:%M:%S", time.localtime(now_s)), (w - 280, 25),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+            self._header_cache = (key, patch)
+        frame[region] = self._header_cache[1]
     
-    def _draw_stats(self, frame: np.ndarray, tracked: list[TrackedFish]):
+    def _draw_stats(self, frame: np.ndarray, tracked: list[TrackedFish], now: Optional[float] = None):
         """Draw stats panel."""
         h, w = frame.shape[:2]
-        
-        # Stats box in bottom-left
         box_h = 80
-        box_w = 200
-        
-        cv2.rectangle(frame, (5, h - box_h - 5), (box_w, h - 5), (0, 0, 0), -1)
-        cv2.rectangle(frame, (5, h - box_h - 5), (box_w, h - 5), (0, 255, 0), 1)
-        
-        # Runtime
-        runtime = int(time.time() - self.start_time)
-        runtime_str = f"{runtime // 3600:02d}:{(runtime % 3600) // 60:02d}:{runtime % 60:02d}"
         
-        cv2.putText(frame, f"RUNTIME: {runtime_str}", (10, h - box_h + 15),
+        # Box and tank info
+        chrome = self._get_chrome(frame.shape)
+        region, patch = chrome["box"]
+        frame[region] = patch
+        if chrome["tank_label"]:
+            cv2.putText(frame, chrome["tank_label"], (10, h - box_h + 55),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+        
+        # Runtime (formatted once per second)
+        runtime = int((time.time() if now is None else now) - self.start_time)
+        if self._runtime_cache[0] != runtime:
+            runtime_str = f"{runtime // 3600:02d}:{(runtime % 3600) // 60:02d}:{runtime % 60:02d}"
+            self._runtime_cache = (runtime, f"RUNTIME: {runtime_str}")
+        
+        cv2.putText(frame, self._runtime_cache[1], (10, h - box_h + 15),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 0), 1)
         
         cv2.putText(frame, f"FRAMES: {self.frame_count}", (10, h - box_h + 35),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
         
-        # Tank info
-        tank_type = self.tank_info.get("type", "freshwater").upper()
-        tank_size = self.tank_info.get("size", "")
-        cv2.putText(frame, f"TANK: {tank_size} {tank_type}", (10, h - box_h + 55),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
-        
         # Status counts
         active = sum(1 for t in tracked if t.status == "active")
         resting = sum(1 for t in tracked if t.status == "resting")
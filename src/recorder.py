@@ -3,6 +3,7 @@ Video clip recorder with pre-roll support.
 """
 
 import os
+import queue
 import time
 import threading
 from pathlib import Path
@@ -15,7 +16,19 @@ from .detector import Alert
 
 
 class ClipRecorder:
-    """Records video clips with pre-roll from buffer."""
+    """Records video clips with pre-roll from buffer.
+    
+    Frames are encoded by a background writer thread as they arrive, so
+    the capture loop never waits on the whole clip at once, and no clip is
+    ever held in memory: at most the pre-roll and QUEUE_FRAMES frames are
+    waiting, and each is released as soon as it's written.
+    """
+    
+    # Frames that may wait for the writer before add_frame blocks
+    QUEUE_FRAMES = 60
+    # A frame passed to add_frame may still be read until this many more
+    # frames have been added (queue + the one being written + one in capture)
+    FRAME_HOLD = QUEUE_FRAMES + 2
     
     def __init__(
         self,
@@ -34,10 +47,19 @@ class ClipRecorder:
         
         self.recording = False
         self.recording_start: Optional[float] = None
-        self.current_frames: list[np.ndarray] = []
         self.current_alert: Optional[Alert] = None
         self.lock = threading.Lock()
         
+        # Writer thread input: (path, pre-roll frames) opens a clip, an
+        # ndarray is one more frame, None closes the clip
+        self._write_q: queue.Queue = queue.Queue(maxsize=self.QUEUE_FRAMES)
+        self._clip_done = threading.Event()
+        self._clip_result = ""
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="clip-writer", daemon=True
+        )
+        self._writer_thread.start()
+        
     def start_recording(self, buffer: RollingBuffer, alert: Alert) -> None:
         """Start recording a clip, pulling pre-roll from buffer."""
         with self.lock:
@@ -48,18 +70,29 @@ class ClipRecorder:
             self.recording_start = time.time()
             self.current_alert = alert
             
-            # Get pre-roll frames from buffer
-            pre_frames = buffer.get_recent(self.pre_roll)
-            self.current_frames = [f.frame for f in pre_frames]
-            print(f"[Recorder] Started clip with {len(self.current_frames)} pre-roll frames")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            filepath = self.output_dir / f"{timestamp}_{alert.type.value}.{self.format}"
+            
+            # Get pre-roll frames from buffer (copied, since the buffer
+            # reuses its frame storage); they go to the writer as one item
+            pre_frames = [f.frame.copy() for f in buffer.get_recent(self.pre_roll)]
+            self._clip_done.clear()
+            self._write_q.put((filepath, pre_frames))
+            print(f"[Recorder] Started clip with {len(pre_frames)} pre-roll frames")
     
     def add_frame(self, frame: np.ndarray) -> tuple[Optional[str], Optional[Alert]]:
-        """Add a frame to current recording. Returns (clip_path, alert) when done."""
+        """Add a frame to current recording. Returns (clip_path, alert) when done.
+        
+        The frame is queued without a copy: the caller must not modify it
+        until FRAME_HOLD more frames have been added (a RollingBuffer with
+        ``min_slots=ClipRecorder.FRAME_HOLD`` guarantees this for its slots).
+        """
         with self.lock:
             if not self.recording:
                 return None, None
             
-            self.current_frames.append(frame.copy())
+            # Blocks only if the writer is QUEUE_FRAMES behind
+            self._write_q.put(frame)
             
             # Check if post-roll complete
             elapsed = time.time() - self.recording_start
@@ -71,40 +104,70 @@ class ClipRecorder:
             return None, None
     
     def _save_clip(self) -> str:
-        """Save the current clip to disk."""
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        alert_type = self.current_alert.type.value if self.current_alert else "unknown"
-        filename = f"{timestamp}_{alert_type}.{self.format}"
-        filepath = self.output_dir / filename
+        """Close the current clip and wait for the writer to finish it.
         
-        if not self.current_frames:
-            self.recording = False
-            return ""
+        Frames were encoded as they arrived, so this only waits for the
+        writer's small backlog. Returns "" if nothing could be written.
+        """
+        self._write_q.put(None)
+        self._clip_done.wait()
         
-        # Get frame dimensions
-        h, w = self.current_frames[0].shape[:2]
+        # Reset state
+        self.recording = False
+        self.current_alert = None
         
-        # Create video writer
+        return self._clip_result
+    
+    def _open_writer(self, filepath: Path, frame: np.ndarray) -> Optional[cv2.VideoWriter]:
+        """Create a video writer sized for ``frame``."""
+        h, w = frame.shape[:2]
         if self.format == "mp4":
             fourcc = cv2.VideoWriter_fourcc(*'mp4v')
         else:
             fourcc = cv2.VideoWriter_fourcc(*'XVID')
         
         writer = cv2.VideoWriter(str(filepath), fourcc, self.fps, (w, h))
+        if not writer.isOpened():
+            print(f"[Recorder] Could not open {filepath} for writing")
+            return None
+        return writer
+    
+    def _writer_loop(self) -> None:
+        """Encode queued frames into the current clip (writer thread)."""
+        filepath: Optional[Path] = None
+        writer: Optional[cv2.VideoWriter] = None
+        failed = False
+        count = 0
         
-        for frame in self.current_frames:
-            writer.write(frame)
-        
-        writer.release()
-        
-        print(f"[Recorder] Saved clip: {filepath} ({len(self.current_frames)} frames)")
-        
-        # Reset state
-        self.recording = False
-        self.current_frames = []
-        self.current_alert = None
-        
-        return str(filepath)
+        while True:
+            item = self._write_q.get()
+            if item is None:
+                if writer is not None:
+                    writer.release()
+                    print(f"[Recorder] Saved clip: {filepath} ({count} frames)")
+                self._clip_result = str(filepath) if writer is not None else ""
+                filepath, writer, failed, count = None, None, False, 0
+                self._clip_done.set()
+                continue
+            
+            if isinstance(item, tuple):
+                filepath, frames = item
+                frames.reverse()  # Pop from the end, oldest first
+            else:
+                frames = [item]
+            del item
+            
+            # Drop each frame as it's written so the pre-roll copies are
+            # freed progressively rather than all at the end
+            while frames:
+                frame = frames.pop()
+                if writer is None and not failed:
+                    writer = self._open_writer(filepath, frame)
+                    failed = writer is None
+                if writer is not None:
+                    writer.write(frame)
+                    count += 1
+            frame = None
     
     @property
     def is_recording(self) -> bool:
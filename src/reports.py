@@ -4,12 +4,21 @@ Daily and weekly reports for fish tank status.
 
 import json
 import time
+from array import array
 from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding
+    orjson = None
+
+# Daily stats are kept for this many days
+STATS_DAYS = 30
+
 
 @dataclass
 class DailyStats:
@@ -25,17 +34,25 @@ class DailyStats:
     health_score: int  # 0-100
 
 
+def _clock(seconds: int) -> str:
+    """Format a second of the day as HH:MM:SS."""
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
 class ReportGenerator:
     """Generates daily and weekly reports."""
     
     def __init__(self, data_dir: str = "./data"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        # Aggregate file written by older versions; still read, no longer written
         self.stats_file = self.data_dir / "stats.json"
         
         # Daily tracking
         self.today_alerts: list = []
-        self.activity_samples: list = []
+        # Activity samples as two typed columns: level, and second of the day
+        self.activity_levels = array("f")
+        self.activity_times = array("l")
         self.clips_today: int = 0
         self.cool_moments_today: int = 0
         self.current_date: str = datetime.now().strftime("%Y-%m-%d")
@@ -57,10 +74,9 @@ class ReportGenerator:
         """Record an activity sample."""
         self._check_day_rollover()
         
-        self.activity_samples.append({
-            "level": level,
-            "time": datetime.now().strftime("%H:%M:%S")
-        })
+        now = datetime.now()
+        self.activity_levels.append(level)
+        self.activity_times.append(now.hour * 3600 + now.minute * 60 + now.second)
     
     def record_clip(self) -> None:
         """Record that a clip was saved."""
@@ -78,21 +94,20 @@ class ReportGenerator:
     def _reset_daily(self) -> None:
         """Reset daily counters."""
         self.today_alerts = []
-        self.activity_samples = []
+        self.activity_levels = array("f")
+        self.activity_times = array("l")
         self.clips_today = 0
         self.cool_moments_today = 0
     
     def _save_daily_stats(self) -> None:
         """Save daily stats to file."""
-        if not self.activity_samples:
+        if not self.activity_levels:
             return
         
-        # Calculate stats
-        activity_levels = [s["level"] for s in self.activity_samples]
-        activity_times = [s["time"] for s in self.activity_samples]
-        
-        peak_idx = np.argmax(activity_levels)
-        low_idx = np.argmin(activity_levels)
+        # Calculate stats (zero-copy view of the sample column)
+        activity_levels = np.frombuffer(self.activity_levels, dtype=np.float32)
+        peak_idx = int(activity_levels.argmax())
+        low_idx = int(activity_levels.argmin())
         
         # Count alerts by type
         alerts_by_type = {}
@@ -107,34 +122,56 @@ class ReportGenerator:
             date=self.current_date,
             total_alerts=len(self.today_alerts),
             alerts_by_type=alerts_by_type,
-            avg_activity_level=float(np.mean(activity_levels)),
-            peak_activity_time=activity_times[peak_idx] if activity_times else "N/A",
-            lowest_activity_time=activity_times[low_idx] if activity_times else "N/A",
+            avg_activity_level=float(activity_levels.mean(dtype=np.float64)),
+            peak_activity_time=_clock(self.activity_times[peak_idx]),
+            lowest_activity_time=_clock(self.activity_times[low_idx]),
             clips_recorded=self.clips_today,
             cool_moments=self.cool_moments_today,
             health_score=health_score
         )
         
-        # Load existing stats
-        all_stats = self._load_stats()
-        all_stats[self.current_date] = stats.__dict__
+        # One file per day, so a rollover writes only the new day
+        with open(self._day_file(self.current_date), 'wb') as f:
+            if orjson is not None:
+                f.write(orjson.dumps(stats.__dict__, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(json.dumps(stats.__dict__, indent=2).encode('utf-8'))
         
         # Keep last 30 days
-        cutoff = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-        all_stats = {k: v for k, v in all_stats.items() if k >= cutoff}
-        
-        with open(self.stats_file, 'w') as f:
-            json.dump(all_stats, f, indent=2)
+        cutoff = self._stats_cutoff()
+        for path in self.data_dir.glob("stats-*.json"):
+            if path.stem[len("stats-"):] < cutoff:
+                path.unlink(missing_ok=True)
+    
+    def _day_file(self, date: str) -> Path:
+        """Stats file for one day (YYYY-MM-DD)."""
+        return self.data_dir / f"stats-{date}.json"
+    
+    def _stats_cutoff(self) -> str:
+        """Oldest date whose stats are kept."""
+        return (datetime.now() - timedelta(days=STATS_DAYS)).strftime("%Y-%m-%d")
     
     def _load_stats(self) -> dict:
-        """Load existing stats."""
+        """Load existing stats, keyed by date, for the last 30 days."""
+        all_stats = {}
+        paths = sorted(self.data_dir.glob("stats-*.json"))
         if self.stats_file.exists():
+            paths.insert(0, self.stats_file)
+        
+        for path in paths:
             try:
-                with open(self.stats_file) as f:
-                    return json.load(f)
+                data = path.read_bytes()
+                data = orjson.loads(data) if orjson is not None else json.loads(data)
             except Exception as e:
                 print(f"[Reports] Error loading stats: {e}")
-        return {}
+                continue
+            if path == self.stats_file:
+                all_stats.update(data)
+            else:
+                all_stats[path.stem[len("stats-"):]] = data
+        
+        cutoff = self._stats_cutoff()
+        return {k: v for k, v in all_stats.items() if k >= cutoff}
     
     def _calculate_health_score(self, alerts_by_type: dict) -> int:
         """Calculate overall health score 0-100."""
@@ -162,11 +199,10 @@ class ReportGenerator:
         """Generate a text report for today."""
         self._check_day_rollover()
         
-        if not self.activity_samples:
+        if not self.activity_levels:
             return "📊 **Daily Fish Report**\n\nNot enough data yet. Check back later!"
         
-        activity_levels = [s["level"] for s in self.activity_samples]
-        avg_activity = np.mean(activity_levels)
+        avg_activity = np.frombuffer(self.activity_levels, dtype=np.float32).mean(dtype=np.float64)
         
         # Count alerts
         alert_counts = {}
@@ -184,7 +220,7 @@ class ReportGenerator:
             "",
             "📈 **Activity:**",
             f"  • Average: {avg_activity:.1f}",
-            f"  • Samples: {len(self.activity_samples)}",
+            f"  • Samples: {len(self.activity_levels)}",
             "",
             f"🚨 **Alerts:** {len(self.today_alerts)}",
         ]
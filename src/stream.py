@@ -0,0 +1,473 @@
+"""
+Shared live-stream core: one camera capture fanned out as MJPEG.
+Used by both stream.py and the dashboard, so a process only ever opens
+the camera once however many viewers or pages are connected.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+cv2.setUseOptimized(True)
+
+# Multipart headers in front of every JPEG. Content-Length lets clients
+# read the image without scanning for the next boundary.
+_PART_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n"
+
+# Timestamp overlay. Hershey digits share one width, so the label box only
+# depends on the month and AM/PM; size it once for the widest of those.
+TIMESTAMP_FORMAT = "LIVE  %b %d, %I:%M:%S %p"
+TEXT_FONT = cv2.FONT_HERSHEY_SIMPLEX
+TEXT_SCALE = 0.6
+TEXT_THICKNESS = 2
+TEXT_PADDING = 10
+TEXT_WIDTH, TEXT_HEIGHT = (
+    max(
+        cv2.getTextSize(
+            datetime(2000, month, 1, hour).strftime("LIVE  %b 00, 00:00:00 %p"),
+            TEXT_FONT, TEXT_SCALE, TEXT_THICKNESS,
+        )[0][0]
+        for month in range(1, 13)
+        for hour in (0, 12)
+    ),
+    cv2.getTextSize("LIVE", TEXT_FONT, TEXT_SCALE, TEXT_THICKNESS)[0][1],
+)
+RECT_P1 = (5, 5)
+RECT_P2 = (5 + TEXT_WIDTH + TEXT_PADDING * 2, 5 + TEXT_HEIGHT + TEXT_PADDING * 2)
+# Text origin inside the box, which is rendered on its own and pasted in
+TEXT_ORG = (TEXT_PADDING, TEXT_PADDING + TEXT_HEIGHT)
+
+# Clock drawn by the page over the image for overlay: "client", where
+# frames go out without a label. Styled inline so any page can embed it.
+CLIENT_CLOCK = """<div id="live-clock" style="position:absolute;top:5px;left:5px;padding:6px 10px;background:#000;color:#ffff00;font:bold 14px monospace"></div>
+            <script>
+                const clock = document.getElementById("live-clock");
+                const tick = () => {
+                    const now = new Date();
+                    const date = now.toLocaleDateString("en-US", {month: "short", day: "2-digit"});
+                    const time = now.toLocaleTimeString("en-US", {hour: "2-digit", minute: "2-digit", second: "2-digit"});
+                    clock.textContent = `LIVE  ${date}, ${time}`;
+                };
+                tick();
+                setInterval(tick, 1000);
+            </script>"""
+
+# The label only changes once a second: (second, label box pixels)
+_label_cache: tuple = (None, None)
+
+
+# Encoders are set up for the live stream's fixed shape and quality:
+# standard Huffman tables (no optimizing pass) and the fast DCT where the
+# library offers one. A general-purpose path would want these toggleable.
+
+
+def _nvjpeg_encoder(quality: int):
+    """nvJPEG on an NVIDIA GPU (desktop or Jetson)."""
+    from nvjpeg import NvJpeg
+    # pynvjpeg leaves optimized Huffman at nvJPEG's default (off)
+    nj = NvJpeg()
+    return lambda frame: nj.encode(frame, quality)
+
+
+def _turbojpeg_encoder(quality: int):
+    """libjpeg-turbo through PyTurboJPEG."""
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420, TJFLAG_FASTDCT
+    turbo = TurboJPEG()
+
+    def encode(frame):
+        # Straight from BGR: libjpeg-turbo's SIMD colour conversion, no copy.
+        # Optimized Huffman is off unless TJFLAG_OPTIMIZE is passed.
+        try:
+            return turbo.encode(
+                frame, quality=quality, pixel_format=TJPF_BGR,
+                jpeg_subsample=TJSAMP_420, flags=TJFLAG_FASTDCT,
+            )
+        except OSError:
+            return None  # Raised instead of returning a status; skip the frame
+    return encode
+
+
+def _simplejpeg_encoder(quality: int):
+    """libjpeg-turbo through simplejpeg (ships with picamera2 on the Pi)."""
+    import simplejpeg
+
+    def encode(frame):
+        try:
+            return simplejpeg.encode_jpeg(
+                frame, quality=quality, colorspace="BGR", colorsubsampling="420", fastdct=True
+            )
+        except (ValueError, RuntimeError):
+            return None
+    return encode
+
+
+def _opencv_encoder(quality: int):
+    """cv2.imencode, always available."""
+    # Skip the extra Huffman-table pass; live frames are thrown away in seconds
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+
+    def encode(frame):
+        # The encoded ndarray is used as a buffer as-is; no tobytes() copy
+        ok, buffer = cv2.imencode(".jpg", frame, params)
+        return buffer if ok else None
+    return encode
+
+
+# stream.encoder values, in the order "auto" tries them
+JPEG_ENCODERS = {
+    "nvjpeg": _nvjpeg_encoder,
+    "turbojpeg": _turbojpeg_encoder,
+    "simplejpeg": _simplejpeg_encoder,
+    "opencv": _opencv_encoder,
+}
+
+
+def _make_jpeg_encoder(quality: int, backend: str = "auto"):
+    """BGR -> JPEG encoder (returns a bytes-like object, or None on failure).
+
+    ``backend`` names one of JPEG_ENCODERS; "auto" takes the first that
+    loads. The optional packages are skipped when missing or when their
+    library won't load.
+    """
+    if backend != "auto":
+        factory = JPEG_ENCODERS.get(backend)
+        try:
+            if factory is not None:
+                return factory(quality)
+        except Exception:
+            pass
+        print(f"[Stream] JPEG encoder {backend!r} unavailable, picking automatically")
+
+    for factory in JPEG_ENCODERS.values():
+        try:
+            return factory(quality)
+        except Exception:
+            continue
+    return _opencv_encoder(quality)
+
+
+def _render_label(second: int, like) -> "np.ndarray":
+    """Rasterize the label box for a wall-clock second, matching ``like``.
+
+    Runs once a second (~16 us), so plain putText is cheaper to keep than
+    a glyph atlas would be to maintain.
+    """
+    text = datetime.fromtimestamp(second).strftime(TIMESTAMP_FORMAT)
+    label = np.zeros(
+        (RECT_P2[1] - RECT_P1[1] + 1, RECT_P2[0] - RECT_P1[0] + 1) + like.shape[2:],
+        dtype=like.dtype,
+    )
+    cv2.putText(label, text, TEXT_ORG, TEXT_FONT, TEXT_SCALE, (0, 255, 255), TEXT_THICKNESS)
+    return label
+
+
+def add_timestamp(frame):
+    """Add timestamp overlay to frame.
+
+    Stays on the CPU, unlike the detector's use_opencl path: the per-frame
+    work is one small copy, and JPEG encoding has no OpenCL kernel, so a
+    UMat would only add an upload and a download.
+    """
+    global _label_cache
+    second = int(time.time())
+    cached_second, label = _label_cache
+    if (
+        cached_second != second
+        or label.dtype != frame.dtype
+        or label.shape[2:] != frame.shape[2:]
+    ):
+        label = _render_label(second, frame)
+        _label_cache = (second, label)
+
+    # Opaque box, so a plain copy into the frame view (clipped at the edges)
+    roi = frame[RECT_P1[1]:RECT_P2[1] + 1, RECT_P1[0]:RECT_P2[0] + 1]
+    roi[:] = label[:roi.shape[0], :roi.shape[1]]
+    return frame
+
+
+class CameraBroadcaster:
+    """Reads the camera once and fans encoded frames out to every viewer.
+
+    Capture and encoding run on two threads joined by a one-frame handoff;
+    each viewer is an asyncio queue on the server's event loop. An encode
+    error switches to the OpenCV encoder; if that fails too, capture stops
+    and the open streams end, and the next viewer starts it again.
+
+    The device is opened when the first viewer subscribes and released
+    after the last one leaves, so it is free for the watcher otherwise.
+    With ``passthrough`` the camera's JPEG frames are forwarded without
+    decoding, stamping or re-encoding. With ``reuse_static``, a frame that
+    looks the same as the last one (coarse thumbnail hash) within the same
+    second resends the last JPEG instead of encoding again.
+    """
+
+    # Thumbnail size and dropped low bits for the reuse_static hash: coarse
+    # enough that sensor noise on a still tank doesn't change it
+    STATIC_THUMB = (64, 48)
+    STATIC_SHIFT = 3
+
+    def __init__(self, device: int, width: int, height: int, fps: int,
+                 quality: int = 85, passthrough: bool = False,
+                 reuse_static: bool = False, encoder: str = "auto"):
+        self.device = device
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.quality = quality
+        self.passthrough = passthrough
+        self.reuse_static = reuse_static
+        self.encoder = encoder
+        # Kept if passthrough has to fall back to decoding
+        self._stamp_pixels = not passthrough
+        # (thumbnail hash, second) of the last encoded frame, and its JPEG
+        self._last_key: Optional[tuple] = None
+        self._last_jpeg = None
+        # Viewer queue -> the event loop serving that viewer
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        # Picked on first capture, so importing the app doesn't touch the GPU
+        self._encode = None
+        # Set once an encode error has switched to the OpenCV encoder
+        self._encode_fallback = False
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a viewer; its queue holds the newest MJPEG part.
+
+        Must be called from the event loop that will read the queue.
+        """
+        q: asyncio.Queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            self._subscribers[q] = asyncio.get_running_loop()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="stream-capture", daemon=True
+                )
+                self._thread.start()
+        return q
+
+    def unsubscribe(self, q: asyncio.Queue) -> None:
+        """Remove a viewer's queue."""
+        with self._lock:
+            self._subscribers.pop(q, None)
+
+    @staticmethod
+    def _offer(q: asyncio.Queue, part: bytes) -> None:
+        """Queue the newest part, dropping an unread older one (loop thread)."""
+        if q.full():
+            q.get_nowait()
+        q.put_nowait(part)
+
+    def _open(self) -> cv2.VideoCapture:
+        camera = cv2.VideoCapture(self.device)
+        # Ask UVC cameras for MJPEG before sizing: far less USB traffic than
+        # raw YUYV, and the frames get JPEG-encoded for viewers anyway
+        camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        if self.passthrough:
+            # read() then returns the compressed frame instead of BGR pixels
+            camera.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        camera.set(cv2.CAP_PROP_FPS, self.fps)
+        # Keep at most one frame queued in the driver, so viewers see live frames
+        camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return camera
+
+    def _static_key(self, frame: np.ndarray) -> tuple:
+        """Key that stays equal while the scene (and the label's second) does."""
+        small = cv2.resize(frame, self.STATIC_THUMB, interpolation=cv2.INTER_AREA)
+        np.right_shift(small, self.STATIC_SHIFT, out=small)
+        return hash(small.tobytes()), int(time.time())
+
+    def _run(self) -> None:
+        """Capture thread: grab frames and hand the newest to the encoder."""
+        # One-frame handoff to this run's encoder thread: [frame, running].
+        # A frame the encoder hasn't taken yet is replaced (latest wins), so
+        # decoding the next frame overlaps encoding the last one. Either
+        # thread clears ``running`` to stop the other.
+        handoff: list = [None, True]
+        ready = threading.Condition()
+        camera = None
+        try:
+            if self._encode is None:
+                self._encode = _make_jpeg_encoder(self.quality, self.encoder)
+            camera = self._open()
+            threading.Thread(
+                target=self._encode_loop, args=(handoff, ready), name="stream-encode", daemon=True
+            ).start()
+
+            # Frame deadlines on the monotonic clock. grab() blocks until the
+            # camera's next frame; frames that arrive before the deadline (a
+            # camera faster than self.fps) are dropped undecoded.
+            period_ns = int(1e9 / self.fps)
+            deadline = time.monotonic_ns()
+            while handoff[1]:
+                with self._lock:
+                    if not self._subscribers:
+                        self._thread = None
+                        return
+
+                success = camera.grab()
+                if success:
+                    now = time.monotonic_ns()
+                    if now < deadline:
+                        continue
+                    deadline += period_ns
+                    if deadline < now - period_ns:
+                        # More than a frame behind: resync rather than burst
+                        deadline = now + period_ns
+                    success, frame = camera.retrieve()
+                if not success:
+                    camera.release()
+                    time.sleep(1)
+                    camera = self._open()
+                    deadline = time.monotonic_ns()
+                    continue
+
+                if frame.ndim == 3:
+                    # Decoded pixels (no passthrough, or the backend ignored it)
+                    with ready:
+                        handoff[0] = frame
+                        ready.notify()
+                    continue
+
+                jpeg = frame.reshape(-1)  # Camera's JPEG bytes
+                if jpeg[:2].tobytes() != b"\xff\xd8":
+                    # Not MJPEG (the camera fell back to e.g. YUYV), so
+                    # there is nothing to pass through: decode from now on
+                    print("[Stream] Camera isn't sending JPEG, disabling passthrough")
+                    self.passthrough = False
+                    camera.release()
+                    camera = self._open()
+                    continue
+                self._publish(jpeg)
+        except Exception as e:
+            print(f"[Stream] Capture failed: {e}")
+        finally:
+            if camera is not None:
+                camera.release()
+            with ready:
+                handoff[1] = False
+                ready.notify()
+            self._stopped()
+
+    def _stopped(self) -> None:
+        """Clean up after the capture thread exits (capture thread).
+
+        On the normal path the last viewer has already left and ``_thread``
+        was cleared. Otherwise capture died with viewers attached: end their
+        streams, and let the next viewer start a fresh capture.
+        """
+        with self._lock:
+            if self._thread is not threading.current_thread():
+                return
+            self._thread = None
+            subscribers, self._subscribers = self._subscribers, {}
+        for q, loop in subscribers.items():
+            try:
+                loop.call_soon_threadsafe(self._offer, q, None)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    def _encode_loop(self, handoff: list, ready: threading.Condition) -> None:
+        """Encoder thread: stamp, encode and publish handed-off frames."""
+        while True:
+            with ready:
+                while handoff[0] is None and handoff[1]:
+                    ready.wait()
+                frame, handoff[0] = handoff[0], None
+            if frame is None:
+                return  # Capture stopped
+
+            try:
+                self._encode_frame(frame)
+            except Exception as e:
+                if self._encode_fallback:
+                    print(f"[Stream] Encoding failed, stopping capture: {e}")
+                    with ready:
+                        handoff[1] = False
+                    return
+                print(f"[Stream] Encoding failed ({e}), falling back to OpenCV")
+                self._encode = _opencv_encoder(self.quality)
+                self._encode_fallback = True
+
+    def _encode_frame(self, frame: np.ndarray) -> None:
+        """Stamp, encode and publish one frame (encoder thread)."""
+        key = self._static_key(frame) if self.reuse_static else None
+        if key is not None and key == self._last_key:
+            jpeg = self._last_jpeg  # Nothing visible changed
+        else:
+            if self._stamp_pixels:
+                frame = add_timestamp(frame)
+            jpeg = self._encode(frame)
+            if jpeg is None:
+                return
+            self._last_key, self._last_jpeg = key, jpeg
+        self._publish(jpeg)
+
+    def _publish(self, jpeg) -> None:
+        """Send one JPEG (any bytes-like) to every subscriber as an MJPEG part.
+
+        The part is assembled with a single join, the only copy of the JPEG.
+        """
+        part = b"".join((_PART_HEADER % len(jpeg), jpeg, b"\r\n"))
+
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for q, loop in subscribers:
+            # Hand off to the viewer's loop; a slow viewer skips
+            # straight to the newest frame
+            try:
+                loop.call_soon_threadsafe(self._offer, q, part)
+            except RuntimeError:
+                self.unsubscribe(q)  # Loop already closed
+
+
+async def generate_frames(broadcaster: CameraBroadcaster):
+    """Generate MJPEG frames from a shared camera broadcaster.
+
+    Viewers wait on the event loop rather than each holding a worker
+    thread; only capture and encoding run on the broadcaster's threads.
+    """
+    q = broadcaster.subscribe()
+    try:
+        while True:
+            # Paced by the camera: waits until the next frame is encoded
+            part = await q.get()
+            if part is None:
+                return  # Capture stopped on an error
+            yield part
+    finally:
+        broadcaster.unsubscribe(q)
+
+
+_broadcaster: Optional[CameraBroadcaster] = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_broadcaster(config: dict) -> CameraBroadcaster:
+    """The process-wide broadcaster, built from the first config passed."""
+    global _broadcaster
+    with _broadcaster_lock:
+        if _broadcaster is None:
+            camera = config.get("camera", {})
+            stream = config.get("stream", {})
+            _broadcaster = CameraBroadcaster(
+                device=camera.get("device", 0),
+                width=camera.get("width", 640),
+                height=camera.get("height", 480),
+                fps=stream.get("fps", 60),
+                quality=stream.get("quality", 85),
+                # Without the pixel overlay, the camera's own MJPEG frames
+                # are sent as-is ("client": the page draws CLIENT_CLOCK)
+                passthrough=stream.get("overlay", True) is not True,
+                reuse_static=stream.get("reuse_static", False),
+                encoder=stream.get("encoder", "auto"),
+            )
+        return _broadcaster
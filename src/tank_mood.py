@@ -5,11 +5,32 @@ Analyzes recent activity and gives your tank a "vibe".
 """
 
 import json
+import os
+import time
+from bisect import bisect_right
 from pathlib import Path
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from typing import Optional
 from collections import defaultdict
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Optional: compiled clip histograms
+    njit = None
+
+# Clip times are local wall-clock times, counted as seconds from day 1 of
+# the proleptic Gregorian calendar (datetime.toordinal) so that weekday
+# and hour fall out of integer division
+_DAY_SECONDS = 86400
+DAY_ABBRS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def _clock_seconds(dt: datetime) -> int:
+    """Whole seconds of a naive datetime on the clip time scale."""
+    return dt.toordinal() * _DAY_SECONDS + dt.hour * 3600 + dt.minute * 60 + dt.second
 
 
 @dataclass
@@ -23,6 +44,67 @@ class TankMood:
     health_vibe: str    # "thriving", "good", "meh", "concerning"
     
 
+def _parse_clip_stem(stem: str) -> Optional[tuple[int, Optional[str]]]:
+    """Split a clip stem like ``20260129_143022_feeding_frenzy`` into (time, type).
+    
+    The timestamp sits at fixed positions, so it is sliced out rather
+    than run through strptime; it is returned as clip-scale seconds (see
+    _clock_seconds). The type is None when the stem has none; returns None
+    if the stem is not a clip name.
+    """
+    if len(stem) < 15 or stem[8] != "_" or not (stem[:8].isdigit() and stem[9:15].isdigit()):
+        return None
+    if len(stem) > 15 and stem[15] != "_":
+        return None
+    try:
+        dt = datetime(int(stem[0:4]), int(stem[4:6]), int(stem[6:8]),
+                      int(stem[9:11]), int(stem[11:13]), int(stem[13:15]))
+    except ValueError:  # e.g. month 13
+        return None
+    return _clock_seconds(dt), stem[16:] or None
+
+
+def _clip_histogram(times: np.ndarray, cutoff: int, out: np.ndarray) -> None:
+    """Add clips later than ``cutoff`` to ``out[weekday, hour]`` (Monday = 0)."""
+    for t in times:
+        if t > cutoff:
+            out[(t // 86400 + 6) % 7, t // 3600 % 24] += 1
+
+
+_clip_histogram_jit = njit(cache=True)(_clip_histogram) if njit else None
+
+
+def _clip_histogram_np(times: np.ndarray, cutoff: int) -> np.ndarray:
+    """Vectorized _clip_histogram, for when numba isn't installed."""
+    t = times[times > cutoff]
+    cells = (t // _DAY_SECONDS + 6) % 7 * 24 + t // 3600 % 24
+    return np.bincount(cells, minlength=7 * 24).reshape(7, 24)
+
+
+def _weekday_hour_counts(times: np.ndarray, cutoff: int) -> np.ndarray:
+    """7x24 counts of clips later than ``cutoff``, by weekday and hour."""
+    if _clip_histogram_jit is not None:
+        counts = np.zeros((7, 24), dtype=np.int64)
+        _clip_histogram_jit(times, cutoff, counts)
+        return counts
+    return _clip_histogram_np(times, cutoff)
+
+
+def _build_mood_index(moods: dict, axes: tuple) -> dict:
+    """Expand ``"any"`` wildcards in mood keys into every concrete key.
+    
+    Keys earlier in ``moods`` win, matching a first-match scan of it.
+    """
+    index = {}
+    for key, mood in moods.items():
+        choices = [values if part == "any" else (part,) for part, values in zip(key, axes)]
+        for act in choices[0]:
+            for health in choices[1]:
+                for time_of_day in choices[2]:
+                    index.setdefault((act, health, time_of_day), mood)
+    return index
+
+
 class TankMoodAnalyzer:
     """Analyze tank activity and determine the 'mood'."""
     
@@ -43,57 +125,137 @@ class TankMoodAnalyzer:
         ("hiding", "any", "any"): ("🙈", "shy", "Everyone's hiding today"),
         ("clustering", "any", "any"): ("🫂", "social", "Group hangout in progress"),
     }
+    DEFAULT_MOOD = MOODS[("chill", "good", "any")]
+    
+    # Every value analyze_mood can produce on each axis of a mood key
+    ACTIVITY_LEVELS = ("sleepy", "chill", "active", "hyperactive", "feeding", "hiding", "clustering")
+    HEALTH_STATUSES = ("good", "meh", "concerning")
+    TIMES_OF_DAY = ("day", "night")
+    
+    # (activity_level, health_status, time_of_day) -> mood, wildcards expanded
+    MOOD_INDEX = _build_mood_index(MOODS, (ACTIVITY_LEVELS, HEALTH_STATUSES, TIMES_OF_DAY))
+    
+    # Alert types that make the tank's health "concerning" / "meh"
+    CONCERNING_ALERTS = ("no_motion", "fish_floating", "gasping_surface", "fish_stuck_bottom")
+    WARNING_ALERTS = ("water_cloudy", "filter_stopped", "erratic_swimming")
     
     def __init__(self, data_dir: str = "./data", clips_dir: str = "./clips"):
         self.data_dir = Path(data_dir)
         self.clips_dir = Path(clips_dir)
+        # (wall-clock second, cutoff timestamp, clips) from the last clips_dir scan
+        self._scan_cache: Optional[tuple[int, float, tuple[np.ndarray, np.ndarray]]] = None
+        # ((mtime_ns, size), timestamps, alerts) of the alert log, in time order
+        self._alerts_cache: Optional[tuple[tuple[int, int], list[float], list[dict]]] = None
         
-    def get_recent_alerts(self, hours: int = 24) -> list[dict]:
-        """Get alerts from the last N hours."""
-        alerts = []
-        cutoff = datetime.now() - timedelta(hours=hours)
+    def _scan_clips(self, cutoff: datetime) -> tuple[np.ndarray, np.ndarray]:
+        """Times and alert types of clips modified after ``cutoff``, from one directory pass.
+        
+        Clip names look like ``20260129_143022_feeding_frenzy.mp4``. Times
+        come back as an int64 array of clip-scale seconds (see
+        _clock_seconds) alongside an object array of alert types, which
+        are None when a name has no type part. A clip is written
+        after the moment in its name, so older files are skipped on their
+        mtime without parsing; callers still compare the parsed time. The
+        result is reused within the same wall-clock second by calls whose
+        cutoff it covers.
+        """
+        now_s = int(time.time())
+        cutoff_ts = cutoff.timestamp()
+        cache = self._scan_cache
+        if cache is not None and cache[0] == now_s and cache[1] <= cutoff_ts:
+            return cache[2]
         
-        # Check alert log
-        alert_log = self.data_dir.parent / "fish-watcher-alerts.json"
-        if alert_log.exists():
-            try:
-                with open(alert_log) as f:
-                    all_alerts = json.load(f)
-                    for alert in all_alerts:
-                        ts = datetime.fromtimestamp(alert.get("timestamp", 0))
-                        if ts > cutoff:
-                            alerts.append(alert)
-            except Exception as e:
-                print(f"[TankMood] Error reading alert log: {e}")
+        times = []
+        types = []
+        try:
+            with os.scandir(self.clips_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if not name.endswith(".mp4"):
+                        continue
+                    try:
+                        if entry.stat(follow_symlinks=False).st_mtime < cutoff_ts:
+                            continue
+                    except OSError:  # Deleted since the listing
+                        continue
+                    parsed = _parse_clip_stem(name[:-4])
+                    if parsed is None:
+                        print(f"[TankMood] Error parsing clip {name}")
+                        continue
+                    times.append(parsed[0])
+                    types.append(parsed[1])
+        except FileNotFoundError:
+            pass
+        
+        type_array = np.empty(len(types), dtype=object)
+        type_array[:] = types
+        clips = (np.array(times, dtype=np.int64), type_array)
+        self._scan_cache = (now_s, cutoff_ts, clips)
+        return clips
+    
+    @staticmethod
+    def _count_types(times: np.ndarray, types: np.ndarray, cutoff: datetime) -> dict:
+        """Clips later than ``cutoff`` per alert type, skipping untyped clips."""
+        recent = types[(times > _clock_seconds(cutoff)) & np.not_equal(types, None)]
+        if not len(recent):
+            return {}
+        labels, counts = np.unique(recent, return_counts=True)
+        return dict(zip(labels.tolist(), counts.tolist()))
         
-        return alerts
+    def get_recent_alerts(self, hours: int = 24, now: Optional[datetime] = None) -> list[dict]:
+        """Get alerts from the last N hours (before ``now``, default the current time)."""
+        cutoff = (datetime.now() if now is None else now) - timedelta(hours=hours)
+        timestamps, alerts = self._load_alerts()
+        return alerts[bisect_right(timestamps, cutoff.timestamp()):]
     
-    def get_clip_stats(self, hours: int = 24) -> dict:
-        """Analyze recent clips."""
-        stats = defaultdict(int)
-        cutoff = datetime.now() - timedelta(hours=hours)
+    def _load_alerts(self) -> tuple[list[float], list[dict]]:
+        """Alert log entries sorted by time, with their timestamps.
         
-        for f in self.clips_dir.glob("*.mp4"):
-            try:
-                parts = f.stem.split("_", 2)
-                if len(parts) < 3:
-                    continue
-                dt = datetime.strptime(f"{parts[0]}_{parts[1]}", "%Y%m%d_%H%M%S")
-                if dt > cutoff:
-                    alert_type = parts[2]
-                    stats[alert_type] += 1
-                    stats["total"] += 1
-            except Exception as e:
-                print(f"[TankMood] Error parsing clip {f.name}: {e}")
-                continue
+        The log is only re-read when its mtime or size changes.
+        """
+        # Check alert log (JSON Lines, one alert per line)
+        alert_log = self.data_dir.parent / "fish-watcher-alerts.jsonl"
+        try:
+            st = alert_log.stat()
+        except OSError:
+            return [], []
+        key = (st.st_mtime_ns, st.st_size)
+        if self._alerts_cache is not None and self._alerts_cache[0] == key:
+            return self._alerts_cache[1], self._alerts_cache[2]
         
-        return dict(stats)
+        alerts = []
+        try:
+            with open(alert_log) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    alerts.append(json.loads(line))
+        except Exception as e:
+            print(f"[TankMood] Error reading alert log: {e}")
+            return [], []
+        
+        # Appended in order already, so this sort is a linear pass
+        alerts.sort(key=lambda a: a.get("timestamp", 0))
+        timestamps = [a.get("timestamp", 0) for a in alerts]
+        self._alerts_cache = (key, timestamps, alerts)
+        return timestamps, alerts
+    
+    def get_clip_stats(self, hours: int = 24, now: Optional[datetime] = None) -> dict:
+        """Analyze clips from the last N hours (before ``now``, default the current time)."""
+        cutoff = (datetime.now() if now is None else now) - timedelta(hours=hours)
+        stats = self._count_types(*self._scan_clips(cutoff), cutoff)
+        if stats:
+            stats["total"] = sum(stats.values())
+        return stats
     
-    def analyze_mood(self) -> TankMood:
-        """Determine the current tank mood."""
-        alerts = self.get_recent_alerts(hours=12)
-        clips = self.get_clip_stats(hours=12)
-        hour = datetime.now().hour
+    def analyze_mood(self, now: Optional[datetime] = None) -> TankMood:
+        """Determine the tank mood at ``now`` (default the current time)."""
+        # One clock reading for every window below
+        if now is None:
+            now = datetime.now()
+        alerts = self.get_recent_alerts(hours=12, now=now)
+        clips = self.get_clip_stats(hours=12, now=now)
+        hour = now.hour
         
         # Determine time of day
         if 22 <= hour or hour < 6:
@@ -117,23 +279,10 @@ class TankMoodAnalyzer:
         else:
             activity_level = "hyperactive"
         
-        # Determine health status
-        concerning_alerts = sum([
-            alert_types.get("no_motion", 0),
-            alert_types.get("fish_floating", 0),
-            alert_types.get("gasping_surface", 0),
-            alert_types.get("fish_stuck_bottom", 0),
-        ])
-        
-        warning_alerts = sum([
-            alert_types.get("water_cloudy", 0),
-            alert_types.get("filter_stopped", 0),
-            alert_types.get("erratic_swimming", 0),
-        ])
-        
-        if concerning_alerts > 0:
+        # Determine health status (the first alert of a kind settles it)
+        if any(k in alert_types for k in self.CONCERNING_ALERTS):
             health_status = "concerning"
-        elif warning_alerts > 0:
+        elif any(k in alert_types for k in self.WARNING_ALERTS):
             health_status = "meh"
         else:
             health_status = "good"
@@ -147,19 +296,9 @@ class TankMoodAnalyzer:
             activity_level = "clustering"
         
         # Find matching mood
-        mood_key = None
-        for key in self.MOODS:
-            act, health, time = key
-            if (act == activity_level or act == "any") and \
-               (health == health_status or health == "any") and \
-               (time == time_of_day or time == "any"):
-                mood_key = key
-                break
-        
-        if mood_key is None:
-            mood_key = ("chill", "good", "any")  # Default
-        
-        emoji, mood_name, description = self.MOODS[mood_key]
+        emoji, mood_name, description = self.MOOD_INDEX.get(
+            (activity_level, health_status, time_of_day), self.DEFAULT_MOOD
+        )
         
         # Determine health vibe string
         health_vibes = {
@@ -179,77 +318,45 @@ class TankMoodAnalyzer:
     
     def get_activity_heatmap(self, days: int = 7) -> dict:
         """Generate hourly activity heatmap for the week."""
-        heatmap = defaultdict(lambda: defaultdict(int))
         cutoff = datetime.now() - timedelta(days=days)
+        times, _ = self._scan_clips(cutoff)
+        counts = _weekday_hour_counts(times, _clock_seconds(cutoff))
         
-        for f in self.clips_dir.glob("*.mp4"):
-            try:
-                parts = f.stem.split("_", 2)
-                if len(parts) < 2:
-                    continue
-                dt = datetime.strptime(f"{parts[0]}_{parts[1]}", "%Y%m%d_%H%M%S")
-                if dt > cutoff:
-                    day = dt.strftime("%a")  # Mon, Tue, etc.
-                    hour = dt.hour
-                    heatmap[day][hour] += 1
-            except Exception as e:
-                print(f"[TankMood] Error parsing clip for heatmap {f.name}: {e}")
-                continue
-        
-        return {day: dict(hours) for day, hours in heatmap.items()}
+        # {"Mon": {hour: clips}, ...}, leaving out empty days and hours
+        heatmap = {}
+        for day, row in zip(DAY_ABBRS, counts.tolist()):
+            hours = {hour: n for hour, n in enumerate(row) if n}
+            if hours:
+                heatmap[day] = hours
+        return heatmap
     
     def get_fish_favorites(self, days: int = 7) -> dict:
         """Determine favorite times, spots, etc."""
-        clips = []
         cutoff = datetime.now() - timedelta(days=days)
+        times, types = self._scan_clips(cutoff)
         
-        for f in self.clips_dir.glob("*.mp4"):
-            try:
-                parts = f.stem.split("_", 2)
-                if len(parts) < 3:
-                    continue
-                dt = datetime.strptime(f"{parts[0]}_{parts[1]}", "%Y%m%d_%H%M%S")
-                if dt > cutoff:
-                    clips.append({
-                        "time": dt,
-                        "hour": dt.hour,
-                        "day": dt.strftime("%A"),
-                        "type": parts[2],
-                    })
-            except Exception as e:
-                print(f"[TankMood] Error parsing clip for favorites {f.name}: {e}")
-                continue
-        
-        if not clips:
+        # Only clips named with an alert type count here
+        counts = _weekday_hour_counts(times[np.not_equal(types, None)], _clock_seconds(cutoff))
+        total_clips = int(counts.sum())
+        if not total_clips:
             return {"no_data": True}
         
         # Most active hour
-        hour_counts = defaultdict(int)
-        for c in clips:
-            hour_counts[c["hour"]] += 1
-        
-        peak_hour = max(hour_counts.items(), key=lambda x: x[1])[0]
+        peak_hour = int(counts.sum(axis=0).argmax())
         peak_time = datetime.now().replace(hour=peak_hour, minute=0).strftime("%I %p")
         
         # Most active day
-        day_counts = defaultdict(int)
-        for c in clips:
-            day_counts[c["day"]] += 1
-        
-        peak_day = max(day_counts.items(), key=lambda x: x[1])[0]
+        peak_day = DAY_NAMES[int(counts.sum(axis=1).argmax())]
         
         # Most common activity
-        type_counts = defaultdict(int)
-        for c in clips:
-            type_counts[c["type"]] += 1
-        
+        type_counts = self._count_types(times, types, cutoff)
         favorite_activity = max(type_counts.items(), key=lambda x: x[1])[0]
         
         return {
             "peak_time": peak_time,
             "peak_day": peak_day,
             "favorite_activity": favorite_activity.replace("_", " ").title(),
-            "total_clips": len(clips),
+            "total_clips": total_clips,
         }
 
 
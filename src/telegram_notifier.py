@@ -4,14 +4,36 @@ Uses Bot API - just need a bot token and chat ID.
 """
 
 import json
-import urllib.request
-import urllib.error
+import os
+import atexit
+import uuid
+import http.client
+import threading
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
 from .detector import Alert, AlertType
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding
+    orjson = None
+
+
+def _dumps(payload: dict) -> bytes:
+    """Encode a Bot API payload as UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload).encode('utf-8')
+
+
+def _loads(data: bytes):
+    """Decode a Bot API JSON response."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class TelegramNotifier:
     """Send alerts directly to Telegram via Bot API."""
@@ -32,76 +54,196 @@ class TelegramNotifier:
         AlertType.INTERESTING_MOMENT: "✨",
     }
     
-    def __init__(self, bot_token: str, chat_id: str, tank_name: str = "Fish Tank"):
+    # Optional lines are passed in already formatted, or as ""
+    _MESSAGE_TEMPLATE = (
+        "{emoji} *{tank_name} Alert*\n"
+        "\n"
+        "{fish_line}"
+        "*Type:* {title}\n"
+        "*Confidence:* {confidence:.0%}"
+        "{message_line}{vision_line}{clip_line}"
+    )
+    
+    # Header and per-alert line of the digest sent for a burst of alerts
+    _DIGEST_TEMPLATE = "{emoji} *{tank_name}: {count} alerts*\n\n{lines}"
+    _DIGEST_LINE_TEMPLATE = "• {emoji} *{title}* ({confidence:.0%}){fish}{clip}{message}{summary}"
+    
+    _REPORT_TEMPLATE = (
+        "📊 *Daily Fish Report*\n"
+        "\n"
+        "{emoji} *Health Score:* {health}/100\n"
+        "🚨 *Alerts:* {alerts}\n"
+        "📹 *Clips:* {clips}\n"
+        "\n"
+        "_Fish Watcher AI_"
+    )
+    
+    def __init__(self, bot_token: str, chat_id: str, tank_name: str = "Fish Tank",
+                 coalesce_seconds: float = 0.0):
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.tank_name = tank_name
+        # Alerts arriving within this window of the first are sent as one
+        # message; 0 (the default) sends each alert as it comes
+        self.coalesce_seconds = coalesce_seconds
+        self._flush_at_exit = False
+        self._pending: list[tuple[str, str]] = []  # (full message, digest line)
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        self._req_headers = {'Content-Type': 'application/json'}
+        # Fixed part of every sendMessage payload
+        self._message_fields = {"chat_id": chat_id, "parse_mode": "Markdown"}
+        # One keep-alive connection to the Bot API, shared by all sends
+        self._conn = http.client.HTTPSConnection("api.telegram.org", timeout=10)
+        self._conn_lock = threading.Lock()
+        
+    def _post_json(self, method: str, payload: dict) -> dict:
+        """POST ``payload`` to Bot API ``method`` and return the decoded reply."""
+        body = _dumps(payload)
+        return self._post(method, lambda: body, self._req_headers)
+    
+    def _post(self, method: str, make_body, headers: dict) -> dict:
+        """POST to Bot API ``method`` and return the decoded reply.
+        
+        ``make_body`` returns the request body (bytes or an iterable of
+        bytes) and is called again for a retry. Reuses the open connection;
+        if the server dropped it since the last call, reconnects and
+        retries once.
+        """
+        path = f"/bot{self.bot_token}/{method}"
+        with self._conn_lock:
+            for attempt in range(2):
+                try:
+                    self._conn.request("POST", path, make_body(), headers)
+                    data = self._conn.getresponse().read()
+                    break
+                except (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                        ConnectionResetError, BrokenPipeError):
+                    self._conn.close()
+                    if attempt:
+                        raise
+                except Exception:
+                    self._conn.close()  # Leave no half-read response behind
+                    raise
+        return _loads(data)
         
     def notify(self, alert: Alert, clip_path: Optional[str] = None,
                vision_analysis: Optional[dict] = None,
                fish_name: Optional[str] = None) -> bool:
-        """Send alert to Telegram."""
+        """Send alert to Telegram.
+        
+        Returns whether the message was sent. With a coalescing window the
+        alert is queued instead and True only means it was accepted; it goes
+        out, alone or in a digest with the alerts that follow it, when the
+        window closes (or on flush(), which also runs at exit).
+        """
         emoji = self.ALERT_EMOJI.get(alert.type, "🔔")
+        title = alert.type.value.replace('_', ' ').title()
+        clip_name = Path(clip_path).name if clip_path else None
         
         # Build message
-        lines = [
-            f"{emoji} *{self.tank_name} Alert*",
-            "",
-            f"*Type:* {alert.type.value.replace('_', ' ').title()}",
-            f"*Confidence:* {alert.confidence:.0%}",
-        ]
-        
-        if fish_name:
-            lines.insert(2, f"*Fish:* {fish_name}")
-        
-        if alert.message:
-            lines.append(f"\n_{alert.message}_")
+        summary = vision_analysis.get("summary") if vision_analysis else None
+        text = self._MESSAGE_TEMPLATE.format(
+            emoji=emoji,
+            tank_name=self.tank_name,
+            fish_line=f"*Fish:* {fish_name}\n" if fish_name else "",
+            title=title,
+            confidence=alert.confidence,
+            message_line=f"\n\n_{alert.message}_" if alert.message else "",
+            vision_line=f"\n\n🧠 *AI Analysis:*\n{summary}" if summary else "",
+            clip_line=f"\n\n📹 Clip: `{clip_name}`" if clip_name else "",
+        )
         
-        if vision_analysis and vision_analysis.get("summary"):
-            lines.append(f"\n🧠 *AI Analysis:*\n{vision_analysis['summary']}")
+        if self.coalesce_seconds <= 0:
+            return self._send_text(text)
         
-        if clip_path:
-            lines.append(f"\n📹 Clip: `{Path(clip_path).name}`")
-        
-        text = "\n".join(lines)
+        line = self._DIGEST_LINE_TEMPLATE.format(
+            emoji=emoji,
+            title=title,
+            confidence=alert.confidence,
+            fish=f" - {fish_name}" if fish_name else "",
+            clip=f" `{clip_name}`" if clip_name else "",
+            message=f"\n   _{alert.message}_" if alert.message else "",
+            summary=f"\n   🧠 {summary}" if summary else "",
+        )
+        with self._pending_lock:
+            self._pending.append((text, line))
+            # The window runs from the first queued alert, so a steady
+            # stream of alerts still goes out every coalesce_seconds
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.coalesce_seconds, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            if not self._flush_at_exit:
+                # The timer is a daemon; don't drop queued alerts at exit
+                atexit.register(self.flush)
+                self._flush_at_exit = True
+        return True
+    
+    def flush(self) -> bool:
+        """Send queued alerts now: one as its full message, several as a digest."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
         
+        if not pending:
+            return True
+        if len(pending) == 1:
+            return self._send_text(pending[0][0])
+        return self._send_text(self._DIGEST_TEMPLATE.format(
+            emoji="🚨",
+            tank_name=self.tank_name,
+            count=len(pending),
+            lines="\n".join(line for _, line in pending),
+        ))
+    
+    def _send_text(self, text: str, what: str = "") -> bool:
+        """Send a Markdown message to the chat."""
         try:
-            payload = {
-                "chat_id": self.chat_id,
-                "text": text,
-                "parse_mode": "Markdown",
-            }
+            result = self._post_json("sendMessage", {**self._message_fields, "text": text})
+            return result.get("ok", False)
             
-            data = json.dumps(payload).encode('utf-8')
-            req = urllib.request.Request(
-                f"{self.base_url}/sendMessage",
-                data=data,
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read())
-                return result.get("ok", False)
-                
         except Exception as e:
-            print(f"[Telegram] Failed to send: {e}")
+            print(f"[Telegram] Failed to send{what}: {e}")
             return False
     
     def send_video(self, video_path: str, caption: str = "") -> bool:
-        """Send a video clip to Telegram."""
+        """Send a video clip to Telegram.
+        
+        The clip is streamed from disk as a multipart upload over the
+        shared connection, so memory use does not grow with clip size.
+        """
         try:
-            import subprocess
-            # Use curl for multipart upload (simpler than urllib)
-            cmd = [
-                "curl", "-s", "-X", "POST",
-                f"{self.base_url}/sendVideo",
-                "-F", f"chat_id={self.chat_id}",
-                "-F", f"video=@{video_path}",
-                "-F", f"caption={caption}",
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            return "ok" in result.stdout.lower()
+            boundary = uuid.uuid4().hex
+            fields = b"".join(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+                f'{value}\r\n'.encode('utf-8')
+                for name, value in (("chat_id", self.chat_id), ("caption", caption))
+            )
+            filename = Path(video_path).name.replace('"', '')
+            file_head = (
+                f'--{boundary}\r\nContent-Disposition: form-data; name="video"; '
+                f'filename="{filename}"\r\nContent-Type: video/mp4\r\n\r\n'
+            ).encode('utf-8')
+            tail = f"\r\n--{boundary}--\r\n".encode('ascii')
+            size = os.path.getsize(video_path)
+            
+            def make_body():
+                yield fields + file_head
+                with open(video_path, 'rb') as f:
+                    while chunk := f.read(64 * 1024):
+                        yield chunk
+                yield tail
+            
+            headers = {
+                'Content-Type': f"multipart/form-data; boundary={boundary}",
+                'Content-Length': str(len(fields) + len(file_head) + size + len(tail)),
+            }
+            result = self._post("sendVideo", make_body, headers)
+            return result.get("ok", False)
         except Exception as e:
             print(f"[Telegram] Failed to send video: {e}")
             return False
@@ -124,32 +266,5 @@ class TelegramNotifier:
         else:
             emoji = "📊"
         
-        text = f"""📊 *Daily Fish Report*
-
-{emoji} *Health Score:* {health}/100
-🚨 *Alerts:* {alerts}
-📹 *Clips:* {clips}
-
-_Fish Watcher AI_"""
-        
-        try:
-            payload = {
-                "chat_id": self.chat_id,
-                "text": text,
-                "parse_mode": "Markdown",
-            }
-            
-            data = json.dumps(payload).encode('utf-8')
-            req = urllib.request.Request(
-                f"{self.base_url}/sendMessage",
-                data=data,
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read())
-                return result.get("ok", False)
-                
-        except Exception as e:
-            print(f"[Telegram] Failed to send report: {e}")
-            return False
+        text = self._REPORT_TEMPLATE.format(emoji=emoji, health=health, alerts=alerts, clips=clips)
+        return self._send_text(text, " report")
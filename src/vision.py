@@ -4,14 +4,32 @@ Uses Claude to analyze clips and provide detailed assessments.
 """
 
 import os
+import re
 import json
 import base64
 import subprocess
+import threading
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
 import cv2
 
+try:
+    import anthropic
+except ImportError:  # Optional: direct API access; the claude CLI is the fallback
+    anthropic = None
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON decoding
+    orjson = None
+
+# Outermost {...} in a reply, ignoring code fences and surrounding prose
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Scratch directory for images handed to the CLI; None means the default
+_TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
 
 @dataclass
 class VisionAnalysis:
@@ -52,20 +70,30 @@ Respond ONLY with valid JSON in this exact format:
     "severity": "normal|minor|moderate|serious|critical"
 }"""
 
+    # Frames are shrunk to this long edge before upload; the API scales
+    # larger images down anyway, so extra pixels only cost bandwidth
+    MAX_IMAGE_EDGE = 1568
+    JPEG_QUALITY = 80
+
     def __init__(self, api_key: Optional[str] = None, model: str = "claude-sonnet-4-20250514"):
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         self.model = model
+        # One client (and connection pool) for every call
+        self._client = anthropic.Anthropic(api_key=self.api_key) if self.api_key and anthropic else None
         
     def analyze_frame(self, frame) -> Optional[VisionAnalysis]:
         """Analyze a single frame (numpy array from OpenCV)."""
         if frame is None:
             return None
             
-        # Encode frame as JPEG then base64
-        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-        image_b64 = base64.b64encode(buffer).decode('utf-8')
+        # Downscale, then encode frame as JPEG
+        h, w = frame.shape[:2]
+        scale = self.MAX_IMAGE_EDGE / max(h, w)
+        if scale < 1:
+            frame = cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.JPEG_QUALITY])
         
-        return self._call_claude(image_b64)
+        return self._call_claude(buffer)
     
     def analyze_image_path(self, image_path: str) -> Optional[VisionAnalysis]:
         """Analyze an image file."""
@@ -74,16 +102,17 @@ Respond ONLY with valid JSON in this exact format:
             return None
             
         with open(path, 'rb') as f:
-            image_b64 = base64.b64encode(f.read()).decode('utf-8')
+            image = f.read()
             
-        return self._call_claude(image_b64)
+        return self._call_claude(image)
     
-    def analyze_clip(self, clip_path: str, sample_frames: int = 3) -> Optional[VisionAnalysis]:
-        """Analyze a video clip by sampling frames.
+    def analyze_clip(self, clip_path: str, sample_frames: int = 1) -> Optional[VisionAnalysis]:
+        """Analyze a video clip by its middle frame.
         
         Args:
             clip_path: Path to video file
-            sample_frames: Number of frames to sample (default 3: start, middle, end)
+            sample_frames: Kept for compatibility; only the middle frame
+                (the most representative) is decoded and analyzed
         """
         path = Path(clip_path)
         if not path.exists():
@@ -93,39 +122,71 @@ Respond ONLY with valid JSON in this exact format:
         if not cap.isOpened():
             return None
             
+        # Seek straight to the middle frame; each seek decodes forward
+        # from the previous keyframe, so frames that would be thrown away
+        # are not worth decoding
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        if total_frames < sample_frames:
-            sample_frames = total_frames
-            
-        # Calculate frame positions to sample
-        positions = [int(total_frames * i / (sample_frames - 1)) for i in range(sample_frames)] if sample_frames > 1 else [0]
+        target = max(total_frames, 0) // 2
         
-        frames = []
-        for pos in positions:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
-            ret, frame = cap.read()
-            if ret:
-                frames.append(frame)
+        # With ffmpeg, take the keyframe nearest the middle instead:
+        # nothing else is decoded and the JPEG comes out ready to send
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if fps > 0:
+            jpeg = self._extract_keyframe_jpeg(path, target / fps)
+            if jpeg:
+                cap.release()
+                return self._call_claude(jpeg)
+        
+        if target:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+        ret, frame = cap.read()
         cap.release()
         
-        if not frames:
+        if not ret:
             return None
             
-        # Analyze the middle frame (most representative)
-        middle_idx = len(frames) // 2
-        return self.analyze_frame(frames[middle_idx])
+        return self.analyze_frame(frame)
+    
+    def _extract_keyframe_jpeg(self, path: Path, seconds: float) -> Optional[bytes]:
+        """JPEG of the keyframe at or before ``seconds`` into a clip, via ffmpeg.
+        
+        Only keyframes are decoded, and ffmpeg scales and encodes the frame
+        itself. Returns None when ffmpeg is missing or fails.
+        """
+        edge = self.MAX_IMAGE_EDGE
+        try:
+            result = subprocess.run([
+                "ffmpeg", "-v", "error",
+                "-skip_frame", "nokey", "-noaccurate_seek",
+                "-ss", f"{seconds:.3f}",
+                "-i", str(path),
+                "-frames:v", "1",
+                "-vf", f"scale='min(iw,{edge})':'min(ih,{edge})':force_original_aspect_ratio=decrease",
+                "-q:v", "4",
+                "-f", "image2pipe", "-vcodec", "mjpeg", "-",
+            ], capture_output=True, timeout=30)
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return None
+        
+        if result.returncode != 0 or not result.stdout:
+            return None
+        return result.stdout
     
-    def _call_claude(self, image_b64: str) -> Optional[VisionAnalysis]:
-        """Call Claude API with the image."""
-        if not self.api_key:
-            # Fall back to CLI if no API key
-            return self._call_claude_cli(image_b64)
+    def _call_claude(self, image) -> Optional[VisionAnalysis]:
+        """Call Claude API with the image.
+        
+        ``image`` is the JPEG data as any bytes-like object; it is base64
+        encoded only for the API request, the CLI reads it from a file.
+        """
+        if self._client is None:
+            # Fall back to CLI if no API key or anthropic package
+            return self._call_claude_cli(image)
             
         try:
-            import anthropic
-            client = anthropic.Anthropic(api_key=self.api_key)
+            # base64 output is pure ASCII, so skip UTF-8 decoding
+            image_b64 = base64.b64encode(image).decode('ascii')
             
-            response = client.messages.create(
+            response = self._client.messages.create(
                 model=self.model,
                 max_tokens=1024,
                 messages=[
@@ -151,32 +212,30 @@ Respond ONLY with valid JSON in this exact format:
             
             return self._parse_response(response.content[0].text)
             
-        except ImportError:
-            # anthropic package not installed, fall back to CLI
-            return self._call_claude_cli(image_b64)
         except Exception as e:
             print(f"[Vision] API error: {e}")
             return None
     
-    def _call_claude_cli(self, image_b64: str) -> Optional[VisionAnalysis]:
+    def _call_claude_cli(self, image) -> Optional[VisionAnalysis]:
         """Use claude CLI as fallback."""
         try:
-            # Write image to temp file
+            # Write image to temp file (in RAM-backed /dev/shm when there is one)
             import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as f:
-                f.write(base64.b64decode(image_b64))
+            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False, dir=_TEMP_DIR) as f:
+                f.write(image)
                 temp_path = f.name
             
             # Call claude CLI with image
-            result = subprocess.run(
-                ['claude', '--image', temp_path, '--output-format', 'text', '-p', self.ANALYSIS_PROMPT],
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
-            
-            # Clean up
-            os.unlink(temp_path)
+            try:
+                result = subprocess.run(
+                    ['claude', '--image', temp_path, '--output-format', 'text', '-p', self.ANALYSIS_PROMPT],
+                    capture_output=True,
+                    text=True,
+                    timeout=60,
+                )
+            finally:
+                # Clean up, also after a timeout
+                os.unlink(temp_path)
             
             if result.returncode == 0:
                 return self._parse_response(result.stdout)
@@ -190,15 +249,13 @@ Respond ONLY with valid JSON in this exact format:
     
     def _parse_response(self, text: str) -> Optional[VisionAnalysis]:
         """Parse Claude's JSON response."""
+        text = text.strip()
         try:
-            # Extract JSON from response (handle markdown code blocks)
-            text = text.strip()
-            if text.startswith('```'):
-                # Remove code block markers
-                lines = text.split('\n')
-                text = '\n'.join(lines[1:-1])
-            
-            data = json.loads(text)
+            # Extract JSON from response (handle markdown code blocks and prose)
+            match = _JSON_OBJECT_RE.search(text)
+            if match is None:
+                raise json.JSONDecodeError("No JSON object found", text, 0)
+            data = orjson.loads(match.group()) if orjson is not None else json.loads(match.group())
             
             return VisionAnalysis(
                 summary=data.get("summary", "Analysis complete"),
@@ -224,12 +281,26 @@ Respond ONLY with valid JSON in this exact format:
             )
 
 
+_default_analyzer: Optional[ClaudeVisionAnalyzer] = None
+_default_analyzer_lock = threading.Lock()
+
+
+def _get_default_analyzer() -> ClaudeVisionAnalyzer:
+    """Shared analyzer for analyze_for_clawdbot, built on first use."""
+    global _default_analyzer
+    with _default_analyzer_lock:
+        if _default_analyzer is None:
+            _default_analyzer = ClaudeVisionAnalyzer()
+        return _default_analyzer
+
+
 def analyze_for_clawdbot(clip_path: str) -> dict:
     """Convenience function for Clawdbot integration.
     
-    Returns a dict suitable for including in alerts.
+    Returns a dict suitable for including in alerts. Calls share one
+    analyzer, and so one API client.
     """
-    analyzer = ClaudeVisionAnalyzer()
+    analyzer = _get_default_analyzer()
     result = analyzer.analyze_clip(clip_path)
     
     if not result:
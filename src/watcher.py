@@ -2,15 +2,17 @@
 Main Fish Watcher - ties everything together.
 """
 
+import queue
 import time
 import signal
 import sys
+import threading
 from pathlib import Path
 from typing import Optional
 import cv2
-import yaml
 
 from .buffer import RollingBuffer
+from .config_cache import load_config
 from .detector import FishWatcherDetector, DetectorConfig, Alert
 from .recorder import ClipRecorder
 from .notifier import ClawdbotNotifier, WebhookNotifier
@@ -20,14 +22,26 @@ from .reports import ReportGenerator
 class FishWatcher:
     """Main watcher class that monitors a camera feed."""
     
+    # Decoded frames the capture thread may queue ahead of detection
+    READ_QUEUE_FRAMES = 4
+    # Frames in flight between capture and buffer.add(): the queue, the one
+    # being decoded and the one detection has popped
+    READ_AHEAD = READ_QUEUE_FRAMES + 2
+    # Finished clips waiting to be announced
+    NOTIFY_QUEUE = 16
+    
     def __init__(self, config_path: str = "config.yaml"):
         self.config = self._load_config(config_path)
         self.running = False
         
         # Initialize components
+        # Slots outlive the recorder's writer queue, so clip frames need no
+        # copy, and leave room for the capture thread's read-ahead
         self.buffer = RollingBuffer(
             max_seconds=self.config['recording']['pre_roll'],
-            fps=self.config['camera']['fps']
+            fps=self.config['camera']['fps'],
+            min_slots=ClipRecorder.FRAME_HOLD,
+            read_ahead=self.READ_AHEAD,
         )
         
         detector_config = DetectorConfig(
@@ -36,6 +50,7 @@ class FishWatcher:
             color_change_threshold=self.config['detection']['color_change_threshold'],
             surface_zone_percent=self.config['detection']['surface_zone_percent'],
             learn_baseline=self.config['detection']['learn_baseline'],
+            use_opencl=self.config['detection'].get('use_opencl', False),
         )
         self.detector = FishWatcherDetector(detector_config)
         self.detector.cooldown = self.config['alerts']['cooldown']
@@ -60,11 +75,22 @@ class FishWatcher:
         )
         
         self.camera: Optional[cv2.VideoCapture] = None
+        # Frames grabbed per frame decoded, when the camera outruns camera.fps
+        self._decode_every = 1
+        self._reader: Optional[threading.Thread] = None
+        self._reader_error: Optional[BaseException] = None
+        
+        # Notifications go out on their own thread, so a slow network call
+        # never holds up detection (and, through the read queue, capture)
+        self._notify_q: queue.Queue = queue.Queue(maxsize=self.NOTIFY_QUEUE)
+        self._notify_thread = threading.Thread(
+            target=self._notify_worker, name="notifier", daemon=True
+        )
+        self._notify_thread.start()
         
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file."""
-        with open(config_path) as f:
-            return yaml.safe_load(f)
+        return load_config(config_path)
     
     def _setup_camera(self) -> cv2.VideoCapture:
         """Initialize the camera connection."""
@@ -79,10 +105,17 @@ class FishWatcher:
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, cam_config['width'])
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, cam_config['height'])
         cap.set(cv2.CAP_PROP_FPS, cam_config['fps'])
+        # Keep at most one frame queued in the driver, so reads are fresh
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         
         if not cap.isOpened():
             raise RuntimeError("Failed to open camera")
         
+        # Cameras that ignore the requested rate deliver more frames than
+        # the buffer and clips are timed for; only every Nth gets decoded
+        capture_fps = cap.get(cv2.CAP_PROP_FPS)
+        self._decode_every = max(1, round(capture_fps / cam_config['fps'])) if capture_fps > 0 else 1
+        
         return cap
     
     def start(self) -> None:
@@ -100,28 +133,38 @@ class FishWatcher:
         print(f"[FishWatcher] Pre-roll: {self.config['recording']['pre_roll']}s")
         print(f"[FishWatcher] Post-roll: {self.config['recording']['post_roll']}s")
         
+        # Capture runs on its own thread so grab/decode overlaps detection;
+        # clip encoding already runs on the recorder's writer thread
+        frames: queue.Queue = queue.Queue(maxsize=self.READ_QUEUE_FRAMES)
+        self._reader_error = None
+        self._reader = threading.Thread(
+            target=self._read_frames, args=(frames,), name="frame-reader", daemon=True
+        )
+        self._reader.start()
+        
         frame_count = 0
         last_status = time.time()
         
         try:
             while self.running:
-                ret, frame = self.camera.read()
-                
-                if not ret:
-                    print("[FishWatcher] Failed to read frame, reconnecting...")
-                    time.sleep(1)
-                    self.camera = self._setup_camera()
+                try:
+                    frame = frames.get(timeout=0.5)
+                except queue.Empty:
                     continue
+                if frame is None:
+                    break  # Capture thread stopped
                 
-                # Add to rolling buffer
-                self.buffer.add(frame)
+                # Add to rolling buffer (decoded in place, so no copy). Adding
+                # here rather than on the capture thread keeps the pre-roll
+                # free of frames detection has not reached yet
+                frame = self.buffer.add(frame).frame
                 
                 # If recording, add frame to recorder
                 if self.recorder.is_recording:
                     clip_path, alert = self.recorder.add_frame(frame)
                     if clip_path:
                         # Recording complete, send notification
-                        self._send_notification(alert, clip_path)
+                        self._queue_notification(alert, clip_path)
                         self.reports.record_clip()
                 
                 # Run detection (skip if actively recording)
@@ -140,9 +183,9 @@ class FishWatcher:
                 if time.time() - last_status > 60:
                     print(f"[FishWatcher] Status: {frame_count} frames processed, buffer: {len(self.buffer)} frames")
                     last_status = time.time()
-                
-                # Small delay to control frame rate
-                time.sleep(1 / self.config['camera']['fps'])
+            
+            if self._reader_error is not None:
+                raise self._reader_error
                 
         except Exception as e:
             print(f"[FishWatcher] Error: {e}")
@@ -150,14 +193,70 @@ class FishWatcher:
         finally:
             self.stop()
     
+    def _read_frames(self, frames: queue.Queue) -> None:
+        """Capture thread: grab and decode frames into ``frames``.
+        
+        Each frame is decoded straight into the buffer slot the main loop's
+        add() will use for it. Ends with a ``None`` sentinel.
+        """
+        # Frames reach buffer.add() in capture order, one add per frame
+        frame_number = self.buffer.frame_count
+        grabbed = 0
+        try:
+            while self.running:
+                # grab() waits for the camera's next frame, which paces the
+                # loop; retrieve() decodes only the frames that are kept
+                ret = self.camera.grab()
+                if ret:
+                    grabbed += 1
+                    if grabbed % self._decode_every:
+                        continue
+                    ret, frame = self.camera.retrieve(self.buffer.slot_for(frame_number))
+                
+                if not ret:
+                    print("[FishWatcher] Failed to read frame, reconnecting...")
+                    time.sleep(1)
+                    self.camera = self._setup_camera()
+                    continue
+                
+                # Blocks while detection is READ_QUEUE_FRAMES behind
+                while self.running:
+                    try:
+                        frames.put(frame, timeout=0.5)
+                        frame_number += 1
+                        break
+                    except queue.Full:
+                        continue
+        except Exception as e:
+            self._reader_error = e
+        finally:
+            self.running = False
+            try:
+                frames.put_nowait(None)
+            except queue.Full:
+                pass  # Main loop sees running go False instead
+    
     def stop(self) -> None:
         """Stop the watcher."""
         print("[FishWatcher] Stopping...")
         self.running = False
         
+        # The capture thread owns the camera until it exits
+        reader = self._reader
+        if reader is not None and reader is not threading.current_thread():
+            reader.join(timeout=5)
+        
         if self.camera:
             self.camera.release()
         
+        # Let queued notifications go out before exiting
+        if self._notify_thread.is_alive():
+            try:
+                self._notify_q.put(None, timeout=5)
+                self._notify_thread.join(timeout=30)
+            except queue.Full:
+                pass
+        
         print("[FishWatcher] Stopped.")
     
     def _signal_handler(self, signum, frame) -> None:
@@ -165,12 +264,31 @@ class FishWatcher:
         print(f"\n[FishWatcher] Received signal {signum}")
         self.running = False
     
+    def _queue_notification(self, alert: Optional[Alert], clip_path: str) -> None:
+        """Hand a finished clip to the notifier thread without blocking."""
+        try:
+            self._notify_q.put_nowait((alert, clip_path))
+        except queue.Full:
+            print(f"[FishWatcher] Notification queue full, dropped: {clip_path}")
+    
+    def _notify_worker(self) -> None:
+        """Notifier thread: send queued notifications until a None arrives."""
+        while True:
+            item = self._notify_q.get()
+            if item is None:
+                break
+            try:
+                self._send_notification(*item)
+            except Exception as e:
+                print(f"[FishWatcher] Notification error: {e}")
+    
     def _send_notification(self, alert: Optional[Alert], clip_path: str) -> None:
         """Send notification for completed clip."""
         if not alert:
             return
         
-        result = self.notifier.notify(alert, clip_path)
+        # The recorder only returns the path of a clip it wrote
+        result = self.notifier.notify(alert, clip_path, clip_exists=bool(clip_path))
         if result.success:
             print(f"[FishWatcher] Notification sent: {result.message}")
         else:
@@ -185,6 +303,12 @@ def main() -> None:
     parser.add_argument("-c", "--config", default="config.yaml", help="Config file path")
     args = parser.parse_args()
     
+    # OpenCV's worker pool is process-wide, so it is sized once here rather
+    # than by the components that use it
+    cv_threads = load_config(args.config).get('detection', {}).get('cv_threads')
+    if cv_threads is not None:
+        cv2.setNumThreads(int(cv_threads))
+    
     watcher = FishWatcher(config_path=args.config)
     watcher.start()
 
@@ -4,11 +4,14 @@ Fish Watcher Status Check
 Quick health check for camera, config, and recent activity.
 """
 
+import os
 import sys
 import json
+import heapq
 from pathlib import Path
 from datetime import datetime
-import yaml
+
+from src.config_cache import load_config
 
 try:
     import cv2
@@ -24,8 +27,7 @@ def check_config():
         return False, "config.yaml not found"
     
     try:
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
+        config = load_config(config_path)
         return True, config
     except Exception as e:
         print(f"[Status] Config parse error: {e}")
@@ -66,9 +68,15 @@ def check_clips():
     if not clips_dir.exists():
         return 0, []
     
-    clips = list(clips_dir.glob("*.mp4"))
-    recent = sorted(clips, key=lambda x: x.stat().st_mtime, reverse=True)[:5]
-    return len(clips), [c.name for c in recent]
+    # One directory pass, one stat per clip
+    with os.scandir(clips_dir) as it:
+        clips = [
+            (entry.stat().st_mtime, entry.name)
+            for entry in it
+            if entry.name.endswith(".mp4") and not entry.name.startswith(".")
+        ]
+    recent = heapq.nlargest(5, clips)
+    return len(clips), [name for _, name in recent]
 
 
 def check_data():
@@ -2,27 +2,38 @@
 """
 Quick camera test - checks what cameras are available and captures a test frame.
 Run this before starting the full watcher.
+
+Stops at the first working camera; pass --scan-all to list every device.
 """
 
 import sys
+import time
 import cv2
 import os
 
-def find_cameras():
-    """Find all available cameras."""
+def find_cameras(scan_all=False):
+    """Find available cameras.
+    
+    Returns a list of (device_id, capture) with each capture still open, so
+    test_camera can reuse it instead of opening the device again. Stops at
+    the first camera unless scan_all is set.
+    """
     print("Scanning for cameras...")
     print()
     
     found = []
     for i in range(10):
         cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            print(f"  Camera {i}: FOUND - {w}x{h} @ {fps:.0f}fps")
-            found.append(i)
+        if not cap.isOpened():
             cap.release()
+            continue
+        w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        print(f"  Camera {i}: FOUND - {w}x{h} @ {fps:.0f}fps")
+        found.append((i, cap))
+        if not scan_all:
+            break
     
     if not found:
         print("  No cameras found!")
@@ -36,22 +47,42 @@ def find_cameras():
     return found
 
 
-def test_camera(device_id=0):
-    """Test a specific camera and save a snapshot."""
+def test_camera(device_id=0, cap=None):
+    """Test a specific camera and save a snapshot.
+    
+    Reuses ``cap`` if given (e.g. from find_cameras); it is released either way.
+    """
     print(f"Testing camera {device_id}...")
     
-    cap = cv2.VideoCapture(device_id)
+    if cap is None:
+        cap = cv2.VideoCapture(device_id)
     
     if not cap.isOpened():
         print(f"  Failed to open camera {device_id}")
         return False
     
+    # Same capture setup as the stream: MJPEG from the camera, and at most
+    # one frame queued in the driver so the snapshot is current
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    
     # Set resolution
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    
-    # Capture a few frames (first few might be black)
-    for _ in range(10):
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    
+    # Continuous auto exposure (V4L2 aperture-priority on most UVC cams),
+    # then take the first frame the driver delivers within 200 ms
+    cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 3)
+    deadline = time.monotonic() + 0.2
+    ret = cap.grab()
+    while not ret and time.monotonic() < deadline:
+        ret = cap.grab()
+    if ret:
+        ret, frame = cap.retrieve()
+    else:
+        # Slow starter: skip a few frames (first few might be black)
+        for _ in range(9):
+            cap.grab()
         ret, frame = cap.read()
     
     if not ret:
@@ -86,17 +117,19 @@ def main():
     print()
     
     # Find cameras
-    cameras = find_cameras()
+    cameras = find_cameras(scan_all="--scan-all" in sys.argv)
     
     if not cameras:
         sys.exit(1)
     
-    # Test first camera found
-    device = cameras[0]
+    # Test first camera found, reusing its open capture
+    device, cap = cameras[0]
+    for _, other in cameras[1:]:
+        other.release()
     print(f"Testing camera {device}...")
     print()
     
-    if test_camera(device):
+    if test_camera(device, cap):
         print()
         print("=" * 50)
         print("Camera is ready! You can now run:")
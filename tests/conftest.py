@@ -1,9 +1,17 @@
-"""Shared fixtures for fish-watcher tests."""
+"""Shared fixtures for fish-watcher tests.
+
+Frame fixtures are built once per session and are read-only; tests that
+draw on a frame take a .copy() first. Warmed detectors are likewise built
+once; their fixtures return a factory that hands each test a deep copy.
+"""
+
+import copy
+from typing import Callable
 
 import numpy as np
 import pytest
 
-from src.detector import DetectorConfig
+from src.detector import ColorDetector, DetectorConfig, MotionDetector
 
 
 @pytest.fixture
@@ -12,28 +20,60 @@ def default_config() -> DetectorConfig:
     return DetectorConfig()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def blank_frame() -> np.ndarray:
     """A solid black 640x480 BGR frame."""
-    return np.zeros((480, 640, 3), dtype=np.uint8)
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    frame.setflags(write=False)
+    return frame
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def white_frame() -> np.ndarray:
     """A solid white 640x480 BGR frame."""
-    return np.full((480, 640, 3), 255, dtype=np.uint8)
+    frame = np.full((480, 640, 3), 255, dtype=np.uint8)
+    frame.setflags(write=False)
+    return frame
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def noisy_frame() -> np.ndarray:
     """A random-noise 640x480 BGR frame (deterministic seed)."""
     rng = np.random.RandomState(42)
-    return rng.randint(0, 256, (480, 640, 3), dtype=np.uint8)
+    frame = rng.randint(0, 256, (480, 640, 3), dtype=np.uint8)
+    frame.setflags(write=False)
+    return frame
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def gradient_frame() -> np.ndarray:
     """A vertical gradient frame (black at top, white at bottom)."""
     grad = np.linspace(0, 255, 480, dtype=np.uint8)
-    frame = np.tile(grad[:, None, None], (1, 640, 3))
-    return frame.astype(np.uint8)
+    frame = np.tile(grad[:, None, None], (1, 640, 3)).astype(np.uint8)
+    frame.setflags(write=False)
+    return frame
+
+
+@pytest.fixture(scope="session")
+def blue_frame() -> np.ndarray:
+    """A solid blue-ish 640x480 BGR frame (water-colored baseline)."""
+    frame = np.full((480, 640, 3), [200, 100, 50], dtype=np.uint8)
+    frame.setflags(write=False)
+    return frame
+
+
+@pytest.fixture(scope="session")
+def warmed_motion_detector(blank_frame: np.ndarray) -> Callable[[], MotionDetector]:
+    """Factory for MotionDetectors with a baseline of 150 black frames."""
+    det = MotionDetector(DetectorConfig())
+    det.warmup(blank_frame, 150)
+    return lambda: copy.deepcopy(det)
+
+
+@pytest.fixture(scope="session")
+def warmed_color_detector(blue_frame: np.ndarray) -> Callable[[], ColorDetector]:
+    """Factory for ColorDetectors with a baseline of 110 blue frames."""
+    det = ColorDetector(DetectorConfig())
+    for _ in range(110):
+        det.process(blue_frame)
+    return lambda: copy.deepcopy(det)
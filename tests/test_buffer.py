@@ -46,7 +46,50 @@ class TestRollingBuffer:
 
     def test_frames_are_copies(self, blank_frame: np.ndarray) -> None:
         buf = RollingBuffer(max_seconds=5, fps=10)
-        buf.add(blank_frame)
-        blank_frame[:] = 128  # Mutate original
+        mutable = blank_frame.copy()
+        buf.add(mutable)
+        mutable[:] = 128  # Mutate original
         stored = buf.get_all()[0].frame
         assert stored[0, 0, 0] == 0  # Should still be black
+
+    def test_next_slot_is_stored_without_copy(self, blank_frame: np.ndarray) -> None:
+        buf = RollingBuffer(max_seconds=1, fps=2)  # 2 frames, 3 slots
+        assert buf.next_slot() is None
+        for _ in range(3):
+            buf.add(blank_frame)
+        slot = buf.next_slot()
+        assert slot is not None
+        slot[:] = 77  # Decode into the slot in place
+        stored = buf.add(slot).frame
+        assert stored is slot
+        assert all(f.frame is not slot for f in buf.get_all()[:-1])
+
+    def test_slot_for_read_ahead_keeps_buffered_frames(self, blank_frame: np.ndarray) -> None:
+        buf = RollingBuffer(max_seconds=1, fps=2, read_ahead=2)  # deque holds 2
+        for value in range(5):
+            buf.add(np.full_like(blank_frame, value))
+        # Decode two frames ahead without touching anything still buffered
+        for ahead in (0, 1):
+            slot = buf.slot_for(buf.frame_count + ahead)
+            assert slot is not None
+            slot[:] = 99
+        assert [int(f.frame[0, 0, 0]) for f in buf.get_all()] == [3, 4]
+        assert buf.add(buf.slot_for(buf.frame_count)).frame[0, 0, 0] == 99
+
+    def test_min_slots_delays_slot_reuse(self, blank_frame: np.ndarray) -> None:
+        buf = RollingBuffer(max_seconds=1, fps=2, min_slots=4)  # deque holds 2
+        first = buf.add(blank_frame).frame
+        for value in (1, 2, 3):
+            buf.add(np.full_like(blank_frame, value))
+        assert first[0, 0, 0] == 0  # Left the deque but not yet reused
+        buf.add(np.full_like(blank_frame, 4))
+        assert first[0, 0, 0] == 4
+
+    def test_frame_size_change_reallocates(self, blank_frame: np.ndarray) -> None:
+        buf = RollingBuffer(max_seconds=1, fps=2)
+        buf.add(blank_frame)
+        small = np.full((4, 4, 3), 9, dtype=np.uint8)
+        stored = buf.add(small).frame
+        assert stored.shape == small.shape
+        assert (stored == 9).all()
+        assert buf.get_all()[0].frame.shape == blank_frame.shape
@@ -1,10 +1,13 @@
 """Tests for src.detector — core detection logic."""
 
 import time
+from typing import Callable
+
 import numpy as np
 import pytest
 
 from src.detector import (
+    ALERT_TYPE_INDEX,
     Alert,
     AlertType,
     BaseDetector,
@@ -16,6 +19,7 @@ from src.detector import (
     FishWatcherDetector,
     MotionDetector,
     ZoneDetector,
+    _int_median,
 )
 
 
@@ -61,12 +65,11 @@ class TestMotionDetector:
         assert AlertType.MOTION_SPIKE not in motion_types
         assert AlertType.ERRATIC_SWIMMING not in motion_types
 
-    def test_motion_spike_detected(self, default_config: DetectorConfig) -> None:
-        det = MotionDetector(default_config)
-        # Build baseline with 150 blank frames
-        blank = np.zeros((480, 640, 3), dtype=np.uint8)
-        for _ in range(150):
-            det.process(blank)
+    def test_motion_spike_detected(
+        self, warmed_motion_detector: Callable[[], MotionDetector]
+    ) -> None:
+        # Baseline of 150 blank frames
+        det = warmed_motion_detector()
 
         # Introduce a massive change
         bright = np.full((480, 640, 3), 255, dtype=np.uint8)
@@ -74,17 +77,28 @@ class TestMotionDetector:
         types = {a.type for a in alerts}
         assert AlertType.MOTION_SPIKE in types or AlertType.ERRATIC_SWIMMING in types
 
-    def test_compute_motion_level_returns_float(
-        self, default_config: DetectorConfig, blank_frame: np.ndarray
+    def test_warmup_matches_repeated_process(
+        self, default_config: DetectorConfig, noisy_frame: np.ndarray
     ) -> None:
-        import cv2
+        looped = MotionDetector(default_config)
+        for _ in range(150):
+            looped.process(noisy_frame, now=100.0)
+        warmed = MotionDetector(default_config)
+        warmed.warmup(noisy_frame, 150, now=100.0)
+        assert list(warmed.motion_history) == list(looped.motion_history)
+        assert warmed.baseline_motion == looped.baseline_motion
+        assert np.array_equal(warmed.prev_frame, looped.prev_frame)
+
+    def test_count_motion_pixels(self, default_config: DetectorConfig) -> None:
         det = MotionDetector(default_config)
-        gray = cv2.cvtColor(blank_frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (21, 21), 0)
+        w, h = MotionDetector.SIZE
+        gray = np.full((h, w), 100, dtype=np.uint8)
         det.prev_frame = gray
-        level = det._compute_motion_level(gray)
-        assert isinstance(level, float)
-        assert level == 0.0
+        assert det._count_motion_pixels(gray) == 0
+        moved = gray.copy()
+        moved[10:20, 30:50] = 200
+        moved[50:60, 30:50] = 110  # Below the change threshold
+        assert det._count_motion_pixels(moved) == 10 * 20
 
 
 # ---------------------------------------------------------------------------
@@ -101,12 +115,10 @@ class TestColorDetector:
         assert alerts == []
 
     def test_color_change_after_baseline(
-        self, default_config: DetectorConfig
+        self, warmed_color_detector: Callable[[], ColorDetector]
     ) -> None:
-        det = ColorDetector(default_config)
-        blue = np.full((480, 640, 3), [200, 100, 50], dtype=np.uint8)
-        for _ in range(110):
-            det.process(blue)
+        # Baseline of 110 blue frames
+        det = warmed_color_detector()
 
         green = np.full((480, 640, 3), [50, 200, 50], dtype=np.uint8)
         alerts = det.process(green)
@@ -146,12 +158,38 @@ class TestZoneDetector:
         det.process(frame)
         assert det.surface_activity_start is not None
 
-    def test_get_zone_activity(self, default_config: DetectorConfig) -> None:
+    def test_uses_supplied_timestamp(self, default_config: DetectorConfig) -> None:
         det = ZoneDetector(default_config)
-        zone = np.zeros((100, 100), dtype=np.uint8)
-        assert det._get_zone_activity(zone) == 0.0
-        zone[:] = 200
-        assert det._get_zone_activity(zone) > 0
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame[:int(480 * 0.15), :] = 255
+        det.process(frame, now=1234.5)
+        assert det.surface_activity_start == 1234.5
+
+    def test_integral_zone_activity_bounds(self) -> None:
+        import cv2
+        bright = np.zeros((100, 100), dtype=np.uint8)
+        bright[:50] = 1
+        integral = cv2.integral(bright)
+        assert ZoneDetector._integral_zone_activity(integral, slice(50, None), slice(None)) == 0.0
+        assert ZoneDetector._integral_zone_activity(integral, slice(None, 50), slice(None)) == 100.0
+        assert ZoneDetector._integral_zone_activity(integral, slice(None), slice(None)) == 50.0
+        assert ZoneDetector._integral_zone_activity(integral, slice(60, 40), slice(None)) == 0.0
+
+    def test_integral_zone_activity_matches_direct(
+        self, default_config: DetectorConfig, noisy_frame: np.ndarray
+    ) -> None:
+        import cv2
+        det = ZoneDetector(default_config)
+        gray = cv2.cvtColor(noisy_frame, cv2.COLOR_BGR2GRAY)
+        integral = cv2.integral(cv2.threshold(gray, 180, 1, cv2.THRESH_BINARY)[1])
+        h, w = gray.shape
+        for rows, cols in [
+            (slice(None, h // 3), slice(None, w // 3)),
+            (slice(-h // 3, None), slice(-w // 3, None)),
+            (slice(-72, None), slice(None)),
+        ]:
+            expected = np.mean(gray[rows, cols] > 180) * 100
+            assert det._integral_zone_activity(integral, rows, cols) == pytest.approx(expected)
 
 
 # ---------------------------------------------------------------------------
@@ -175,6 +213,11 @@ class TestFishCountDetector:
         assert isinstance(count, int)
         assert count >= 0
 
+    def test_int_median_matches_numpy(self) -> None:
+        for values in ([3], [1, 2], [0, 5, 5, 2], [4, 4, 1, 7, 9, 0, 3]):
+            arr = np.array(values)
+            assert _int_median(arr) == int(np.median(arr))
+
 
 # ---------------------------------------------------------------------------
 # FilterDetector
@@ -268,3 +311,10 @@ class TestAlert:
         assert a.frame is None
         assert a.is_cool_moment is False
         assert isinstance(a.timestamp, float)
+
+    def test_explicit_timestamp_is_kept(self) -> None:
+        a = Alert(type=AlertType.NO_MOTION, message="replayed", confidence=0.5, timestamp=0.0)
+        assert a.timestamp == 0.0
+
+    def test_alert_type_index_is_dense(self) -> None:
+        assert [ALERT_TYPE_INDEX[t] for t in AlertType] == list(range(len(AlertType)))
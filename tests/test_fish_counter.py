@@ -32,18 +32,33 @@ class TestFishCounter:
             fc.process(blank_frame)
         assert fc.get_stable_count() == 0
 
+    def test_stable_count_is_window_mode(self) -> None:
+        fc = FishCounter()
+        for c in [2] * 20 + [3] * 25:
+            fc._update_stable_count(c)
+        # Window holds the last 30: five 2s and twenty-five 3s
+        assert fc.get_stable_count() == 3
+
     def test_draw_detections_returns_frame(self, blank_frame: np.ndarray) -> None:
         fc = FishCounter()
         _, blobs = fc.process(blank_frame)
         out = fc.draw_detections(blank_frame, blobs)
         assert out.shape == blank_frame.shape
 
+    def test_draw_detections_inplace(self, blank_frame: np.ndarray) -> None:
+        fc = FishCounter()
+        frame = blank_frame.copy()
+        _, blobs = fc.process(frame)
+        out = fc.draw_detections(frame, blobs, inplace=True)
+        assert out is frame
+        assert fc.draw_detections(frame, blobs) is not frame
+
     def test_reset_clears_state(self, blank_frame: np.ndarray) -> None:
         fc = FishCounter()
         for _ in range(5):
             fc.process(blank_frame)
         fc.reset()
-        assert fc.count_history == []
+        assert len(fc.count_history) == 0
         assert fc.stable_count == 0
 
     def test_detects_blobs_in_noisy_frame(self, noisy_frame: np.ndarray) -> None:
@@ -53,6 +68,52 @@ class TestFishCounter:
         # We don't assert exact count — just that it runs without error
         assert isinstance(count, int)
 
+    def test_blobs_reported_in_full_frame_coords(self, blank_frame: np.ndarray) -> None:
+        fc = FishCounter()
+        for _ in range(30):
+            fc.process(blank_frame)
+        frame = blank_frame.copy()
+        frame[100:140, 200:280] = 255
+        count, blobs = fc.process(frame)
+        assert count == 1
+        blob = blobs[0]
+        assert abs(blob.x - 200) <= 4 and abs(blob.y - 100) <= 4
+        assert abs(blob.width - 80) <= 6 and abs(blob.height - 40) <= 6
+
+    def test_still_frames_skip_background_model(self, blank_frame: np.ndarray) -> None:
+        from unittest import mock
+        fc = FishCounter(still_threshold=32 * 32 * 3)
+        fc.bg_subtractor = mock.Mock(wraps=fc.bg_subtractor)
+        for _ in range(5):
+            fc.process(blank_frame)
+        assert fc.bg_subtractor.apply.call_count == 1
+        assert len(fc.count_history) == 5
+        frame = blank_frame.copy()
+        frame[100:200, 200:400] = 255
+        fc.process(frame)
+        assert fc.bg_subtractor.apply.call_count == 2
+
+    def test_slow_drift_passes_still_gate(self) -> None:
+        from unittest import mock
+        fc = FishCounter(still_threshold=32 * 32 * 3 * 2)
+        fc.bg_subtractor = mock.Mock(wraps=fc.bg_subtractor)
+        # One level per frame stays under the threshold frame-to-frame, but
+        # two levels from the last processed frame does not
+        for level in range(4):
+            fc.process(np.full((480, 640, 3), level, dtype=np.uint8))
+        assert fc.bg_subtractor.apply.call_count == 2
+
+    def test_aspect_ratio_uses_full_frame_units(self) -> None:
+        import cv2
+        from src.fish_counter import _fish_blob_mask
+        stats = np.zeros((1, 5), dtype=np.int32)
+        stats[0, cv2.CC_STAT_WIDTH] = 8
+        stats[0, cv2.CC_STAT_HEIGHT] = 48
+        stats[0, cv2.CC_STAT_AREA] = 8 * 48
+        # 8x48 at work resolution is 32x48 in a frame squeezed 4x horizontally
+        assert _fish_blob_mask(stats, 4.0, 1.0, 100, 10000)[0]
+        assert not _fish_blob_mask(stats, 1.0, 1.0, 100, 10000)[0]
+
     def test_aspect_ratio_filter(self) -> None:
         """Ensure very tall or very wide shapes are filtered."""
         fc = FishCounter()
@@ -76,3 +137,13 @@ class TestCountFishInImage:
         cv2.imwrite(path, blank_frame)
         count, blobs = count_fish_in_image(path)
         assert count == 0
+
+    def test_fused_kernel_matches_hsv_mask(self) -> None:
+        import cv2
+        from src.fish_counter import _classify_bgr
+        img = np.random.RandomState(0).randint(0, 256, (40, 40, 3), dtype=np.uint8)
+        h, s, v = cv2.split(cv2.cvtColor(img, cv2.COLOR_BGR2HSV))
+        expected = (((h <= 25) | ((h >= 100) & (h <= 130))) & (s >= 100) & (v >= 100)) * 255
+        out = np.empty(img.shape[:2], dtype=np.uint8)
+        _classify_bgr(img, out)
+        np.testing.assert_array_equal(out, expected.astype(np.uint8))
@@ -0,0 +1,200 @@
+"""Tests for src.overlay — fish tracking and overlay rendering."""
+
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from src import overlay
+from src.overlay import FishTracker, OverlayRenderer, TrackedFish
+
+
+def _det(cx: float, cy: float, w: int = 40, h: int = 20) -> tuple:
+    """A detect_fish() row centered on (cx, cy)."""
+    return (cx - w // 2, cy - h // 2, w, h, cx, cy, float(w * h))
+
+
+class _FakeClock:
+    def __init__(self, t: float = 1000.0) -> None:
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _FakeClock:
+    fake = _FakeClock()
+    monkeypatch.setattr(time, "time", fake)
+    return fake
+
+
+def _feed(tracker: FishTracker, frames: list[list[tuple]]) -> None:
+    """Make detect_fish return each entry of ``frames`` in turn."""
+    it = iter(frames)
+    tracker.detect_fish = lambda _frame: next(it)
+
+
+# ---------------------------------------------------------------------------
+# FishTracker
+# ---------------------------------------------------------------------------
+
+class TestFishTracker:
+    def test_greedy_and_optimal_match_agree(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        pytest.importorskip("scipy")
+        rng = np.random.RandomState(0)
+        tracker = FishTracker()
+        # Tracks on a coarse grid, detections jittered well inside max_dist
+        grid = np.array([(x, y) for x in range(100, 600, 120) for y in range(80, 400, 120)], dtype=np.float64)
+        tracker._append(np.array([_det(x, y) for x, y in grid]), now=1.0)
+        tracker.valid[3] = False  # A freed row must never be matched
+        order = rng.permutation(len(grid))
+        dets = grid[order] + rng.uniform(-20, 20, grid.shape)
+        dets = np.vstack([dets, [[5000.0, 5000.0]]])  # Out of range of every track
+
+        optimal = tracker._match(dets)
+        monkeypatch.setattr(overlay, "linear_sum_assignment", None)
+        greedy = tracker._match(dets)
+
+        pairs = sorted(zip(*(a.tolist() for a in optimal)))
+        assert pairs == sorted(zip(*(a.tolist() for a in greedy)))
+        assert len(pairs) == len(grid) - 1
+        assert all(order[d] == t for t, d in pairs)
+
+    def test_evicted_rows_are_reused_with_fresh_ids(self, clock: _FakeClock, blank_frame: np.ndarray) -> None:
+        tracker = FishTracker(detect_every=1)
+        _feed(tracker, [
+            [_det(100, 100), _det(300, 300)],
+            [_det(500, 100)],  # 40 s later: both old tracks are evicted
+            [_det(500, 100), _det(100, 400), _det(300, 200)],
+        ])
+
+        tracker.update(blank_frame)
+        clock.t += 40
+        tracker.update(blank_frame)
+        assert len(tracker) == 1
+        assert sorted(tracker.free_slots) == [0, 1]
+
+        clock.t += 1
+        tracked = tracker.update(blank_frame)
+        # The two new fish fill the freed rows instead of growing the table
+        assert len(tracker.valid) == 3
+        assert not tracker.free_slots
+        ids = [f.id for f in tracked]
+        assert sorted(ids) == [3, 4, 5]
+        assert len(set(tracker.ids.tolist())) == len(tracker.ids)
+
+    def test_extrapolates_between_detections(self, clock: _FakeClock, blank_frame: np.ndarray) -> None:
+        tracker = FishTracker(detect_every=3)
+        _feed(tracker, [[_det(100, 200)], [_det(130, 194)]])
+
+        tracker.update(blank_frame)
+        for _ in range(2):
+            clock.t += 0.1
+            (fish,) = tracker.update(blank_frame)
+            assert fish.center == (100, 200)  # No motion measured yet
+
+        clock.t += 0.1
+        (fish,) = tracker.update(blank_frame)
+        assert fish.center == (130, 194)
+        assert fish.step == (10, -2)
+
+        for expected in ((140, 192), (150, 190)):
+            clock.t += 0.1
+            (fish,) = tracker.update(blank_frame)
+            assert fish.center == pytest.approx(expected)
+            x, y, w, h = fish.bbox
+            assert (x + w // 2, y + h // 2) == expected
+
+    def test_unmatched_tracks_stop_extrapolating(self, clock: _FakeClock, blank_frame: np.ndarray) -> None:
+        tracker = FishTracker(detect_every=2)
+        _feed(tracker, [[_det(100, 200)], [_det(120, 200)], []])
+        for _ in range(4):
+            tracker.update(blank_frame)
+            clock.t += 0.1
+        (fish,) = tracker.update(blank_frame)
+        assert fish.step == (0, 0)
+        (fish,) = tracker.update(blank_frame)
+        assert fish.center == pytest.approx((130, 200))
+
+
+# ---------------------------------------------------------------------------
+# OverlayRenderer
+# ---------------------------------------------------------------------------
+
+def _draw_label_directly(renderer: OverlayRenderer, frame: np.ndarray, fish: TrackedFish,
+                         name: str, species: str, color: tuple) -> None:
+    """The label as drawn with cv2 calls on every frame, before label caching."""
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    x, y = fish.bbox[:2]
+    tw = cv2.getTextSize(name, font, 0.5, 1)[0][0]
+    label_y = max(y - 50, 10)
+    cv2.rectangle(frame, (x, label_y), (x + max(tw + 10, 120), label_y + 45), (0, 0, 0), -1)
+    cv2.rectangle(frame, (x, label_y), (x + max(tw + 10, 120), label_y + 45), color, 1)
+    cv2.putText(frame, name, (x + 5, label_y + 15), font, 0.5, color, 1)
+    cv2.putText(frame, species, (x + 5, label_y + 30), font, 0.4, (200, 200, 200), 1)
+    cv2.putText(frame, f"[{fish.status.upper()}]", (x + 5, label_y + 42), font, 0.35,
+                renderer._status_color(fish.status), 1)
+
+
+class TestOverlayRenderer:
+    # Species wider than the box, so some glyphs spill past its edge
+    PROFILE = {"name": "Nemo", "species": "Longfin Spotted Zebra Danio"}
+
+    @pytest.mark.parametrize("bbox", [
+        (200, 200, 60, 30),   # Fully inside
+        (-40, 200, 60, 30),   # Past the left edge
+        (600, 200, 60, 30),   # Label runs off the right edge
+        (200, 20, 60, 30),    # Label pinned to the top
+        (200, 470, 60, 30),   # Label runs off the bottom
+        (700, 520, 60, 30),   # Entirely off-frame
+    ])
+    def test_label_paste_matches_direct_drawing(self, bbox: tuple, monkeypatch: pytest.MonkeyPatch) -> None:
+        renderer = OverlayRenderer([self.PROFILE])
+        profile = renderer.tracker.profiles[0]
+        fish = TrackedFish(id=1, bbox=bbox, center=(0, 0), profile=profile)
+        assert renderer._get_label(profile.name, profile.species, fish.status, profile.color)[1] is not None
+
+        frame = np.full((480, 640, 3), 90, dtype=np.uint8)
+        pasted = frame.copy()
+        renderer._draw_fish_box(pasted, fish)
+
+        # Box and corner accents only, then the label drawn the old way
+        expected = frame.copy()
+        with monkeypatch.context() as m:
+            m.setattr(renderer, "_get_label", lambda *args: (np.empty((0, 0, 3), np.uint8), None))
+            renderer._draw_fish_box(expected, fish)
+        _draw_label_directly(renderer, expected, fish, profile.name, profile.species, profile.color)
+
+        # Antialiased glyph edges that spill past the box are blended by the
+        # renderer, so they may round one level differently
+        np.testing.assert_allclose(pasted, expected, atol=1, rtol=0)
+        inside = (slice(max(bbox[1] - 50, 10), max(bbox[1] - 50, 10) + 46),
+                  slice(max(bbox[0], 0), max(bbox[0] + 121, 0)))
+        np.testing.assert_array_equal(pasted[inside], expected[inside])
+
+    def test_header_redrawn_when_second_changes(self, clock: _FakeClock, blank_frame: np.ndarray) -> None:
+        renderer = OverlayRenderer()
+        first = renderer.render(blank_frame)[:36].copy()
+        patch = renderer._header_cache[1]
+
+        clock.t += 0.5
+        assert np.array_equal(renderer.render(blank_frame)[:36], first)
+        assert renderer._header_cache[1] is patch  # Same second: reused
+
+        clock.t += 0.5
+        second = renderer.render(blank_frame)[:36].copy()
+        assert not np.array_equal(second, first)
+        # Matches a renderer drawing this second from scratch
+        assert np.array_equal(OverlayRenderer().render(blank_frame)[:36], second)
+
+    def test_chrome_follows_frame_shape(self, clock: _FakeClock) -> None:
+        renderer = OverlayRenderer()
+        small = np.zeros((240, 320, 3), dtype=np.uint8)
+        large = np.zeros((480, 640, 3), dtype=np.uint8)
+        renderer.render(large)
+        out = renderer.render(small).copy()
+        fresh = OverlayRenderer()
+        fresh.frame_count = 1  # Same FRAMES counter
+        assert np.array_equal(out, fresh.render(small))
@@ -0,0 +1,138 @@
+"""Tests for src.tank_mood — clip-time histograms and mood summaries."""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src import tank_mood
+from src.tank_mood import TankMoodAnalyzer, _parse_clip_stem
+
+
+# Hours back from now for each test clip, and its alert type (None = no type)
+CLIP_AGES = [
+    (1, "feeding_frenzy"), (2, "feeding_frenzy"), (3, None), (5, "cool_moment"),
+    (25, "feeding_frenzy"), (26, "feeding_frenzy"), (49, "no_motion"), (50, None),
+    (73, "feeding_frenzy"), (97, "cool_moment"), (121, "feeding_frenzy"), (140, "cool_moment"),
+    (24 * 7 + 5, "feeding_frenzy"),  # Older than the 7-day window
+]
+
+
+@pytest.fixture
+def clips(tmp_path: Path) -> list[tuple[datetime, str]]:
+    """Write empty clips named CLIP_AGES hours ago; returns (time, type) per clip."""
+    now = datetime.now().replace(microsecond=0)
+    made = []
+    for i, (hours, alert_type) in enumerate(CLIP_AGES):
+        dt = now - timedelta(hours=hours, seconds=i)
+        stem = dt.strftime("%Y%m%d_%H%M%S") + (f"_{alert_type}" if alert_type else "")
+        (tmp_path / f"{stem}.mp4").touch()
+        made.append((dt, alert_type))
+    (tmp_path / "notes.txt").touch()
+    return made
+
+
+@pytest.fixture(params=["numpy", "kernel"])
+def histogram_path(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run once with the numpy histogram and once with the numba kernel's code.
+
+    Without numba the kernel runs as plain Python, which still checks its
+    arithmetic against the numpy version.
+    """
+    kernel = tank_mood._clip_histogram if request.param == "kernel" else None
+    monkeypatch.setattr(tank_mood, "_clip_histogram_jit", kernel)
+    return request.param
+
+
+def _in_window(clips: list[tuple[datetime, str]], days: int = 7) -> list[tuple[datetime, str]]:
+    cutoff = datetime.now() - timedelta(days=days)
+    return [(dt, t) for dt, t in clips if dt > cutoff]
+
+
+class TestClipHistograms:
+    def test_heatmap_matches_datetime_reference(
+        self, tmp_path: Path, clips: list, histogram_path: str
+    ) -> None:
+        analyzer = TankMoodAnalyzer(data_dir=str(tmp_path), clips_dir=str(tmp_path))
+        expected = Counter((dt.strftime("%a"), dt.hour) for dt, _ in _in_window(clips))
+        heatmap = analyzer.get_activity_heatmap()
+        assert {(day, hour): n for day, hours in heatmap.items() for hour, n in hours.items()} == expected
+
+    def test_favorites_match_datetime_reference(
+        self, tmp_path: Path, clips: list, histogram_path: str
+    ) -> None:
+        analyzer = TankMoodAnalyzer(data_dir=str(tmp_path), clips_dir=str(tmp_path))
+        typed = [(dt, t) for dt, t in _in_window(clips) if t]
+        by_hour = Counter(dt.hour for dt, _ in typed)
+        by_day = Counter(dt.weekday() for dt, _ in typed)
+        favorites = analyzer.get_fish_favorites()
+        assert favorites["total_clips"] == len(typed)
+        assert favorites["favorite_activity"] == "Feeding Frenzy"
+        peak_hour = favorites["peak_time"]
+        assert datetime.strptime(peak_hour, "%I %p").hour == max(by_hour, key=lambda h: (by_hour[h], -h))
+        peak_day = max(by_day, key=lambda d: (by_day[d], -d))
+        assert favorites["peak_day"] == datetime(2024, 1, 1 + peak_day).strftime("%A")
+
+    def test_kernel_matches_numpy_across_calendar(self) -> None:
+        # Every seventh hour over four years, so all weekday/hour cells and a leap day
+        start = datetime(2023, 1, 1)
+        times = np.array([
+            tank_mood._clock_seconds(start + timedelta(hours=h, minutes=17))
+            for h in range(0, 4 * 366 * 24, 7)
+        ], dtype=np.int64)
+        cutoff = int(times[len(times) // 3])
+        out = np.zeros((7, 24), dtype=np.int64)
+        tank_mood._clip_histogram(times, cutoff, out)
+        np.testing.assert_array_equal(out, tank_mood._clip_histogram_np(times, cutoff))
+
+        expected = np.zeros((7, 24), dtype=np.int64)
+        for h in range(0, 4 * 366 * 24, 7):
+            dt = start + timedelta(hours=h, minutes=17)
+            if tank_mood._clock_seconds(dt) > cutoff:
+                expected[dt.weekday(), dt.hour] += 1
+        np.testing.assert_array_equal(out, expected)
+
+    def test_no_clips(self, tmp_path: Path, histogram_path: str) -> None:
+        analyzer = TankMoodAnalyzer(data_dir=str(tmp_path), clips_dir=str(tmp_path / "missing"))
+        assert analyzer.get_activity_heatmap() == {}
+        assert analyzer.get_fish_favorites() == {"no_data": True}
+
+
+class TestParseClipStem:
+    @pytest.mark.parametrize("stem, alert_type", [
+        ("20260129_143022_feeding_frenzy", "feeding_frenzy"),
+        ("20240229_000000_cool_moment", "cool_moment"),  # Leap day
+        ("20261231_235959", None),
+        ("20260129_143022_", None),
+    ])
+    def test_matches_strptime(self, stem: str, alert_type: str) -> None:
+        dt = datetime.strptime(stem[:15], "%Y%m%d_%H%M%S")
+        assert _parse_clip_stem(stem) == (tank_mood._clock_seconds(dt), alert_type)
+
+    @pytest.mark.parametrize("stem", [
+        "",
+        "highlights",
+        "20260129_14302",          # Too short
+        "20260129-143022",         # Wrong separator
+        "2026012a_143022",         # Non-digit date
+        "20260129_14302x",         # Non-digit time
+        "20260129_143022feeding",  # Type not separated
+        "20261329_143022",         # Month 13
+        "20260230_143022",         # February 30
+        "20260129_246000",         # Hour 24
+        "20260129_143060",         # Second 60
+        "²0260129_143022",         # isdigit() but not int()
+    ])
+    def test_rejects_malformed(self, stem: str) -> None:
+        assert _parse_clip_stem(stem) is None
+
+    def test_scan_skips_malformed_names(self, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+        (tmp_path / "20260230_143022_feeding.mp4").touch()
+        (tmp_path / "highlights.mp4").touch()
+        (tmp_path / "20260129_143022_feeding.mp4").touch()
+        analyzer = TankMoodAnalyzer(data_dir=str(tmp_path), clips_dir=str(tmp_path))
+        times, types = analyzer._scan_clips(datetime(2000, 1, 1))
+        assert types.tolist() == ["feeding"]
+        assert "Error parsing clip" in capsys.readouterr().out
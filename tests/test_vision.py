@@ -32,6 +32,20 @@ class TestClaudeVisionAnalyzer:
         result = analyzer.analyze_frame(None)
         assert result is None
 
+    def test_analyze_frame_downscales_large_frames(self, monkeypatch) -> None:
+        import cv2
+
+        analyzer = ClaudeVisionAnalyzer(api_key="fake")
+        sent = []
+        monkeypatch.setattr(analyzer, "_call_claude", sent.append)
+        analyzer.analyze_frame(np.zeros((2160, 3840, 3), dtype=np.uint8))
+        analyzer.analyze_frame(np.zeros((480, 640, 3), dtype=np.uint8))
+        shapes = [
+            cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR).shape
+            for jpeg in sent
+        ]
+        assert shapes == [(882, 1568, 3), (480, 640, 3)]
+
     def test_analyze_image_path_missing(self, tmp_path) -> None:
         analyzer = ClaudeVisionAnalyzer(api_key="fake")
         result = analyzer.analyze_image_path(str(tmp_path / "nope.jpg"))
@@ -71,6 +85,15 @@ class TestClaudeVisionAnalyzer:
         assert result is not None
         assert result.summary == "OK"
 
+    def test_parse_response_surrounding_prose(self) -> None:
+        analyzer = ClaudeVisionAnalyzer(api_key="fake")
+        data = {"summary": "Fish resting", "severity": "minor"}
+        text = f"Here is my assessment:\n{json.dumps(data)}\nLet me know if you need more."
+        result = analyzer._parse_response(text)
+        assert result.summary == "Fish resting"
+        assert result.severity == "minor"
+        assert result.confidence == 0.85
+
     def test_parse_response_invalid_json(self) -> None:
         analyzer = ClaudeVisionAnalyzer(api_key="fake")
         result = analyzer._parse_response("not json at all")